@@ -118,3 +118,25 @@ def test_check_invalid_language(caplog):
     runner.invoke(textx, ["check", "some_unexisting_file"])
 
     assert "No language registered that can parse" in caplog.text
+
+
+def test_check_with_model_cache(caplog, tmp_path):
+    """
+    Test checking of models with models cached between runs.
+    """
+    model_file = os.path.join(
+        this_folder, "projects", "types_dsl", "tests", "models", "types.etype"
+    )
+    metamodel_file = os.path.join(
+        this_folder, "projects", "types_dsl", "types_dsl", "Types.tx"
+    )
+    runner = CliRunner()
+    args = ["check", "--grammar", metamodel_file, "--model-cache", str(tmp_path)]
+    result = runner.invoke(textx, [*args, model_file])
+    assert result.exit_code == 0
+    assert "Model cache: 0 hits, 1 misses." in caplog.text
+
+    result = runner.invoke(textx, [*args, model_file])
+    assert result.exit_code == 0
+    assert "types.etype: OK." in caplog.text
+    assert "Model cache: 1 hits, 0 misses." in caplog.text
@@ -65,3 +65,19 @@ def test_no_auto_init():
     # because there cannot be three state.
     # Either string to match exists or not.
     assert model.d is False
+
+
+def test_auto_init_lists_are_not_shared():
+    """
+    Test that each object gets its own list for many multiplicity
+    attributes.
+    """
+
+    mm = metamodel_from_str(grammar)
+
+    model1 = mm.model_from_str("42")
+    model2 = mm.model_from_str("43 first 1 2")
+
+    assert model1.seconds == []
+    assert model2.seconds == [1, 2]
+    assert model1.seconds is not mm.model_from_str("44").seconds
@@ -0,0 +1,150 @@
+"""
+Iterating over the top-level elements of a model (`iter_model_from_file`).
+"""
+
+import pytest
+
+import textx.scoping.providers as scoping_providers
+from textx import get_location, get_model, metamodel_from_str
+from textx.exceptions import TextXError, TextXSemanticError, TextXSyntaxError
+
+grammar = """
+Log: entries*=Entry;
+Entry: Block | Use;
+Block: 'block' name=ID '{' items*=Item '}' ('main' main=[Item])?;
+Item: name=ID;
+Use: 'use' block=[Block];
+"""
+
+model_str = """
+block a { x y } main y
+use a
+block b { z }
+use b
+"""
+
+
+class Block:
+    def __init__(self, parent, name, items, main):
+        self.parent = parent
+        self.name = name
+        self.items = items
+        self.main = main
+
+
+def test_iter_model_from_file(tmp_path):
+    model_file = tmp_path / "model.log"
+    model_file.write_text(model_str)
+    mm = metamodel_from_str(grammar, classes=[Block])
+    processed = []
+    mm.register_obj_processors(
+        {
+            "Entry": lambda e: processed.append(e.__class__.__name__),
+            "Log": lambda m: processed.append("Log"),
+        }
+    )
+    mm.register_model_processor(lambda model, _: processed.append("model"))
+
+    entries = mm.iter_model_from_file(model_file)
+    a = next(entries)
+    # Elements are yielded as soon as they are loaded
+    assert processed == ["Block"]
+    assert type(a) is Block
+    assert a.main is a.items[1]
+    assert get_location(a) == {
+        "line": 2,
+        "col": 1,
+        "nchar": 22,
+        "filename": str(model_file),
+    }
+
+    use_a, b, use_b = entries
+    assert use_a.block is a
+    assert use_b.block is b
+    assert processed == ["Block", "Use", "Block", "Use", "Log", "model"]
+    model = get_model(b)
+    assert model.entries == [a, use_a, b, use_b]
+    assert model._tx_filename == str(model_file)
+
+
+def test_iter_model_from_file_not_kept(tmp_path):
+    model_file = tmp_path / "model.log"
+    model_file.write_text("block a { x } main x block b { y } main y")
+    mm = metamodel_from_str(grammar)
+
+    entries = list(mm.iter_model_from_file(model_file, keep_elements=False))
+
+    assert [e.main.name for e in entries] == ["x", "y"]
+    assert get_model(entries[0]).entries == []
+
+    # Only references within an element can be resolved
+    model_file.write_text("block a { x } use a")
+    entries = mm.iter_model_from_file(model_file, keep_elements=False)
+    assert next(entries).name == "a"
+    with pytest.raises(TextXSemanticError, match='Unknown object "a"'):
+        next(entries)
+
+
+def test_iter_model_from_file_one_or_more(tmp_path):
+    model_file = tmp_path / "model.log"
+    model_file.write_text("e a e b e c")
+    mm = metamodel_from_str("Log: entries+=Entry; Entry: 'e' name=ID;")
+
+    for keep_elements in [True, False]:
+        entries = mm.iter_model_from_file(model_file, keep_elements=keep_elements)
+        assert [e.name for e in entries] == ["a", "b", "c"]
+
+    model_file.write_text("")
+    with pytest.raises(TextXSyntaxError, match="Expected 'e'"):
+        list(mm.iter_model_from_file(model_file, keep_elements=False))
+
+
+import_grammar = """
+Model: elements*=Element;
+Element: Import | Entity;
+Import: 'import' importURI=STRING;
+Entity: 'entity' name=ID ('extends' base=[Entity])?;
+"""
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_iter_model_from_file_imports(tmp_path, lazy):
+    (tmp_path / "a.ent").write_text('import "b.ent" entity A extends B')
+    (tmp_path / "b.ent").write_text("entity B")
+    model_file = tmp_path / "main.ent"
+    model_file.write_text('import "a.ent" entity Main extends A')
+    mm = metamodel_from_str(import_grammar)
+    mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI(lazy=lazy)})
+
+    _, main = mm.iter_model_from_file(model_file)
+
+    assert main.base.name == "A"
+    assert main.base.base.name == "B"
+    assert get_model(main.base)._tx_filename == str(tmp_path / "a.ent")
+
+
+def test_iter_model_from_file_errors(tmp_path):
+    model_file = tmp_path / "model.log"
+    mm = metamodel_from_str(grammar)
+
+    model_file.write_text(model_str + "block c {")
+    entries = mm.iter_model_from_file(model_file)
+    assert len([next(entries) for _ in range(4)]) == 4
+    with pytest.raises(TextXSyntaxError) as e:
+        next(entries)
+    assert (e.value.line, e.value.col) == (6, 10)
+    assert e.value.filename == str(model_file)
+
+    # Forward references can't be resolved
+    model_file.write_text("use a block a {}")
+    with pytest.raises(TextXSemanticError, match='Unknown object "a"') as e:
+        list(mm.iter_model_from_file(model_file))
+    assert (e.value.line, e.value.col) == (1, 5)
+
+
+def test_iter_model_from_file_unsupported_root_rule(tmp_path):
+    model_file = tmp_path / "model.blocks"
+    model_file.write_text("blocks a b")
+    mm = metamodel_from_str("Model: 'blocks' blocks+=Block; Block: name=ID;")
+    with pytest.raises(TextXError, match="single repeated assignment"):
+        mm.iter_model_from_file(model_file)
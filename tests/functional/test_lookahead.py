@@ -0,0 +1,153 @@
+"""
+Lookahead dispatch of ordered choices (`textx.lookahead`).
+"""
+
+import pytest
+from arpeggio import OrderedChoice, RegExMatch, StrMatch
+
+from textx import metamodel_from_str
+from textx.exceptions import TextXSyntaxError
+from textx.lookahead import LookaheadChoice, first_set
+from textx.profiler import ParseProfiler
+
+grammar = """
+Program: statements*=Statement;
+Statement: Print | Printf | Return | If | Assignment | Call;
+Print: 'print' value=Value ';';
+Printf: 'printf' format=STRING ';';
+Return: 'return' value=Value? ';';
+If: 'if' condition=Value '{' statements*=Statement '}';
+Assignment: variable=ID '=' value=Value ';';
+Call: name=ID '(' ')' ';';
+Value: STRING | INT | ID;
+Comment: /#.*$/;
+"""
+
+model_str = """
+print 1;
+printf "%d";  # a comment
+return;
+if x {
+    # if starts with a keyword but can be a variable
+    ifx = 2;
+    iff();
+}
+return "a";
+"""
+
+
+def test_lookahead_dispatch():
+    mm = metamodel_from_str(grammar)
+    statement = mm["Statement"]._tx_peg_rule
+    assert isinstance(statement, LookaheadChoice)
+
+    with ParseProfiler(mm) as profiler:
+        model = mm.model_from_str(model_str)
+
+    assert [s.__class__.__name__ for s in model.statements] == [
+        "Print",
+        "Printf",
+        "Return",
+        "If",
+        "Return",
+    ]
+    if_statements = model.statements[3].statements
+    assert [s.__class__.__name__ for s in if_statements] == ["Assignment", "Call"]
+    assert model.statements[4].value == "a"
+
+    rules = {stats.name: stats for stats in profiler.rules.values()}
+    assert rules["Statement"].attempts == 9
+    # Only the statements which can start at the next character are tried
+    # except before the comments and where no statement can match (where all
+    # of them are tried to report the same syntax errors).
+    assert rules["Print"].attempts == 6
+    assert rules["Printf"].attempts == 5
+    assert rules["Return"].attempts == 5
+    assert rules["If"].attempts == 5
+    assert rules["Assignment"].attempts == 4
+    assert rules["Call"].attempts == 3
+
+
+def test_lookahead_dispatch_ordered_choice_semantics():
+    mm = metamodel_from_str(
+        """
+        Model: items+=Item;
+        Item: Keyword | Long | Short | Name;
+        Keyword: 'key' bang='!';
+        Long: 'keyword1' value=INT;
+        Short: 'keyword' value=INT;
+        Name: name=ID;
+        """
+    )
+    model = mm.model_from_str("keyword10 keyword 2 keyword1 3 key ! keys")
+    assert [(i.__class__.__name__, getattr(i, "value", None)) for i in model.items] == [
+        ("Long", 0),
+        ("Short", 2),
+        ("Long", 3),
+        ("Keyword", None),
+        ("Name", None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "model_str",
+    [
+        "print 1 ;\nprint 2\n",
+        "print 1;\n2;",
+        "if x { printf 1; }",
+        "return x y;",
+        "# comment\nretur 1;",
+    ],
+)
+def test_lookahead_dispatch_syntax_errors(monkeypatch, model_str):
+    """
+    Test that syntax errors are the same as for the ordered choice.
+    """
+    mm = metamodel_from_str(grammar)
+
+    def syntax_error():
+        with pytest.raises(TextXSyntaxError) as e:
+            mm.model_from_str(model_str)
+        return str(e.value)
+
+    error = syntax_error()
+    monkeypatch.setattr(LookaheadChoice, "_parse", OrderedChoice._parse)
+    assert syntax_error() == error
+
+
+def test_lookahead_dispatch_not_in_predicates():
+    mm = metamodel_from_str(
+        """
+        Model: 'events' events+=Event 'end' 'state' name=ID;
+        Event: name=SMID code=ID;
+        Keyword: 'end' | 'events' | 'state';
+        SMID: !Keyword ID;
+        """
+    )
+    # The errors of the keywords tried inside the predicate are reported.
+    assert mm["Keyword"]._tx_peg_rule._dispatch is None
+    with pytest.raises(TextXSyntaxError, match="Expected Not or 'end'"):
+        mm.model_from_str("events a A state x")
+
+
+def test_first_set():
+    assert first_set(StrMatch("if")).chars == {"i"}
+    assert first_set(StrMatch("if")).prefix == "if"
+    assert first_set(StrMatch("If", ignore_case=True)).chars == {"i", "I"}
+
+    def regex_first_set(regex):
+        regex = RegExMatch(regex)
+        regex.compile()
+        return first_set(regex)
+
+    number = regex_first_set(r"[-+]?\d+")
+    assert number.chars == set("+-0123456789")
+    assert number.other and not number.empty
+
+    keyword = regex_first_set(r"if\b")
+    assert keyword.chars == {"i"}
+    assert keyword.prefix == "if"
+    assert not keyword.other
+
+    assert regex_first_set(r"(a|b)?c").chars == {"a", "b", "c"}
+    assert regex_first_set(r"a*").empty
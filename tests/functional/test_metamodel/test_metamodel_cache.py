@@ -0,0 +1,110 @@
+"""
+Caching of compiled meta-models (`cache_dir` parameter).
+"""
+
+import arpeggio
+import pytest
+
+import textx.metamodel
+from textx import metamodel_from_file, metamodel_from_str
+from textx.const import RULE_ABSTRACT, RULE_COMMON
+
+grammar = """
+Model: 'shapes' shapes+=Shape;
+Shape: Circle | Square;
+Circle: 'circle' name=ID r=INT;
+Square: 'square' name=ID a=INT ('inside' inside=[Shape])?;
+"""
+
+model_str = "shapes circle c 1 square s 2 inside c"
+
+
+@pytest.fixture
+def languages_built(monkeypatch):
+    """Counts meta-models actually built from the grammar."""
+    built = []
+    language_from_str = textx.metamodel.language_from_str
+
+    def counting_language_from_str(*args, **kwargs):
+        built.append(args[0])
+        return language_from_str(*args, **kwargs)
+
+    monkeypatch.setattr(textx.metamodel, "language_from_str", counting_language_from_str)
+    return built
+
+
+def test_metamodel_cache(tmp_path, languages_built, monkeypatch):
+    mm = metamodel_from_str(grammar, cache_dir=tmp_path)
+    assert len(languages_built) == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+    cached_mm = metamodel_from_str(grammar, cache_dir=tmp_path)
+    assert len(languages_built) == 1
+    assert cached_mm is not mm
+    assert cached_mm["Shape"]._tx_type is RULE_ABSTRACT
+    assert cached_mm["Square"]._tx_type is RULE_COMMON
+    assert [c.__name__ for c in cached_mm["Shape"]._tx_inh_by] == ["Circle", "Square"]
+
+    model = cached_mm.model_from_str(model_str)
+    assert model.shapes[1].inside is model.shapes[0]
+    assert isinstance(model.shapes[0], cached_mm["Circle"])
+
+    # Object processors may be registered on the cached meta-model
+    cached_mm.register_obj_processors({"INT": lambda x: int(x) * 10})
+    assert cached_mm.model_from_str(model_str).shapes[0].r == 10
+
+    # The pickled parser model depends on the Arpeggio version
+    with monkeypatch.context() as m:
+        m.setattr(arpeggio, "__version__", "0.0")
+        metamodel_from_str(grammar, cache_dir=tmp_path)
+    assert len(languages_built) == 2
+
+    # Different parameters or grammar are cached separately
+    metamodel_from_str(grammar, cache_dir=tmp_path, use_slots=True)
+    metamodel_from_str(grammar + "Unused: 'unused';", cache_dir=tmp_path)
+    assert len(languages_built) == 4
+    assert len(list(tmp_path.iterdir())) == 4
+
+
+def test_metamodel_cache_imported_grammar_changed(tmp_path, languages_built):
+    (tmp_path / "shapes.tx").write_text(
+        "Shape: Circle | Square; Circle: 'circle' name=ID; Square: 'square' name=ID;"
+    )
+    model_grammar = "import shapes Model: shapes+=Shape;"
+    (tmp_path / "model.tx").write_text(model_grammar)
+    cache_dir = tmp_path / "cache"
+
+    metamodel_from_file(tmp_path / "model.tx", cache_dir=cache_dir)
+    mm = metamodel_from_file(tmp_path / "model.tx", cache_dir=cache_dir)
+    assert languages_built.count(model_grammar) == 1
+    assert len(mm.model_from_str("circle a square b").shapes) == 2
+
+    (tmp_path / "shapes.tx").write_text("Shape: Circle; Circle: 'circle' name=ID;")
+    mm = metamodel_from_file(tmp_path / "model.tx", cache_dir=cache_dir)
+    assert languages_built.count(model_grammar) == 2
+    with pytest.raises(textx.exceptions.TextXSyntaxError):
+        mm.model_from_str("circle a square b")
+
+
+def test_metamodel_cache_not_used(tmp_path, languages_built):
+    class Circle:
+        def __init__(self, **kwargs):
+            pass
+
+    # Meta-models with user classes are not cached
+    metamodel_from_str(grammar, cache_dir=tmp_path, classes=[Circle])
+    assert list(tmp_path.iterdir()) == []
+    # Nor meta-models with a global repository, which is a part of the
+    # meta-model
+    for _ in range(2):
+        mm = metamodel_from_str(grammar, cache_dir=tmp_path, global_repository=True)
+        assert mm._tx_model_repository.all_models.filename_to_model == {}
+    assert list(tmp_path.iterdir()) == []
+
+    # Unreadable cache entries are ignored and replaced
+    metamodel_from_str(grammar, cache_dir=tmp_path)
+    (cache_file,) = tmp_path.iterdir()
+    cache_file.write_bytes(b"garbage")
+    mm = metamodel_from_str(grammar, cache_dir=tmp_path)
+    assert len(languages_built) == 5
+    assert mm.model_from_str(model_str).shapes[1].a == 2
@@ -2,15 +2,20 @@
 Model query and navigation API.
 """
 
+import io
+import sys
+
+import arpeggio
 import pytest  # noqa
+
 from textx import (
-    metamodel_from_str,
     get_children,
     get_children_of_type,
-    get_parent_of_type,
     get_model,
+    get_parent_of_type,
+    metamodel_from_str,
 )
-
+from textx.export import model_export_to_file
 
 grammar = """
 First:
@@ -111,3 +116,42 @@ def test_get_model():
 
     t = model.a[0].y
     assert get_model(t) is model
+
+
+def test_deeply_nested_model(monkeypatch):
+    """
+    Model construction, navigation and export do not use Python recursion so
+    the nesting depth of the model is not limited by the recursion limit.
+    """
+    parse = arpeggio.Parser.parse
+
+    def parse_with_raised_limit(*args, **kwargs):
+        # Parsing itself is recursive so allow it to go deeper.
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(50000)
+        try:
+            return parse(*args, **kwargs)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    monkeypatch.setattr(arpeggio.Parser, "parse", parse_with_raised_limit)
+
+    metamodel = metamodel_from_str(
+        """
+        Model: node=Node;
+        Node: '(' name=ID child=Node? ')';
+        """
+    )
+    depth = sys.getrecursionlimit() + 500
+    model = metamodel.model_from_str(
+        " ".join(f"(n{i}" for i in range(depth)) + ")" * depth
+    )
+
+    nodes = get_children_of_type("Node", model)
+    assert len(nodes) == depth
+    assert nodes[-1].name == f"n{depth - 1}"
+    assert get_parent_of_type("Model", nodes[-1]) is model
+
+    f = io.StringIO()
+    model_export_to_file(f, model)
+    assert f"n{depth - 1}:Node" in f.getvalue()
@@ -0,0 +1,160 @@
+"""
+Caching of models constructed from files (`model_cache_dir` parameter).
+"""
+
+import pytest
+
+import textx.scoping.providers as scoping_providers
+from textx import (
+    get_location,
+    get_model,
+    metamodel_from_str,
+)
+from textx.exceptions import TextXSemanticError
+
+grammar = """
+Model: imports*=Import shapes*=Shape;
+Import: 'import' importURI=STRING;
+Shape: Circle | Square;
+Circle: 'circle' name=ID r=Radius;
+Square: 'square' name=ID a=INT ('inside' inside=[Shape])?;
+Radius: INT 'cm';
+"""
+
+model_str = """
+circle c 1 cm
+square s 2 inside c
+"""
+
+
+def radius_in_mm(value):
+    return int(value[:-2]) * 10
+
+
+@pytest.mark.parametrize("use_slots", [False, True])
+def test_model_cache(tmp_path, use_slots):
+    model_file = tmp_path / "model.shapes"
+    model_file.write_text(model_str)
+    cache_dir = tmp_path / "cache"
+
+    mm = metamodel_from_str(grammar, model_cache_dir=cache_dir, use_slots=use_slots)
+    model = mm.model_from_file(model_file)
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (0, 1)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # A new meta-model for the same grammar uses the cached model
+    mm = metamodel_from_str(grammar, model_cache_dir=cache_dir, use_slots=use_slots)
+    cached_model = mm.model_from_file(model_file)
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (1, 0)
+    assert cached_model is not model
+    circle, square = cached_model.shapes
+    assert isinstance(circle, mm["Circle"])
+    assert circle.r == "1cm"
+    assert square.inside is circle
+    assert square.parent is cached_model
+    assert get_model(square) is cached_model
+    assert cached_model._tx_filename == str(model_file)
+    assert get_location(square) == {
+        "line": 3,
+        "col": 1,
+        "nchar": 19,
+        "filename": str(model_file),
+    }
+
+    # Changed model file is parsed again
+    model_file.write_text(model_str + "circle d 3 cm")
+    assert len(mm.model_from_file(model_file).shapes) == 3
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (1, 1)
+
+    # Changed match rule processors are a part of the cache key
+    mm.register_obj_processors({"Radius": radius_in_mm})
+    assert mm.model_from_file(model_file).shapes[0].r == 10
+    assert mm.model_from_file(model_file).shapes[0].r == 10
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (2, 2)
+    assert len(list(cache_dir.iterdir())) == 3
+
+    # So is their code
+    def radius_in_cm(value):
+        return int(value[:-2])
+
+    radius_in_cm.__qualname__ = radius_in_mm.__qualname__
+    mm.register_obj_processors({"Radius": radius_in_cm})
+    assert mm.model_from_file(model_file).shapes[0].r == 1
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (2, 3)
+
+
+def test_model_cache_cached_metamodel(tmp_path):
+    model_file = tmp_path / "model.shapes"
+    model_file.write_text(model_str)
+
+    # The imported grammars are hashed only for the model cache
+    mm = metamodel_from_str(grammar, cache_dir=tmp_path / "mm")
+    mm.model_from_file(model_file)
+    assert mm._cache_key is not None
+    assert mm._fingerprint is None
+
+    for hits in [0, 1]:
+        mm = metamodel_from_str(
+            grammar, cache_dir=tmp_path / "mm", model_cache_dir=tmp_path / "cache"
+        )
+        mm.model_from_file(model_file)
+        assert mm.model_cache.hits == hits
+
+
+def test_model_cache_imported_models(tmp_path):
+    (tmp_path / "circles.shapes").write_text("circle c 1 cm")
+    (tmp_path / "model.shapes").write_text('import "circles.shapes" square s 2 inside c')
+
+    for _ in range(2):
+        mm = metamodel_from_str(
+            grammar, model_cache_dir=tmp_path / "cache", global_repository=True
+        )
+        mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI()})
+        model = mm.model_from_file(tmp_path / "model.shapes")
+        square = model.shapes[0]
+        assert square.inside.name == "c"
+        assert get_model(square.inside)._tx_filename == str(tmp_path / "circles.shapes")
+
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (2, 0)
+
+
+def test_model_cache_errors(tmp_path):
+    model_file = tmp_path / "model.shapes"
+    model_file.write_text("circle c 1 cm\nsquare s 2 inside x")
+
+    for _ in range(2):
+        mm = metamodel_from_str(grammar, model_cache_dir=tmp_path)
+        with pytest.raises(TextXSemanticError, match="Unknown object") as e:
+            mm.model_from_file(model_file)
+        assert (e.value.line, e.value.col) == (2, 19)
+        assert e.value.filename == str(model_file)
+
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (1, 0)
+
+
+def test_model_cache_not_used(tmp_path):
+    model_file = tmp_path / "model.shapes"
+    model_file.write_text(model_str)
+    cache_dir = tmp_path / "cache"
+
+    # Lambdas can't be identified so models are not cached
+    mm = metamodel_from_str(grammar, model_cache_dir=cache_dir)
+    mm.register_obj_processors({"Radius": lambda x: int(x[:-2])})
+    mm.model_from_file(model_file)
+    mm.model_from_file(model_file)
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (0, 0)
+    assert not cache_dir.exists()
+
+    # Models given as strings are not cached
+    mm = metamodel_from_str(grammar, model_cache_dir=cache_dir)
+    mm.model_from_str(model_str)
+    assert not cache_dir.exists()
+
+    # Unreadable cache entries are ignored and replaced
+    mm.model_from_file(model_file)
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_bytes(b"garbage")
+    mm = metamodel_from_str(grammar, model_cache_dir=cache_dir)
+    assert mm.model_from_file(model_file).shapes[1].a == 2
+    mm.model_from_file(model_file)
+    assert (mm.model_cache.hits, mm.model_cache.misses) == (1, 1)
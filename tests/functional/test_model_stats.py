@@ -0,0 +1,81 @@
+"""
+Time and counters of the model loading phases (`stats` meta-model parameter).
+"""
+
+import textx.scoping.providers as scoping_providers
+from textx import metamodel_from_str
+from textx.model import ModelStats
+from textx.scoping import Postponed
+from textx.scoping.providers import PlainName
+
+grammar = """
+Model: imports*=Import entities*=Entity;
+Import: 'import' importURI=STRING;
+Entity: 'entity' name=ID ('extends' base=[Entity])? '{' attrs*=Attr '}';
+Attr: name=ID ':' type=ID;
+"""
+
+
+class Entity:
+    def __init__(self, parent, name, base, attrs):
+        self.parent = parent
+        self.name = name
+        self.base = base
+        self.attrs = attrs
+
+
+def test_model_stats(tmp_path):
+    (tmp_path / "base.ent").write_text("entity A { x: int } entity B extends A {}")
+    (tmp_path / "main.ent").write_text(
+        'import "base.ent" entity C extends B { y: int z: int }'
+    )
+    mm = metamodel_from_str(grammar, classes=[Entity], stats=True)
+    mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI()})
+    mm.register_obj_processors({"Attr": lambda attr: None})
+    mm.register_model_processor(lambda model, metamodel: None)
+
+    model = mm.model_from_file(tmp_path / "main.ent")
+
+    stats = model._tx_stats
+    assert isinstance(stats, ModelStats)
+    assert set(stats.times) == set(ModelStats.PHASES)
+    assert all(t > 0 for t in stats.times.values())
+    assert (stats.objects, stats.crossrefs) == (5, 1)
+    assert stats.resolution_passes > 0
+
+    # Imported models have their own stats
+    (base_stats,) = stats.imported
+    assert model.entities[0].base.parent._tx_stats is base_stats
+    assert (base_stats.objects, base_stats.crossrefs) == (4, 1)
+    assert base_stats.times["parse"] > 0
+    assert base_stats.resolution_passes == 0
+
+    total = stats.total()
+    assert (total.objects, total.crossrefs) == (9, 2)
+    assert total.times["parse"] == stats.times["parse"] + base_stats.times["parse"]
+    assert total.times["imports"] == stats.times["imports"]
+    assert stats.as_dict()["imported"] == [base_stats.as_dict()]
+
+
+def test_model_stats_postponed_retries():
+    mm = metamodel_from_str(grammar, stats=True)
+    calls = []
+
+    def postponing_scope(obj, attr, obj_ref):
+        calls.append(obj_ref.obj_name)
+        if len(calls) == 1:
+            return Postponed()
+        return PlainName()(obj, attr, obj_ref)
+
+    mm.register_scope_providers({"Entity.base": postponing_scope})
+    model = mm.model_from_str("entity A {} entity B extends A {} entity C extends A {}")
+
+    assert model.entities[1].base is model.entities[0]
+    assert model._tx_stats.postponed_retries == 1
+    assert model._tx_stats.resolution_passes == 2
+
+
+def test_no_model_stats():
+    mm = metamodel_from_str(grammar)
+    model = mm.model_from_str("entity A {}")
+    assert not hasattr(model, "_tx_stats")
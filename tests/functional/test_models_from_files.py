@@ -0,0 +1,176 @@
+"""
+Loading of many models with one meta-model (`models_from_files` and
+`models_from_strs`).
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import textx.scoping.providers as scoping_providers
+from textx import metamodel_from_str
+from textx.exceptions import TextXError, TextXSemanticError, TextXSyntaxError
+from textx.scoping import construct_models_in_workers
+
+grammar = """
+Model: shapes*=Shape;
+Shape: Circle | Square;
+Circle: 'circle' name=ID r=INT;
+Square: 'square' name=ID a=INT ('inside' inside=[Shape])?;
+"""
+
+model_strs = [
+    "circle c 1 square s 2 inside c",
+    "square s 2 inside x",
+    "circle c",
+    "square s1 1 square s2 2 inside s1",
+]
+
+
+def check_results(results):
+    assert len(results) == 4
+    model, unknown_ref, syntax_error, other_model = results
+    circle, square = model.shapes
+    assert square.inside is circle
+    assert isinstance(unknown_ref, TextXSemanticError)
+    assert (unknown_ref.line, unknown_ref.col) == (1, 19)
+    assert isinstance(syntax_error, TextXSyntaxError)
+    assert other_model.shapes[1].inside is other_model.shapes[0]
+
+
+@pytest.mark.parametrize(
+    "workers, executor", [(1, None), (3, None), (3, "process"), (1, "process")]
+)
+def test_models_from_files(tmp_path, workers, executor):
+    mm = metamodel_from_str(grammar)
+    file_names = []
+    for idx, model_str in enumerate(model_strs):
+        file_name = tmp_path / f"model{idx}.shapes"
+        file_name.write_text(model_str)
+        file_names.append(file_name)
+
+    results = mm.models_from_files(file_names, workers=workers, executor=executor)
+
+    check_results(results)
+    assert results[1].filename == str(file_names[1])
+    assert results[0]._tx_filename == str(file_names[0])
+
+
+def test_models_from_files_missing_file(tmp_path):
+    mm = metamodel_from_str(grammar)
+    (tmp_path / "model.shapes").write_text(model_strs[0])
+
+    missing, model = mm.models_from_files(
+        [tmp_path / "missing.shapes", tmp_path / "model.shapes"]
+    )
+
+    assert isinstance(missing, FileNotFoundError)
+    assert len(model.shapes) == 2
+
+
+@pytest.mark.parametrize("workers, executor", [(1, None), (3, "thread"), (3, "process")])
+def test_models_from_strs(workers, executor):
+    mm = metamodel_from_str(grammar)
+    check_results(mm.models_from_strs(model_strs, workers=workers, executor=executor))
+
+
+def test_models_from_strs_given_executor():
+    mm = metamodel_from_str(grammar)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        check_results(mm.models_from_strs(model_strs, executor=executor))
+
+
+def test_models_from_strs_model_params():
+    mm = metamodel_from_str(grammar)
+    mm.model_param_defs.add("unit", "The unit of the sizes.")
+
+    models = mm.models_from_strs(model_strs[:1] * 2, unit="cm")
+
+    assert [m._tx_model_params["unit"] for m in models] == ["cm", "cm"]
+    with pytest.raises(TextXError, match="unknown parameter color"):
+        mm.models_from_strs(model_strs, color="red")
+    with pytest.raises(TextXError, match='Unknown executor "fibers"'):
+        mm.models_from_strs(model_strs, executor="fibers")
+
+
+def test_models_from_strs_process_pool_executor():
+    mm = metamodel_from_str(grammar)
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        with pytest.raises(TextXError, match='use executor="process"'):
+            mm.models_from_strs(model_strs, executor=executor)
+    finally:
+        executor.shutdown()
+
+
+import_grammar = """
+Model: imports*=Import shapes*=Shape;
+Import: 'import' importURI=STRING;
+Shape: 'shape' name=ID ('inside' inside=[Shape])?;
+"""
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_models_from_files_global_repository(tmp_path, executor):
+    """
+    Test that models sharing an import are loaded with a global repository.
+    """
+    mm = metamodel_from_str(import_grammar, global_repository=True)
+    mm.register_scope_providers({"*.*": scoping_providers.FQNImportURI()})
+    (tmp_path / "common.shapes").write_text("shape base")
+    file_names = []
+    for idx in range(16):
+        file_name = tmp_path / f"model{idx}.shapes"
+        file_name.write_text(f'import "common.shapes" shape s{idx} inside base')
+        file_names.append(file_name)
+
+    models = mm.models_from_files(file_names, workers=8, executor=executor)
+
+    bases = {model.shapes[0].inside for model in models}
+    assert len(bases) == 1
+    assert (
+        bases.pop()
+        is mm._tx_model_repository.all_models[str(tmp_path / "common.shapes")].shapes[0]
+    )
+
+
+fork_only = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="models are parsed by forked processes",
+)
+
+
+@fork_only
+def test_construct_models_in_workers():
+    mm = metamodel_from_str(grammar)
+    strs = model_strs[:3]
+
+    constructed = construct_models_in_workers([mm] * 3, [None] * 3, None, 2, strs)
+    # Models with syntax errors are loaded again in this process
+    assert [c is not None for c in constructed] == [True, True, False]
+
+    # Forking a process running several threads is not safe
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        constructed = construct_models_in_workers([mm] * 3, [None] * 3, None, 2, strs)
+    finally:
+        stop.set()
+        thread.join()
+    assert constructed == [None] * 3
+
+
+@fork_only
+def test_construct_models_in_workers_unexpected_error():
+    mm = metamodel_from_str(grammar)
+
+    def radius(value):
+        raise ValueError("unexpected")
+
+    mm.register_obj_processors({"INT": radius})
+
+    with pytest.raises(ValueError, match="unexpected"):
+        construct_models_in_workers([mm] * 2, [None] * 2, None, 2, model_strs[:2])
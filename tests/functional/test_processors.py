@@ -405,3 +405,45 @@ def test_obj_processor_exception_wrap_for_match_rules():
     mm.model_from_str("X Y Z")
     with pytest.raises(TextXError, match=r"None:1:3:.*test"):
         mm.model_from_str("X E Z")
+
+
+def test_obj_processor_error_location_is_computed_on_error(monkeypatch):
+    import arpeggio
+
+    from textx import TextXError
+
+    linecol_calls = []
+    pos_to_linecol = arpeggio.Parser.pos_to_linecol
+
+    def counting_pos_to_linecol(self, pos):
+        linecol_calls.append(pos)
+        return pos_to_linecol(self, pos)
+
+    monkeypatch.setattr(arpeggio.Parser, "pos_to_linecol", counting_pos_to_linecol)
+
+    grammar = r"""
+        Model: a+=A b+=B;
+        A: /\w+/;
+        B: '#' name=ID;
+        """
+
+    def check_a(a):
+        if a == "E":
+            raise TextXError("bad A")
+
+    def check_b(b):
+        if b.name == "F":
+            raise TextXError("bad B")
+
+    mm = metamodel_from_str(grammar)
+    mm.register_obj_processors({"A": check_a, "B": check_b})
+
+    mm.model_from_str("X Y\n#Z #W")
+    assert linecol_calls == []
+
+    with pytest.raises(TextXError, match=r"None:2:3:.*bad A") as e:
+        mm.model_from_str("X\nY E\n#Z")
+    assert (e.value.line, e.value.col) == (2, 3)
+
+    with pytest.raises(TextXError, match=r"None:3:2:.*bad B"):
+        mm.model_from_str("X\nY\n #F")
@@ -0,0 +1,85 @@
+"""
+Per-rule parse profiling (`textx.profiler` and `textx profile` command).
+"""
+
+import json
+
+import click
+from click.testing import CliRunner
+
+from textx import metamodel_from_str
+from textx.cli.profile import profile
+from textx.profiler import ParseProfiler
+
+grammar = """
+Model: items+=Item;
+Item: Call | Assign;
+Call: target=Target '(' ')';
+Assign: target=Target '=' value=INT;
+Target: parts+=ID['.'];
+"""
+
+
+def test_parse_profiler():
+    mm = metamodel_from_str(grammar, memoization=True)
+    parse = type(mm._parser_blueprint.parser_model).parse
+
+    with ParseProfiler(mm) as profiler:
+        model = mm.model_from_str("a.b = 1 b() c = 2")
+
+    assert len(model.items) == 3
+    rules = {stats.name: stats for stats in profiler.hottest()}
+    # Call is tried first for each item and backtracks for assignments
+    call = rules["Call"]
+    assert (call.attempts, call.matches, call.fails) == (4, 1, 3)
+    target = rules["Target"]
+    assert (target.attempts, target.memo_hits) == (7, 3)
+    assert rules["Target.parts (__asgn_oneormore)"].attempts == 4
+    assert rules["'.'"].matches == 1
+    assert rules["Model"].attempts == 1
+    assert rules["Model"].time >= rules["Item"].time > rules["Item"].own_time
+
+    # Rules are restored after profiling
+    assert mm._parser_blueprint.parser_model.parse.__func__ is parse
+    assert profiler.hottest(2) == profiler.hottest()[:2]
+    assert profiler.report(2).splitlines()[0].split() == [
+        "Rule",
+        "Attempts",
+        "Matches",
+        "Fails",
+        "Memo",
+        "hits",
+        "Time",
+        "ms",
+        "Own",
+        "ms",
+    ]
+
+
+def test_profile_command(tmp_path):
+    grammar_file = tmp_path / "calls.tx"
+    grammar_file.write_text(grammar)
+    model_file = tmp_path / "model.calls"
+    model_file.write_text("a = 1 b()")
+    # Independent of the commands registered by the installed package.
+    cli = click.Group()
+    profile(cli)
+    args = ["profile", str(model_file), "--grammar", str(grammar_file)]
+    runner = CliRunner()
+
+    result = runner.invoke(cli, [*args, "--top", "3"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == f"Grammar: {grammar_file}"
+    assert len([line for line in lines if line]) == 5
+
+    result = runner.invoke(cli, [*args, "--top", "0", "--json"])
+    assert result.exit_code == 0
+    (output,) = json.loads(result.output)
+    assert output["grammar"] == str(grammar_file)
+    call = next(rule for rule in output["rules"] if rule["name"] == "Call")
+    assert (call["attempts"], call["fails"]) == (3, 2)
+
+    model_file.write_text("a =")
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 1
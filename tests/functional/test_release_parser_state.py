@@ -0,0 +1,95 @@
+"""
+Releasing the parse tree and the parser state after model construction
+(`release_parser_state` meta-model parameter, `release_model` and
+`_tx_release` method).
+"""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from textx import get_location, get_model, metamodel_from_str, release_model
+from textx.exceptions import TextXSemanticError
+
+grammar = """
+Model: entities+=Entity;
+Entity: 'entity' name=ID ('extends' base=[Entity])? '{' attrs*=Attr '}';
+Attr: name=ID ':' type=ID;
+"""
+
+model_str = "\n".join(
+    f"entity E{i} {f'extends E{i - 1}' if i else ''} {{ a: int b: string }}"
+    for i in range(300)
+)
+
+
+def traced_memory(load):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = load()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_release_parser_state_frees_memory():
+    mm = metamodel_from_str(grammar, memoization=True)
+    released_mm = metamodel_from_str(grammar, memoization=True, release_parser_state=True)
+    mm.model_from_str(model_str)
+    released_mm.model_from_str(model_str)
+
+    model, size = traced_memory(lambda: mm.model_from_str(model_str))
+    released_model, released_size = traced_memory(
+        lambda: released_mm.model_from_str(model_str)
+    )
+
+    assert model._tx_parser.parse_tree is not None
+    assert released_model._tx_parser.parse_tree is None
+    # The parse tree is much larger than the model itself.
+    assert released_size < size / 2
+
+    def load_and_release():
+        model = mm.model_from_str(model_str)
+        model._tx_release()
+        return model
+
+    model, released_later_size = traced_memory(load_and_release)
+    assert model._tx_parser.parse_tree is None
+    assert released_later_size < size / 2
+
+
+def test_release_parser_state_keeps_location():
+    mm = metamodel_from_str(grammar, release_parser_state=True)
+    model = mm.model_from_str(model_str)
+    entity = model.entities[2]
+
+    assert entity.base is model.entities[1]
+    assert get_location(entity) == {"line": 3, "col": 1, "nchar": 41, "filename": None}
+    assert get_model(entity.attrs[0]) is model
+
+    entity._tx_release()
+    assert get_location(entity.attrs[1])["line"] == 3
+
+
+def test_release_model_user_class_root():
+    class Model:
+        def __init__(self, entities):
+            self.entities = entities
+
+    mm = metamodel_from_str(grammar, classes=[Model])
+    model = mm.model_from_str(model_str)
+    assert isinstance(model, Model)
+
+    release_model(model.entities[0])
+    assert model._tx_parser.parse_tree is None
+    assert get_location(model.entities[1])["line"] == 2
+
+
+def test_release_parser_state_errors():
+    mm = metamodel_from_str(grammar, release_parser_state=True)
+    with pytest.raises(TextXSemanticError, match='Unknown object "X"') as e:
+        mm.model_from_str("entity A {}\nentity B extends X {}")
+    assert (e.value.line, e.value.col) == (2, 18)
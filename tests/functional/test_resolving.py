@@ -44,7 +44,7 @@ def test_match_complex_recursive_peg_rule_resolve():
     assert calc_rule is expression_rule
     assert type(calc_rule) is Sequence
 
-    assert type(metamodel["term_op"]._tx_peg_rule) is OrderedChoice
+    assert isinstance(metamodel["term_op"]._tx_peg_rule, OrderedChoice)
 
     # Recursive factor rule
     factor_rule = metamodel["factor"]._tx_peg_rule
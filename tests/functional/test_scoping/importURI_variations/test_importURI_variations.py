@@ -103,6 +103,31 @@ def test_importURI_variations_import_as_ok1():
     #################################
 
 
+def test_importURI_variations_import_as_ok1_indexed():
+    my_meta_model = metamodel_from_str(grammar)
+
+    def conv(i):
+        return i.replace(".", "/") + ".model"
+
+    my_meta_model.register_scope_providers(
+        {
+            "*.*": scoping_providers.FQNImportURI(
+                importURI_converter=conv, importAs=True, indexed=True
+            )
+        }
+    )
+
+    my_model = my_meta_model.model_from_file(
+        join(abspath(dirname(__file__)), "importAs", "b_ok1.model")
+    )
+
+    assert my_model.packages[0].name == "B"
+    assert my_model.packages[0].objects[0].name == "A1"
+    assert my_model.packages[0].objects[0].ref.text == "from A1"
+    assert my_model.packages[0].objects[1].name == "A2"
+    assert my_model.packages[0].objects[1].ref.text == "from A2"
+
+
 def test_importURI_variations_import_as_ok2():
     #################################
     # META MODEL DEF
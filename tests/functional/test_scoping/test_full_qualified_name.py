@@ -164,3 +164,66 @@ def test_fully_qualified_name_ref_type_error():
         }
         """
         )
+
+
+def test_fully_qualified_name_ref_indexed(monkeypatch):
+    """
+    The indexed FQN provider resolves the same names as the default one
+    and builds the index of the model once per resolution pass.
+    """
+    import textx.model
+
+    built = []
+
+    class CountingFQNIndex(textx.model.FQNIndex):
+        def __init__(self, model):
+            built.append(model)
+            super().__init__(model)
+
+    monkeypatch.setattr(textx.model, "FQNIndex", CountingFQNIndex)
+
+    my_metamodel = metamodel_from_str(metamodel_str)
+    my_metamodel.register_scope_providers({"*.*": scoping_providers.FQN(indexed=True)})
+
+    my_model = my_metamodel.model_from_str(
+        """
+    package P1 {
+        class Part1 {
+        }
+    }
+    package P2 {
+        class Part2 {
+            attr C2 rec;
+        }
+        class C2 {
+            attr P1.Part1 p1;
+            attr Part2 p2a;
+            attr P2.Part2 p2b;
+        }
+    }
+    """
+    )
+
+    assert len(built) == 1
+    p1, p2 = my_model.packages
+    assert p2.classes[0].attributes[0].ref is p2.classes[1]
+    assert p2.classes[1].attributes[0].ref is p1.classes[0]
+    assert p2.classes[1].attributes[1].ref is p2.classes[0]
+    assert p2.classes[1].attributes[2].ref is p2.classes[0]
+
+    with raises(
+        textx.exceptions.TextXSemanticError, match=r"None:8:.*: Unknown object.*Part1.*"
+    ):
+        my_metamodel.model_from_str(
+            """ #1
+        package P1 { #2
+            class Part1 { #3
+            } #4
+        } #5
+        package P2 { #6
+            class C2 { #7
+                attr Part1 p1; #8
+            }
+        }
+        """
+        )
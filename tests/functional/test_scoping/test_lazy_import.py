@@ -0,0 +1,76 @@
+"""
+Lazy loading of imported models (`lazy` parameter of the ImportURI scope
+providers).
+"""
+
+import pytest
+
+import textx.scoping.providers as scoping_providers
+from textx import get_model, metamodel_from_str
+from textx.exceptions import TextXSemanticError, TextXSyntaxError
+from textx.scoping import get_included_models
+
+grammar = """
+Model: imports*=Import entities*=Entity;
+Import: 'import' importURI=STRING;
+Entity: 'entity' name=ID ('extends' base=[Entity])?;
+"""
+
+
+@pytest.fixture
+def model_files(tmp_path):
+    (tmp_path / "main.ent").write_text(
+        'import "a.ent" import "b.ent" import "broken.ent" entity Main extends A'
+    )
+    (tmp_path / "a.ent").write_text('import "c.ent" entity A extends C')
+    (tmp_path / "b.ent").write_text("entity B")
+    (tmp_path / "c.ent").write_text("entity C")
+    (tmp_path / "broken.ent").write_text("entity")
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "provider", [scoping_providers.PlainNameImportURI, scoping_providers.FQNImportURI]
+)
+def test_lazy_import(model_files, provider):
+    mm = metamodel_from_str(grammar)
+    mm.register_scope_providers({"*.*": provider(lazy=True)})
+
+    model = mm.model_from_file(model_files / "main.ent")
+
+    a = model.entities[0].base
+    assert a.name == "A"
+    assert a.base.name == "C"
+    # Models which are not needed are not loaded
+    assert sorted(m._tx_filename for m in get_included_models(model)) == [
+        str(model_files / "a.ent"),
+        str(model_files / "c.ent"),
+        str(model_files / "main.ent"),
+    ]
+    # Lazily loaded models are constructed completely
+    assert not hasattr(get_model(a), "_tx_reference_resolver")
+    assert not hasattr(get_model(a.base), "_tx_reference_resolver")
+
+
+def test_lazy_import_all_loaded_for_unknown_reference(model_files):
+    mm = metamodel_from_str(grammar)
+    mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI(lazy=True)})
+
+    (model_files / "main.ent").write_text(
+        'import "a.ent" import "b.ent" entity Main extends X'
+    )
+    with pytest.raises(TextXSemanticError, match='Unknown object "X"'):
+        mm.model_from_file(model_files / "main.ent")
+
+    # Errors in the imported models are reported once they are loaded
+    (model_files / "main.ent").write_text('import "broken.ent" entity Main extends X')
+    with pytest.raises(TextXSyntaxError):
+        mm.model_from_file(model_files / "main.ent")
+
+
+def test_eager_import(model_files):
+    mm = metamodel_from_str(grammar)
+    mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI()})
+
+    with pytest.raises(TextXSyntaxError):
+        mm.model_from_file(model_files / "main.ent")
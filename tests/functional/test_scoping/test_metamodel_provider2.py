@@ -1,5 +1,9 @@
+import multiprocessing
 from os.path import abspath, dirname, join
 
+import pytest
+
+import textx.model
 import textx.scoping.providers as scoping_providers
 from textx import (
     clear_language_registrations,
@@ -89,3 +93,58 @@ def test_metamodel_provider_advanced_test():
     #################################
     # END
     #################################
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="models are parsed by forked processes",
+)
+def test_metamodel_provider_load_models_in_workers(monkeypatch):
+    """
+    Models registered in the global repo are parsed by worker processes and
+    their references are resolved in the current process.
+    """
+    this_folder = dirname(abspath(__file__))
+    folder = join(this_folder, "metamodel_provider2")
+
+    # Models constructed in this process
+    constructed = []
+    construct_model = textx.model.construct_model
+
+    def counting_construct_model(parser, parse_tree):
+        constructed.append(parser.file_name)
+        return construct_model(parser, parse_tree)
+
+    monkeypatch.setattr(textx.model, "construct_model", counting_construct_model)
+
+    global_repo = scoping_providers.PlainNameGlobalRepo(workers=2)
+    global_repo.register_models(join(folder, "*.recipe"))
+    global_repo.register_models(join(folder, "*.ingredient"))
+    clear_language_registrations()
+    for name in ("Ingredient", "Recipe"):
+        mm = metamodel_from_file(join(folder, f"{name}.tx"))
+        mm.register_scope_providers(
+            {
+                "*.*": global_repo,
+                "Ingredient.unit": scoping_providers.ExtRelativeName(
+                    "type", "units", "extends"
+                ),
+            }
+        )
+        register_language(
+            f"{name.lower()}-dsl", pattern=f"*.{name.lower()}", metamodel=mm
+        )
+
+    try:
+        model_repo = global_repo.load_models_in_model_repo().all_models
+    finally:
+        clear_language_registrations()
+
+    # The only ingredient model is not worth a worker process
+    assert constructed == [join(folder, "some.ingredient")]
+    assert len(model_repo) == 3
+    recipes = [r for m in model_repo for r in get_children_of_type("Recipe", m)]
+    assert len(recipes) == 2
+    ingredient = recipes[0].ingredients[0]
+    assert ingredient.type.name in ("Eggs", "Milk")
+    assert ingredient.unit in ingredient.type.units
@@ -210,3 +210,22 @@ def test_model_modification_through_scoping_custom_lookup_addon_fix():
             *hello Berry
             """
         )
+
+
+def test_model_modification_through_scoping_visible_in_same_pass():
+    """
+    Objects created by a custom scope provider are found by the default
+    provider without waiting for the next resolution pass.
+    """
+    mm = metamodel_from_str(grammar_addon)
+    mm.register_scope_providers({"Knows.*": person_definer_scope})
+
+    m = mm.model_from_str(
+        r"""
+        Tom knows Jerry
+        *hello Tom
+        """
+    )
+
+    assert len(m.persons) == 2
+    assert m.greetings[0].person is m.knows[0].person1
@@ -1,8 +1,9 @@
+import gc
 from os.path import abspath, dirname, join
 
 import textx.scoping.providers as scoping_providers
-from textx import metamodel_from_file
-from textx.scoping import is_file_included
+from textx import get_model, metamodel_from_file, metamodel_from_str
+from textx.scoping import GlobalModelRepository, ModelRepository, is_file_included
 
 
 def test_inclusion_check_1():
@@ -140,11 +141,132 @@ def test_inclusion_check_2():
 
 
 def test_no_tx_model_repos():
-    from textx import metamodel_from_str
-
     mm = metamodel_from_str("Model: 'A';")
     m = mm.model_from_str("A")
 
     assert not is_file_included(
         join(abspath(dirname(__file__)), "issue66", "local", "mylib", "position.tasks"), m
     )
+
+
+def test_bounded_model_repository(tmp_path):
+    """
+    Test that a repository with `max_models` keeps only weak references to
+    the least recently used models and loads them again once they are
+    garbage collected.
+    """
+    mm = metamodel_from_str(
+        """
+        Model: imports*=Import entities*=Entity;
+        Import: 'import' importURI=STRING;
+        Entity: 'entity' name=ID ('extends' base=[Entity])?;
+        """,
+        global_repository=GlobalModelRepository(max_models=2),
+    )
+    mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI()})
+    repo = mm._tx_model_repository.all_models
+    (tmp_path / "base.ent").write_text("entity Base")
+    for i in range(5):
+        (tmp_path / f"model{i}.ent").write_text(
+            f'import "base.ent" entity E{i} extends Base'
+        )
+
+    model = mm.model_from_file(tmp_path / "model0.ent")
+    base = model.entities[0].base
+    for i in range(1, 5):
+        other = mm.model_from_file(tmp_path / f"model{i}.ent")
+        # Evicted, but still in use by the first model
+        assert other.entities[0].base is base
+    del other
+    gc.collect()
+
+    # The most recently used models and the models still in use are kept
+    assert set(repo.filename_to_model) == {
+        str(tmp_path / "base.ent"),
+        str(tmp_path / "model4.ent"),
+    }
+    assert repo.evictions == 4
+    assert len(repo) == 3
+    assert model in list(repo) and get_model(base) in list(repo)
+    assert repo.reloads == 0
+
+    # Collected models are loaded again
+    del model, base
+    gc.collect()
+    assert len(repo) == 2
+    model = mm.model_from_file(tmp_path / "model0.ent")
+    assert model.entities[0].base.name == "Base"
+    assert repo.reloads == 1
+    assert len(repo.filename_to_model) == 2
+
+
+def test_model_repository_file_cache(tmp_path, monkeypatch):
+    """
+    Test that the file system lookups done for imports are cached in the
+    global repository while models are loaded together and that files added
+    later are seen by the next load.
+    """
+    import textx.scoping
+
+    glob_calls = []
+    glob = textx.scoping.glob.glob
+
+    def counting_glob(*args, **kwargs):
+        glob_calls.append(args)
+        return glob(*args, **kwargs)
+
+    monkeypatch.setattr(textx.scoping.glob, "glob", counting_glob)
+    mm = metamodel_from_str(
+        """
+        Model: imports*=Import entities*=Entity;
+        Import: 'import' importURI=STRING;
+        Entity: 'entity' name=ID ('extends' base=[Entity])?;
+        """,
+        global_repository=True,
+    )
+    mm.register_scope_providers({"*.*": scoping_providers.PlainNameImportURI()})
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "a.lib").write_text("entity A")
+    for i in range(3):
+        (tmp_path / f"model{i}.ent").write_text(
+            f'import "lib/*.lib" entity E{i} extends A'
+        )
+
+    mm.models_from_files([tmp_path / f"model{i}.ent" for i in range(3)])
+    assert len(glob_calls) == 1
+
+    # Files added after a load are found by the next load
+    (tmp_path / "lib" / "b.lib").write_text("entity B")
+    (tmp_path / "model3.ent").write_text('import "lib/*.lib" entity E3 extends B')
+    model = mm.model_from_file(tmp_path / "model3.ent")
+    assert model.entities[0].base.name == "B"
+    assert len(glob_calls) == 2
+
+
+def test_bounded_model_repository_lru_order():
+    """
+    Test that accessing a model makes it the most recently used one and that
+    models which can't be weakly referenced are kept.
+    """
+
+    class Model:
+        pass
+
+    repo = ModelRepository(max_models=2)
+    models = [Model() for _ in range(3)]
+    repo["a"], repo["b"] = models[0], models[1]
+    assert repo["a"] is models[0]
+    repo["c"] = models[2]
+    assert list(repo.filename_to_model) == ["a", "c"]
+    assert repo.evictions == 1
+
+    # Tuples can't be weakly referenced
+    repo["d"] = ("not", "weakly", "referenced")
+    repo["e"] = ()
+    c = models[2]
+    del models
+    gc.collect()
+    assert list(repo.filename_to_model) == ["d", "e"]
+    assert repo["c"] is c and "a" not in repo
+    assert repo["d"] == ("not", "weakly", "referenced")
+    assert list(repo.filename_to_model) == ["c", "d"]
@@ -285,3 +285,28 @@ def test_plain_name_ref_type_error():
         }
         """
         )
+
+
+def test_plain_name_ref_uses_name_index(monkeypatch):
+    """
+    The PlainName provider builds the name index of a model once for all
+    references resolved in one resolution pass.
+    """
+    import textx.model
+
+    built = []
+
+    class CountingNameIndex(textx.model.NameIndex):
+        def __init__(self, model):
+            built.append(model)
+            super().__init__(model)
+
+    monkeypatch.setattr(textx.model, "NameIndex", CountingNameIndex)
+
+    my_metamodel = metamodel_from_str(metamodel_str)
+    classes = "\n".join(f"class C{i} {{ attr C{(i + 1) % 50} a{i}; }}" for i in range(50))
+    my_model = my_metamodel.model_from_str(f"package P {{ {classes} }}")
+
+    assert len(built) == 1
+    assert my_model.packages[0].classes[3].attributes[0].ref.name == "C4"
+    assert my_model.packages[0].classes[49].attributes[0].ref.name == "C0"
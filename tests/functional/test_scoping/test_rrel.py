@@ -1,10 +1,18 @@
-from arpeggio import NoMatch, ParserPython
+from concurrent.futures import ThreadPoolExecutor
+
+from arpeggio import NoMatch, ParserPython, visit_parse_tree
 from pytest import raises
 
 from textx import metamodel_from_str, textx_isinstance
 from textx.exceptions import TextXSemanticError
 from textx.scoping import ModelRepository
-from textx.scoping.rrel import find, find_object_with_path, parse, rrel_standalone
+from textx.scoping.rrel import (
+    RRELVisitor,
+    find,
+    find_object_with_path,
+    parse,
+    rrel_standalone,
+)
 
 
 def test_rrel_basic_parser1():
@@ -48,6 +56,34 @@ def test_rrel_basic_parser2():
         tree = parse("a,b,c,")
 
 
+def test_rrel_parse_is_cached():
+    tree = parse("^pkg*.cls")
+    assert parse("^pkg*.cls") is tree
+    assert parse("^pkg*.cls,a") is not tree
+    assert tree.seq.start_locally() and not tree.seq.start_at_root()
+    tree = parse("a.(b)*")
+    assert not tree.seq.start_locally() and tree.seq.start_at_root()
+    tree = parse("..a,parent(X)")
+    assert tree.seq.start_locally() and not tree.seq.start_at_root()
+
+
+def test_rrel_parse_in_threads():
+    expressions = [
+        f"^pkg{i}_{j}*.cls{j},..a{i}.(b{j})*,parent(X{i})"
+        for i in range(8)
+        for j in range(100)
+    ]
+    parser = ParserPython(rrel_standalone, reduce_tree=False)
+    expected = [
+        str(visit_parse_tree(parser.parse(e), RRELVisitor())) for e in expressions
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        trees = list(executor.map(parse, expressions))
+
+    assert [str(tree) for tree in trees] == expected
+
+
 metamodel_str = """
     Model:
         packages*=Package
@@ -0,0 +1,49 @@
+from textx import get_model, metamodel_from_str
+from textx.scoping.tools import get_unique_named_object
+
+grammar = """
+Model: items+=Item;
+Item: Source | Sink;
+Source: 'source' name=ID ('->' next=[Item])?;
+Sink: 'sink' name=ID ('<-' prev=[Item])? ('->' next=[Item])?;
+"""
+
+
+def recording_provider(key, calls):
+    def provider(obj, attr, obj_ref):
+        calls.append((key, obj.name, attr.name))
+        return get_unique_named_object(get_model(obj), obj_ref.obj_name)
+
+    return provider
+
+
+def test_most_specific_scope_provider_is_used():
+    mm = metamodel_from_str(grammar)
+    calls = []
+    mm.register_scope_providers(
+        {
+            "Sink.next": recording_provider("Sink.next", calls),
+            "*.next": recording_provider("*.next", calls),
+            "Sink.*": recording_provider("Sink.*", calls),
+        }
+    )
+    model_str = "source a -> b sink b <- a -> c source c -> a"
+    mm.model_from_str(model_str)
+    assert calls == [
+        ("*.next", "a", "next"),
+        ("Sink.*", "b", "prev"),
+        ("Sink.next", "b", "next"),
+        ("*.next", "c", "next"),
+    ]
+
+    # registering new scope providers drops the previous selection
+    calls.clear()
+    mm.register_scope_providers({"*.*": recording_provider("*.*", calls)})
+    model = mm.model_from_str(model_str)
+    assert [c[0] for c in calls] == ["*.*"] * 4
+    assert model.items[1].next is model.items[2]
+
+    # the default scope provider is used if no provider is registered
+    mm.register_scope_providers({})
+    model = mm.model_from_str(model_str)
+    assert model.items[2].next is model.items[0]
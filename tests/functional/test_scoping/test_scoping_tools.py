@@ -11,9 +11,11 @@ from textx import (
     metamodel_from_str,
     textx_isinstance,
 )
+from textx.scoping import Postponed
 from textx.scoping.tools import (
     get_list_of_concatenated_objects,
     get_unique_named_object,
+    needs_to_be_resolved,
     resolve_model_path,
 )
 
@@ -429,3 +431,62 @@ def test_get_list_of_concatenated_objects():
     assert inherited_classes[0] is middle
     assert inherited_classes[1] is start
     assert inherited_classes[2] is end
+
+
+def test_needs_to_be_resolved():
+    mm = metamodel_from_str(
+        """
+        Model: items+=Item;
+        Item: name=ID ('a' a=[Item])? ('b' b+=[Item][','])?;
+        """
+    )
+    observed = []
+
+    def provider(obj, attr, obj_ref):
+        observed.append(
+            (
+                obj.name,
+                attr.name,
+                needs_to_be_resolved(obj, "a"),
+                needs_to_be_resolved(obj, "b"),
+            )
+        )
+        return get_unique_named_object(get_model(obj), obj_ref.obj_name)
+
+    mm.register_scope_providers({"*.*": provider})
+    model = mm.model_from_str("x a y b x, y y a x z")
+
+    # references are marked as resolved as soon as they are resolved
+    assert observed == [
+        ("x", "a", True, True),
+        ("x", "b", False, True),
+        ("x", "b", False, True),
+        ("y", "a", True, False),
+    ]
+    assert not needs_to_be_resolved(model.items[0], "a")
+
+
+def test_postponed_references_are_retried_when_dependencies_are_resolved():
+    mm = metamodel_from_str(
+        """
+        Model: items+=Item;
+        Item: name=ID ('->' next=[Item])?;
+        """
+    )
+    calls = []
+
+    def provider(obj, attr, obj_ref):
+        # resolve only if the target object is already linked
+        calls.append(obj.name)
+        target = get_unique_named_object(get_model(obj), obj_ref.obj_name)
+        if needs_to_be_resolved(target, "next"):
+            return Postponed()
+        return target
+
+    mm.register_scope_providers({"*.*": provider})
+    n = 20
+    model = mm.model_from_str(" ".join(f"i{i} -> i{i + 1}" for i in range(n)) + f" i{n}")
+
+    assert model.items[0].next.next is model.items[2]
+    # each postponed reference is retried once, after its target got linked
+    assert len(calls) == n + (n - 1)
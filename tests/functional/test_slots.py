@@ -0,0 +1,82 @@
+"""
+Model objects with slots (`use_slots` meta-model parameter).
+"""
+
+import io
+
+import pytest
+
+import textx.scoping.providers as scoping_providers
+from textx import (
+    get_children_of_type,
+    get_model,
+    metamodel_from_str,
+    textx_isinstance,
+)
+from textx.export import model_export_to_file
+
+grammar = """
+Model: packages+=Package;
+Package: 'package' name=ID '{' elements*=Element '}';
+Element: Class | Alias;
+Class: 'class' name=ID ('extends' base=[Class:FQN])?;
+Alias: 'alias' name=ID '=' target=[Class:FQN];
+FQN: ID+['.'];
+"""
+
+model_str = """
+package p1 {
+    class A
+    class B extends p1.A
+}
+package p2 {
+    alias C = p1.B
+}
+"""
+
+
+def test_slots():
+    mm = metamodel_from_str(grammar, use_slots=True)
+    mm.register_scope_providers({"*.*": scoping_providers.FQN()})
+    model = mm.model_from_str(model_str)
+
+    a, b = model.packages[0].elements
+    alias = model.packages[1].elements[0]
+    assert b.base is a
+    assert alias.target is b
+    assert get_model(alias) is model
+    assert get_children_of_type("Class", model) == [a, b]
+
+    # Objects are instances of a subclass of the meta-class
+    assert isinstance(a, mm["Class"])
+    assert textx_isinstance(alias, mm["Element"])
+    assert type(a).__name__ == "Class"
+
+    # Only the model root has a `__dict__`
+    assert not hasattr(a, "__dict__")
+    assert model._tx_filename is None
+    with pytest.raises(AttributeError):
+        a.some_new_attr = 1
+
+    f = io.StringIO()
+    model_export_to_file(f, model)
+    assert "B:Class" in f.getvalue()
+
+    # Objects created from the meta-class also use slots
+    c = mm["Class"]()
+    c.name = "D"
+    assert not hasattr(c, "__dict__")
+
+
+def test_slots_abstract_root():
+    mm = metamodel_from_str(
+        """
+        Root: Number | Text;
+        Number: value=INT;
+        Text: value=STRING;
+        """,
+        use_slots=True,
+    )
+    model = mm.model_from_str('"text"')
+    assert model.value == "text"
+    assert model._tx_metamodel is mm
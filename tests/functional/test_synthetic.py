@@ -0,0 +1,131 @@
+"""
+Synthetic models generated from the grammar (`SyntheticModelGenerator`).
+"""
+
+import os
+
+import pytest
+
+import textx.scoping.providers as scoping_providers
+from textx import get_children_of_type, get_model, metamodel_from_str
+from textx.exceptions import TextXError
+from textx.synthetic import SyntheticModelGenerator
+
+grammar = """
+Model: imports*=Import packages*=Package;
+Import: 'import' importURI=STRING;
+Package: 'package' name=ID '{' entities*=Entity '}';
+Entity: 'entity' name=ID ('extends' base=[Entity:FQN])? '{' attrs*=Attr '}';
+Attr: name=ID ':' type=[Type:FQN] ('=' default=Value)?;
+Type: Entity | BuiltinType;
+BuiltinType: 'builtin' name=ID;
+Value: STRING | FLOAT | INT | BOOL;
+FQN: ID('.'ID)*;
+"""
+
+
+def test_synthetic_model():
+    mm = metamodel_from_str(grammar)
+    model_str = SyntheticModelGenerator(mm, size=500, seed=1).model_str()
+    model = mm.model_from_str(model_str)
+
+    packages = get_children_of_type("Package", model)
+    entities = get_children_of_type("Entity", model)
+    attrs = get_children_of_type("Attr", model)
+    assert 400 < len(packages) + len(entities) + len(attrs) < 600
+    names = [obj.name for obj in packages + entities + attrs]
+    assert len(set(names)) == len(names)
+    assert all(attr.type is not None for attr in attrs)
+    assert any(entity.base is not None for entity in entities)
+    assert not model.imports
+
+    # The same seed gives the same model
+    assert SyntheticModelGenerator(mm, size=500, seed=1).model_str() == model_str
+
+
+def test_synthetic_model_fqn():
+    mm = metamodel_from_str(grammar)
+    mm.register_scope_providers({"*.*": scoping_providers.FQN()})
+    model_str = SyntheticModelGenerator(mm, size=100, fqn=True, seed=1).model_str()
+    model = mm.model_from_str(model_str)
+
+    attrs = get_children_of_type("Attr", model)
+    assert f" : {model.packages[0].name}." in model_str
+    # References to the entities of other packages
+    assert any(attr.type.parent is not attr.parent.parent for attr in attrs)
+
+
+@pytest.mark.parametrize(
+    "provider, fqn",
+    [
+        (scoping_providers.PlainNameImportURI, False),
+        (scoping_providers.FQNImportURI, True),
+    ],
+)
+def test_synthetic_model_files_import(tmp_path, provider, fqn):
+    mm = metamodel_from_str(grammar)
+    mm.register_scope_providers({"*.*": provider()})
+    generator = SyntheticModelGenerator(mm, size=50, fqn=fqn, seed=1)
+    file_names = generator.model_files(tmp_path, files=5, fan_out=2)
+
+    assert [os.path.basename(f) for f in file_names] == [
+        f"model{i}.txt" for i in range(5)
+    ]
+    model = mm.model_from_file(file_names[-1])
+    assert [i.importURI for i in model.imports] == ["model2.txt", "model3.txt"]
+    types = {
+        get_model(attr.type)._tx_filename for attr in get_children_of_type("Attr", model)
+    }
+    assert str(file_names[-1]) in types
+    assert len(types) > 1
+
+
+def test_synthetic_model_files_global_repo(tmp_path):
+    mm = metamodel_from_str(grammar.replace("imports*=Import", ""))
+    mm.register_scope_providers(
+        {"*.*": scoping_providers.PlainNameGlobalRepo(str(tmp_path / "*.txt"))}
+    )
+    file_names = SyntheticModelGenerator(mm, size=50, seed=1).model_files(
+        tmp_path, files=3, fan_out=2
+    )
+    model = mm.model_from_file(file_names[-1])
+    assert get_children_of_type("Attr", model)
+
+
+def test_synthetic_model_recursive_grammar():
+    mm = metamodel_from_str(
+        """
+        Calc: assignments*=Assignment expression=Expression;
+        Assignment: variable=ID '=' expression=Expression ';';
+        Expression: operands=Term (operators=/[+-]/ operands=Term)*;
+        Term: operands=Factor (operators=/[*\\/]/ operands=Factor)*;
+        Factor: number=NUMBER | '(' expression=Expression ')';
+        """
+    )
+    for max_depth in [2, 5, 10]:
+        generator = SyntheticModelGenerator(mm, size=200, max_depth=max_depth, seed=3)
+        mm.model_from_str(generator.model_str())
+
+
+def test_synthetic_model_regex_matches():
+    mm = metamodel_from_str(
+        r"""
+        Model: header=/[^\n]*/ codes+=Code;
+        Code: 'code' value=/[A-F0-9]{2}-(x|y)\d+/ (comment=/#[^\n]*/)?;
+        """
+    )
+    for seed in range(10):
+        mm.model_from_str(SyntheticModelGenerator(mm, size=20, seed=seed).model_str())
+
+
+def test_synthetic_model_no_objects_to_reference():
+    mm = metamodel_from_str(
+        """
+        Model: 'uses' uses=[Entity] entities*=Entity;
+        Entity: 'entity' name=ID;
+        """
+    )
+    with pytest.raises(TextXError, match="no objects to reference"):
+        SyntheticModelGenerator(mm, size=1).model_str()
+
+    mm.model_from_str(SyntheticModelGenerator(mm, size=10).model_str())
@@ -0,0 +1,86 @@
+"""
+Loading of models with user classes doesn't modify the user classes so models
+using the same meta-model can be loaded concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from textx import metamodel_from_str
+from textx.exceptions import TextXSemanticError
+from textx.scoping.providers import PlainName
+
+default_scope = PlainName()
+
+grammar = """
+Model: entities+=Entity;
+Entity: 'entity' name=ID ('extends' base=[Entity])? '{' attrs*=Attr '}';
+Attr: name=ID ':' type=ID;
+"""
+
+
+class Entity:
+    def __init__(self, parent, name, base, attrs):
+        self.parent = parent
+        self._name = name
+        self.base = base
+        self.attrs = attrs
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def all_attrs(self):
+        base_attrs = self.base.all_attrs if self.base else []
+        return base_attrs + [a.name for a in self.attrs]
+
+
+def model_str(idx):
+    entities = []
+    for i in range(20):
+        base = f"extends E{idx}_{i - 1}" if i else ""
+        entities.append(f"entity E{idx}_{i} {base} {{ a{i}: int }}")
+    return "\n".join(entities)
+
+
+def test_user_classes_not_modified_during_loading():
+    mm = metamodel_from_str(grammar, classes=[Entity])
+    existing = mm.model_from_str(model_str(0)).entities[0]
+    user_class_dict = dict(Entity.__dict__)
+
+    def base_scope(obj, attr, obj_ref):
+        # Objects being loaded collect their attributes, other
+        # objects of the user class behave as usual.
+        assert isinstance(obj, Entity)
+        assert dict(Entity.__dict__) == user_class_dict
+        assert existing.name == "E0_0"
+        assert existing.all_attrs == ["a0"]
+        return default_scope(obj, attr, obj_ref)
+
+    mm.register_scope_providers({"Entity.base": base_scope})
+    model = mm.model_from_str(model_str(1))
+
+    assert type(model.entities[0]) is Entity
+    assert model.entities[-1].all_attrs == [f"a{i}" for i in range(20)]
+
+
+def test_user_classes_concurrent_loading():
+    mm = metamodel_from_str(grammar, classes=[Entity])
+
+    def load(idx):
+        model = mm.model_from_str(model_str(idx))
+        return [e.all_attrs for e in model.entities]
+
+    expected = [load(idx) for idx in range(16)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(load, range(16))) == expected
+    assert Entity._tx_loading_class._tx_obj_attrs == {}
+
+
+def test_user_classes_loading_error():
+    mm = metamodel_from_str(grammar, classes=[Entity])
+    with pytest.raises(TextXSemanticError, match='Unknown object "X"'):
+        mm.model_from_str("entity A {} entity B extends X {}")
+    assert Entity._tx_loading_class._tx_obj_attrs == {}
@@ -0,0 +1,678 @@
+#######################################################################
+# textX benchmark suite.
+#
+# Measures the time and the peak memory of meta-model construction,
+#   model parsing, reference resolution with the builtin scope
+#   providers, object processors and export, using the languages from
+#   the `examples` folder, models generated from their grammars and
+#   synthetic models, the throughput of loading many model files and
+#   the construction of deeply nested models. The size of the generated
+#   and synthetic models is controlled by `--scale`.
+#
+# Results can be saved as a baseline and later runs compared to it:
+#
+#   python benchmarks.py --save baseline.json
+#   ... change textX ...
+#   python benchmarks.py --compare baseline.json
+#
+# The run fails (exit code 1) if a benchmark is slower or uses more
+#   memory than the baseline by more than `--threshold`.
+#######################################################################
+
+import argparse
+import atexit
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from os.path import abspath, dirname, join
+
+import textx
+import textx.scoping.providers as scoping_providers
+from textx import get_children, metamodel_from_file, metamodel_from_str
+from textx.export import (
+    PlantUmlRenderer,
+    metamodel_export_tofile,
+    model_export_to_file,
+)
+from textx.synthetic import SyntheticModelGenerator
+
+this_folder = dirname(abspath(__file__))
+examples_folder = join(this_folder, "..", "..", "examples")
+
+Benchmark = namedtuple("Benchmark", "setup large unit memory")
+
+# name -> Benchmark
+BENCHMARKS = {}
+
+
+def benchmark(name, large=False, unit=None, memory=True):
+    """
+    Registers a benchmark. The decorated function is called with the scale of
+    the synthetic inputs and returns the function to measure, so the setup is
+    not measured. Large benchmarks are run only with `--large`. If `unit` is
+    given (e.g. "files"), the decorated function returns also the number of
+    units processed by the measured function and the throughput is reported.
+    The peak memory is not measured if `memory` is not set.
+    """
+
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(setup, large, unit, memory)
+        return setup
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Example languages
+# ---------------------------------------------------------------------------
+
+
+class SimpleType:
+    def __init__(self, parent, name):
+        self.parent = parent
+        self.name = name
+
+
+def entity_metamodel_params():
+    return {
+        "classes": [SimpleType],
+        "builtins": {
+            "integer": SimpleType(None, "integer"),
+            "string": SimpleType(None, "string"),
+        },
+    }
+
+
+# name, grammar, model, meta-model parameters
+EXAMPLES = [
+    ("entity", "Entity/entity.tx", "Entity/person.ent", entity_metamodel_params),
+    ("hello_world", "hello_world/hello.tx", "hello_world/example.hello", dict),
+    ("json", "json/json.tx", "json/example5.json", dict),
+    ("pyflies", "pyFlies/pyflies.tx", "pyFlies/experiment.pf", dict),
+    ("rhapsody", "IBM_Rhapsody/rhapsody.tx", "IBM_Rhapsody/LightSwitch.rpy", dict),
+    ("robot", "robot/robot.tx", "robot/program.rbt", dict),
+    (
+        "state_machine",
+        "StateMachine/state_machine.tx",
+        "StateMachine/miss_grant_controller.sm",
+        dict,
+    ),
+    ("workflow", "workflow/workflow.tx", "workflow/example.wf", dict),
+]
+
+
+def register_example(name, grammar_file, model_file, params):
+    grammar_file = join(examples_folder, grammar_file)
+    model_file = join(examples_folder, model_file)
+
+    @benchmark(f"metamodel/{name}")
+    def metamodel_construction(scale):
+        return lambda: metamodel_from_file(grammar_file, **params())
+
+    @benchmark(f"parse/{name}")
+    def parse(scale):
+        mm = metamodel_from_file(grammar_file, **params())
+        return lambda: mm.model_from_file(model_file)
+
+
+for example in EXAMPLES:
+    register_example(*example)
+
+
+# Objects in the models generated from the example grammars
+GENERATED_SIZE = 1000
+
+
+def register_generated(name, grammar_file, params):
+    grammar_file = join(examples_folder, grammar_file)
+
+    @benchmark(f"generated/{name}")
+    def parse(scale):
+        mm = metamodel_from_file(grammar_file, **params())
+        generator = SyntheticModelGenerator(mm, size=GENERATED_SIZE * scale, seed=1)
+        model_str = generator.model_str()
+        return lambda: mm.model_from_str(model_str)
+
+
+for name, grammar_file, _, params in EXAMPLES:
+    # pyFlies conditions are terminated by newlines which are not generated.
+    if name != "pyflies":
+        register_generated(name, grammar_file, params)
+
+
+def register_rhapsody_input(file_name, memoization):
+    name = f"parse/rhapsody-{file_name.split('.')[0]}"
+    if memoization:
+        name += "-memoization"
+
+    @benchmark(name, large=True)
+    def parse(scale):
+        mm = metamodel_from_file(
+            join(this_folder, "rhapsody.tx"), memoization=memoization
+        )
+        return lambda: mm.model_from_file(join(this_folder, "test_inputs", file_name))
+
+
+for file_name in ["LightSwitch.rpy", "LightSwitchDouble.rpy"]:
+    for memoization in [False, True]:
+        register_rhapsody_input(file_name, memoization)
+
+
+@benchmark("export/metamodel-dot")
+def export_metamodel_dot(scale):
+    mm = metamodel_from_file(join(examples_folder, "pyFlies", "pyflies.tx"))
+    return lambda: metamodel_export_tofile(mm, io.StringIO())
+
+
+@benchmark("export/metamodel-plantuml")
+def export_metamodel_plantuml(scale):
+    mm = metamodel_from_file(join(examples_folder, "pyFlies", "pyflies.tx"))
+    return lambda: metamodel_export_tofile(mm, io.StringIO(), PlantUmlRenderer())
+
+
+# ---------------------------------------------------------------------------
+# Synthetic models
+# ---------------------------------------------------------------------------
+
+# Packages of entities whose attributes reference other entities of the same
+# and of the previous package. The models scale linearly with `--scale`.
+PACKAGES = 10
+ENTITIES = 50
+ATTRS = 3
+
+grammar = """
+Model: imports*=Import packages*=Package;
+Import: 'import' importURI=STRING;
+Package: 'package' name=ID '{' entities*=Entity '}';
+Entity: 'entity' name=ID ('extends' base=[Entity:FQN])? '{' attrs*=Attr '}';
+Attr: name=ID ':' type=[Entity:FQN];
+FQN: ID('.'ID)*;
+"""
+
+rrel_grammar = grammar.replace("[Entity:FQN]", "[Entity:FQN|^packages.entities]")
+
+# The same syntax without references, to measure parsing alone.
+parse_grammar = grammar.replace("[Entity:FQN]", "FQN")
+
+
+def synthetic_model(packages, qualified=False, first_package=0, imports=()):
+    """
+    Returns the text of a synthetic model with the given number of packages.
+    References are fully qualified if `qualified` is set.
+    """
+
+    def ref(package, entity):
+        name = f"E{package}_{entity}"
+        return f"P{package}.{name}" if qualified else name
+
+    lines = [f'import "{import_uri}"' for import_uri in imports]
+    for p in range(first_package, first_package + packages):
+        lines.append(f"package P{p} {{")
+        for e in range(ENTITIES):
+            if e:
+                base = f" extends {ref(p, e - 1)}"
+            elif p:
+                base = f" extends {ref(p - 1, ENTITIES - 1)}"
+            else:
+                base = ""
+            attrs = []
+            for a in range(ATTRS):
+                target = (e * 7 + a) % ENTITIES
+                target_package = p - 1 if p and a == ATTRS - 1 else p
+                attrs.append(f"a{a}: {ref(target_package, target)}")
+            lines.append(f"  entity E{p}_{e}{base} {{ {' '.join(attrs)} }}")
+        lines.append("}")
+    return "\n".join(lines)
+
+
+def write_model_files(scale, qualified=False, imports=True):
+    """
+    Writes a synthetic model split in a file per package to a temporary
+    folder. Each file imports the previous one if `imports` is set. Returns
+    the folder and the name of the last file.
+    """
+    folder = tempfile.mkdtemp(prefix="textx-bench-")
+    atexit.register(shutil.rmtree, folder, True)
+    for p in range(PACKAGES * scale):
+        model_str = synthetic_model(
+            1,
+            qualified,
+            first_package=p,
+            imports=[f"p{p - 1}.ent"] if p and imports else [],
+        )
+        file_name = join(folder, f"p{p}.ent")
+        with open(file_name, "w") as f:
+            f.write(model_str)
+    return folder, file_name
+
+
+@benchmark("parse/synthetic")
+def parse_synthetic(scale):
+    mm = metamodel_from_str(parse_grammar)
+    model_str = synthetic_model(PACKAGES * scale)
+    return lambda: mm.model_from_str(model_str)
+
+
+@benchmark("parse/synthetic-memoization")
+def parse_synthetic_memoization(scale):
+    mm = metamodel_from_str(parse_grammar, memoization=True)
+    model_str = synthetic_model(PACKAGES * scale)
+    return lambda: mm.model_from_str(model_str)
+
+
+@benchmark("parse/synthetic-slots")
+def parse_synthetic_slots(scale):
+    mm = metamodel_from_str(parse_grammar, use_slots=True)
+    model_str = synthetic_model(PACKAGES * scale)
+    return lambda: mm.model_from_str(model_str)
+
+
+# A statement-level choice of many statements starting with different
+# keywords, parsed from generated models.
+STATEMENTS = 40
+
+statements_grammar = "\n".join(
+    [
+        "Program: statements*=Statement;",
+        "Statement: {};".format(" | ".join(f"Statement{i}" for i in range(STATEMENTS))),
+    ]
+    + [
+        f"Statement{i}: 'keyword{i}' name=ID '=' value=INT ';';"
+        for i in range(STATEMENTS)
+    ]
+)
+
+
+@benchmark("parse/statements")
+def parse_statements(scale):
+    mm = metamodel_from_str(statements_grammar)
+    generator = SyntheticModelGenerator(mm, size=GENERATED_SIZE * scale, seed=1)
+    model_str = generator.model_str()
+    return lambda: mm.model_from_str(model_str)
+
+
+def register_link(name, scope_provider, qualified, model_grammar=grammar):
+    @benchmark(f"link/{name}")
+    def link(scale):
+        mm = metamodel_from_str(model_grammar)
+        if scope_provider is not None:
+            mm.register_scope_providers({"*.*": scope_provider()})
+        model_str = synthetic_model(PACKAGES * scale, qualified)
+        return lambda: mm.model_from_str(model_str)
+
+
+register_link("plain-name", None, False)
+register_link("fqn", scoping_providers.FQN, True)
+register_link("fqn-indexed", lambda: scoping_providers.FQN(indexed=True), True)
+register_link("rrel", None, True, rrel_grammar)
+
+
+def register_link_import_uri(name, scope_provider, qualified):
+    @benchmark(f"link/{name}")
+    def link(scale):
+        mm = metamodel_from_str(grammar)
+        mm.register_scope_providers({"*.*": scope_provider()})
+        _, file_name = write_model_files(scale, qualified)
+        return lambda: mm.model_from_file(file_name)
+
+
+register_link_import_uri(
+    "plain-name-import-uri", scoping_providers.PlainNameImportURI, False
+)
+register_link_import_uri("fqn-import-uri", scoping_providers.FQNImportURI, True)
+
+
+def register_link_global_repo(name, scope_provider, qualified):
+    @benchmark(f"link/{name}")
+    def link(scale):
+        mm = metamodel_from_str(grammar)
+        folder, file_name = write_model_files(scale, qualified, imports=False)
+
+        def load():
+            # The global repo keeps the loaded models so a new one is used
+            # for each run.
+            mm.register_scope_providers({"*.*": scope_provider(join(folder, "*.ent"))})
+            return mm.model_from_file(file_name)
+
+        return load
+
+
+register_link_global_repo(
+    "plain-name-global-repo", scoping_providers.PlainNameGlobalRepo, False
+)
+register_link_global_repo("fqn-global-repo", scoping_providers.FQNGlobalRepo, True)
+
+
+class Entity:
+    def __init__(self, parent, name, base, attrs):
+        self.parent = parent
+        self.name = name
+        self.base = base
+        self.attrs = attrs
+
+
+@benchmark("processors/object-processors")
+def object_processors(scale):
+    mm = metamodel_from_str(grammar)
+    mm.register_obj_processors(
+        {
+            "Entity": lambda entity: None,
+            "Attr": lambda attr: None,
+            "ID": lambda value: value,
+        }
+    )
+    mm.register_model_processor(lambda model, metamodel: None)
+    model_str = synthetic_model(PACKAGES * scale)
+    return lambda: mm.model_from_str(model_str)
+
+
+@benchmark("processors/user-classes")
+def user_classes(scale):
+    mm = metamodel_from_str(grammar, classes=[Entity])
+    model_str = synthetic_model(PACKAGES * scale)
+    return lambda: mm.model_from_str(model_str)
+
+
+@benchmark("export/model-dot")
+def export_model_dot(scale):
+    model = metamodel_from_str(grammar).model_from_str(synthetic_model(PACKAGES * scale))
+    return lambda: model_export_to_file(io.StringIO(), model)
+
+
+# ---------------------------------------------------------------------------
+# Loading many model files
+# ---------------------------------------------------------------------------
+
+BATCH_FILES = 100
+BATCH_ENTITIES = 20
+WORKERS = os.cpu_count() or 1
+
+batch_grammar = """
+Model: entities+=Entity;
+Entity: 'entity' name=ID ('extends' base=[Entity])? '{' attrs*=Attr '}';
+Attr: name=ID ':' type=ID;
+"""
+
+
+def write_batch_files(scale):
+    """
+    Writes the small independent model files loaded by the batch benchmarks
+    to a temporary folder and returns their names.
+    """
+    folder = tempfile.mkdtemp(prefix="textx-bench-")
+    atexit.register(shutil.rmtree, folder, True)
+    file_names = []
+    for idx in range(BATCH_FILES * scale):
+        file_name = join(folder, f"model{idx}.ent")
+        with open(file_name, "w") as f:
+            for i in range(BATCH_ENTITIES):
+                base = f"extends E{i - 1}" if i else ""
+                f.write(f"entity E{i} {base} {{ a: int b: string c: float }}\n")
+        file_names.append(file_name)
+    return file_names
+
+
+def register_batch(name, load_files):
+    @benchmark(f"batch/{name}", unit="files")
+    def batch(scale):
+        mm = metamodel_from_str(batch_grammar)
+        file_names = write_batch_files(scale)
+
+        def load():
+            models = load_files(mm, file_names)
+            assert not any(isinstance(model, Exception) for model in models)
+
+        return load, len(file_names)
+
+
+register_batch(
+    "model-from-file-loop",
+    lambda mm, file_names: [mm.model_from_file(f) for f in file_names],
+)
+register_batch(
+    "models-from-files", lambda mm, file_names: mm.models_from_files(file_names)
+)
+register_batch(
+    "models-from-files-threads",
+    lambda mm, file_names: mm.models_from_files(
+        file_names, workers=WORKERS, executor="thread"
+    ),
+)
+register_batch(
+    "models-from-files-processes",
+    lambda mm, file_names: mm.models_from_files(
+        file_names, workers=WORKERS, executor="process"
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# Deeply nested models
+# ---------------------------------------------------------------------------
+
+# Model construction, object processors, `get_children` and export don't use
+# Python recursion, so the nesting depth is limited only by the (recursive)
+# parser.
+DEEP_DEPTH = 2000
+
+deep_grammar = """
+Model: node=Node;
+Node: '(' name=ID child=Node? ')';
+"""
+
+
+def deep_model_loader(scale):
+    mm = metamodel_from_str(deep_grammar)
+    mm.register_obj_processors({"Node": lambda node: None})
+    depth = DEEP_DEPTH * scale
+    model_str = " ".join(f"(n{i}" for i in range(depth)) + ")" * depth
+
+    def load():
+        # Raise the recursion limit only for the Arpeggio parser.
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, depth * 20))
+        try:
+            return mm.model_from_str(model_str)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    return load
+
+
+# Tracing the allocations slows down the deeply recursive parser too much.
+@benchmark("deep/construction", memory=False)
+def deep_construction(scale):
+    return deep_model_loader(scale)
+
+
+@benchmark("deep/get-children")
+def deep_get_children(scale):
+    model = deep_model_loader(scale)()
+    return lambda: get_children(lambda _: True, model)
+
+
+@benchmark("deep/export")
+def deep_export(scale):
+    model = deep_model_loader(scale)()
+    return lambda: model_export_to_file(io.StringIO(), model)
+
+
+# ---------------------------------------------------------------------------
+# Running and comparing
+# ---------------------------------------------------------------------------
+
+
+def measure(func, repeat, memory=True):
+    """
+    Returns the minimal and the median time of `repeat` calls of `func` and
+    the peak memory allocated during an additional call if `memory` is set.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if memory:
+        # Tracing slows down the call so it is not timed.
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "time": min(times),
+        "median_time": statistics.median(times),
+        "peak_memory": peak_memory,
+    }
+
+
+def change(value, baseline_value):
+    if value is None or not baseline_value:
+        return 0.0
+    return (value - baseline_value) / baseline_value
+
+
+def run(names, args, baseline):
+    regressions = []
+    width = max(len(name) for name in names)
+    header = f"{'Benchmark':<{width}} {'Time ms':>10} {'Median ms':>10} {'Peak KB':>10}"
+    if baseline:
+        header += f" {'Time':>8} {'Memory':>8}"
+    print(header)
+
+    results = {}
+    for name in names:
+        bench = BENCHMARKS[name]
+        func = bench.setup(args.scale)
+        if bench.unit:
+            func, units = func
+        result = results[name] = measure(func, args.repeat, bench.memory)
+        peak_memory = result["peak_memory"]
+        line = (
+            f"{name:<{width}} {result['time'] * 1000:>10.2f}"
+            f" {result['median_time'] * 1000:>10.2f}"
+            f" {'-' if peak_memory is None else f'{peak_memory / 1024:.0f}':>10}"
+        )
+        baseline_result = baseline.get(name)
+        if baseline_result:
+            time_change = change(result["time"], baseline_result["time"])
+            memory_change = change(result["peak_memory"], baseline_result["peak_memory"])
+            line += f" {time_change:>+8.1%}"
+            line += f" {'-':>8}" if peak_memory is None else f" {memory_change:>+8.1%}"
+            if max(time_change, memory_change) > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        if bench.unit:
+            result["throughput"] = units / result["time"]
+            line += f"  {result['throughput']:.1f} {bench.unit}/sec"
+        print(line, flush=True)
+
+    return results, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run textX benchmarks.")
+    parser.add_argument(
+        "-k",
+        dest="keywords",
+        action="append",
+        default=[],
+        help="Run only the benchmarks whose name contains the given text.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Size multiplier of the synthetic models (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="How many times each benchmark is timed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--large",
+        action="store_true",
+        help="Run also the benchmarks with large input files.",
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks.")
+    parser.add_argument("--save", metavar="FILE", help="Save the results as JSON.")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="Compare the results with a saved baseline."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown or memory increase reported as a regression "
+        "(default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    names = [
+        name
+        for name, bench in BENCHMARKS.items()
+        if (args.large or not bench.large)
+        and (not args.keywords or any(k in name for k in args.keywords))
+    ]
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        parser.error("no benchmarks selected")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            saved = json.load(f)
+        if saved["scale"] != args.scale:
+            parser.error(
+                f"the baseline is saved with --scale {saved['scale']}, "
+                f"got --scale {args.scale}"
+            )
+        baseline = saved["benchmarks"]
+
+    print(
+        f"textX {textx.__version__}, Python {platform.python_version()}, "
+        f"scale {args.scale}, repeat {args.repeat}\n"
+    )
+    results, regressions = run(names, args, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "textx": textx.__version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "scale": args.scale,
+                    "repeat": args.repeat,
+                    "benchmarks": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
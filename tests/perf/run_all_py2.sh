@@ -1,5 +0,0 @@
-#!/bin/bash
-./run_memory.sh py2
-./run_speed.sh py2
-./callgraph.sh py2
-
@@ -7,6 +7,7 @@ from textx.model import (
     get_metamodel,
     get_children,
     get_location,
+    release_model,
     textx_isinstance,
     textxerror_wrap,
 )
@@ -53,6 +54,7 @@ __all__ = [
     "get_metamodel",
     "get_children",
     "get_location",
+    "release_model",
     "textx_isinstance",
     "textxerror_wrap",
     "TextXError",
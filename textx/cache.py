@@ -0,0 +1,479 @@
+"""
+On-disk caches of compiled meta-models and of models.
+
+See the `cache_dir` parameter of `metamodel_from_str`/`metamodel_from_file`
+and the `model_cache_dir` meta-model parameter.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import types
+from functools import partial
+
+from textx.const import (
+    MULT_ONE,
+    MULT_ONEORMORE,
+    MULT_OPTIONAL,
+    MULT_ZEROORMORE,
+    RULE_ABSTRACT,
+    RULE_COMMON,
+    RULE_MATCH,
+)
+from textx.metamodel import TextXMetaClass, TextXMetaModel, _textx_class
+
+# Meta-model attributes which are not cached. They are taken from a new
+# meta-model created with the same parameters when the cached meta-model is
+# loaded.
+_RUNTIME_ATTRS = (
+    "debug",
+    "file",
+    "_current_indent",
+    "_default_obj_processors",
+    "_obj_processors",
+    "_parser_blueprint",
+    "_scope_provider_cache",
+    "_attr_defaults",
+    "_instance_classes",
+    "_fingerprint",
+    "model_cache",
+    "release_parser_state",
+    "stats",
+)
+
+# Rule types and multiplicities are compared by identity in some places so
+# the unpickled strings are replaced by these constants.
+_CONSTANTS = {
+    c: c
+    for c in (
+        RULE_COMMON,
+        RULE_ABSTRACT,
+        RULE_MATCH,
+        MULT_ONE,
+        MULT_OPTIONAL,
+        MULT_ZEROORMORE,
+        MULT_ONEORMORE,
+    )
+}
+
+# Types of meta-model parameters which can be a part of the cache key.
+_KEY_TYPES = (type(None), bool, int, float, str)
+
+# Meta-model parameters which don't change the meta-model.
+_NON_KEY_PARAMS = ("model_cache_dir", "release_parser_state", "stats")
+
+
+def _cache_key(lang_desc, kwargs):
+    """
+    Returns the cache key for the given language description and meta-model
+    parameters or None if the meta-model can't be cached.
+    """
+    from arpeggio import __version__ as arpeggio_version
+
+    from textx import __version__
+
+    if not isinstance(lang_desc, str):
+        return None
+    params = {
+        k: os.fspath(v) if isinstance(v, os.PathLike) else v
+        for k, v in kwargs.items()
+        if k not in _NON_KEY_PARAMS
+    }
+    if params.get("debug") or not all(isinstance(v, _KEY_TYPES) for v in params.values()):
+        # E.g. user classes, builtins, global repository instance.
+        return None
+
+    file_name = params.get("file_name")
+    key = hashlib.sha256()
+    for part in (
+        __version__,
+        arpeggio_version,
+        sys.implementation.cache_tag,
+        str(pickle.HIGHEST_PROTOCOL),
+        lang_desc,
+        repr(os.path.abspath(file_name) if file_name else None),
+        repr(sorted(params.items())),
+    ):
+        key.update(part.encode("utf-8"))
+        key.update(b"\0")
+    return key.hexdigest()
+
+
+def _file_hash(file_name):
+    with open(file_name, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _write_cache_file(cache_dir, key, dump):
+    """
+    Writes the cache entry with the given key using the given callable which
+    receives the open file. Returns False if the content can't be pickled.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so that other processes never read a
+    # partially written cache entry.
+    fd, tmp_file_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            dump(f)
+    except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+        os.remove(tmp_file_name)
+        return False
+    except BaseException:
+        os.remove(tmp_file_name)
+        raise
+    os.replace(tmp_file_name, os.path.join(cache_dir, f"{key}.pickle"))
+    return True
+
+
+def _imported_grammar_files(metamodel):
+    """
+    Returns the file names of the grammars imported by the meta-model.
+    """
+    main_namespace = metamodel._namespace_for_file_name(metamodel.file_name)
+    return [
+        "{}.tx".format(os.path.join(metamodel.root_path, *namespace.split(".")))
+        for namespace in metamodel.namespaces
+        if namespace not in ("__base__", main_namespace)
+    ]
+
+
+def _rebuild_class(metamodel, name, use_slots):
+    return _textx_class(metamodel, name, use_slots)
+
+
+def _set_class_state(cls, state):
+    for name, value in state.items():
+        setattr(cls, name, value)
+
+
+def _new_metamodel():
+    return TextXMetaModel.__new__(TextXMetaModel)
+
+
+def _set_metamodel_state(metamodel, state):
+    metamodel.__dict__.update(state)
+
+
+class _MetaModelPickler(pickle.Pickler):
+    """
+    Pickles a meta-model with its dynamically created classes. The meta-model
+    must be pickled first so that the classes can refer to it.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, TextXMetaClass):
+            state = {k: v for k, v in obj.__dict__.items() if k.startswith("_tx_")}
+            return (
+                _rebuild_class,
+                (obj._tx_metamodel, obj.__name__, obj._tx_metamodel.use_slots),
+                state,
+                None,
+                None,
+                _set_class_state,
+            )
+        if isinstance(obj, TextXMetaModel):
+            state = {k: v for k, v in obj.__dict__.items() if k not in _RUNTIME_ATTRS}
+            return (_new_metamodel, (), state, None, None, _set_metamodel_state)
+        return NotImplemented
+
+
+def load_metamodel(cache_dir, lang_desc, kwargs):
+    """
+    Returns the meta-model for the given language description and meta-model
+    parameters from the cache or None if it is not cached (or the cached
+    meta-model is outdated).
+    """
+    from textx.lang import new_model_parser
+
+    key = _cache_key(lang_desc, kwargs)
+    if key is None or kwargs.get("global_repository"):
+        return None
+    try:
+        with open(os.path.join(cache_dir, f"{key}.pickle"), "rb") as f:
+            grammar_files = pickle.load(f)
+            for file_name, file_hash in grammar_files:
+                if _file_hash(file_name) != file_hash:
+                    return None
+            metamodel, root_rule, comments_model = pickle.load(f)
+    except Exception:
+        # Not cached, changed imported grammar or an unreadable cache entry.
+        return None
+
+    for namespace in metamodel.namespaces.values():
+        for cls in namespace.values():
+            cls._tx_type = _CONSTANTS[cls._tx_type]
+            for attr in cls._tx_attrs.values():
+                attr.mult = _CONSTANTS[attr.mult]
+
+    new_metamodel = TextXMetaModel(**kwargs)
+    for name, value in new_metamodel.__dict__.items():
+        if name in _RUNTIME_ATTRS or name not in metamodel.__dict__:
+            setattr(metamodel, name, value)
+    metamodel._parser_blueprint = new_model_parser(metamodel, root_rule, comments_model)
+    metamodel._cache_key = key
+    return metamodel
+
+
+def save_metamodel(cache_dir, metamodel, lang_desc, kwargs):
+    """
+    Stores the meta-model constructed from the given language description and
+    meta-model parameters in the cache.
+    """
+    key = _cache_key(lang_desc, kwargs)
+    if key is None or metamodel.referenced_languages or kwargs.get("global_repository"):
+        # Meta-models of referenced languages are not a part of this
+        # meta-model. The global repository is, but the models loaded into it
+        # must not be cached.
+        return
+
+    grammar_files = [
+        (file_name, _file_hash(file_name))
+        for file_name in _imported_grammar_files(metamodel)
+    ]
+    parser = metamodel._parser_blueprint
+
+    def dump(f):
+        pickle.dump(grammar_files, f)
+        _MetaModelPickler(f, pickle.HIGHEST_PROTOCOL).dump(
+            (metamodel, parser.parser_model.nodes[0], parser.comments_model)
+        )
+
+    # If something in the meta-model can't be pickled (e.g. a scope provider
+    # given in the grammar) the meta-model is not cached.
+    _write_cache_file(cache_dir, key, dump)
+
+
+def metamodel_key(metamodel, lang_desc, kwargs):
+    """
+    Returns the cache key of the meta-model constructed from the given
+    language description and meta-model parameters or None if the meta-model
+    can't be identified (e.g. if it has user classes or references other
+    languages).
+    """
+    if metamodel.referenced_languages:
+        return None
+    return _cache_key(lang_desc, kwargs)
+
+
+def metamodel_fingerprint(metamodel):
+    """
+    Returns a string identifying the meta-model, including the imported
+    grammars, or None if the meta-model can't be identified (see
+    metamodel_key). The imported grammars are read only the first time.
+    """
+    if metamodel._fingerprint is None and metamodel._cache_key is not None:
+        fingerprint = hashlib.sha256(metamodel._cache_key.encode("utf-8"))
+        for file_name in _imported_grammar_files(metamodel):
+            fingerprint.update(_file_hash(file_name).encode("utf-8"))
+        metamodel._fingerprint = fingerprint.hexdigest()
+    return metamodel._fingerprint
+
+
+def _model_references(metamodel):
+    """
+    Yields the meta-model objects which can be referenced from a model before
+    reference resolution together with the keys used to store them in the
+    model cache.
+    """
+    yield ("metamodel",), metamodel
+    for namespace_name, namespace in metamodel.namespaces.items():
+        for cls in namespace.values():
+            cls_key = (namespace_name, cls.__name__)
+            yield ("class", *cls_key), cls
+            for attr in cls._tx_attrs.values():
+                yield ("attr", *cls_key, attr.name), attr
+                scope_provider = getattr(attr, "scope_provider", None)
+                if scope_provider is not None:
+                    yield ("scope_provider", *cls_key, attr.name), scope_provider
+
+
+class _ModelPickler(pickle.Pickler):
+    """
+    Pickles a model object graph. Meta-model objects are stored by reference
+    (see _model_references) and are taken from the meta-model which loads the
+    model.
+    """
+
+    def __init__(self, file, metamodel):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.references = {id(obj): key for key, obj in _model_references(metamodel)}
+        for cls, instance_class in metamodel._instance_classes.items():
+            if instance_class is not cls:
+                self.references[id(instance_class)] = (
+                    "instance_class",
+                    *self.references[id(cls)][1:],
+                )
+
+    def persistent_id(self, obj):
+        key = self.references.get(id(obj))
+        if key is None and isinstance(obj, (TextXMetaClass, TextXMetaModel)):
+            raise pickle.PicklingError(f"{obj} is not a part of the meta-model.")
+        return key
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    def __init__(self, file, metamodel):
+        super().__init__(file)
+        self.metamodel = metamodel
+        self.references = {key: obj for key, obj in _model_references(metamodel)}
+
+    def persistent_load(self, pid):
+        if pid[0] == "instance_class":
+            return self.metamodel._instance_class(self.references[("class", *pid[1:])])
+        return self.references[pid]
+
+
+def dump_constructed_model(parser, model, file):
+    """
+    Pickles the model constructed by the given model parser, before its
+    references are resolved, to the given file.
+    """
+    pickler = _ModelPickler(file, parser.metamodel)
+    instances = []
+    for cls_id, objs in parser._instances.items():
+        cls_key = pickler.references.get(cls_id)
+        if cls_key is None:
+            raise pickle.PicklingError("Unknown class of named objects.")
+        instances.append((cls_key, objs))
+    pickler.dump((model, parser._crossrefs, instances))
+
+
+def load_constructed_model(parser, file, model_str, file_name):
+    """
+    Unpickles the model stored by dump_constructed_model from the given file.
+    The state of the given model parser is set up as if the model was parsed
+    from the given content, so the model references can be resolved.
+    """
+    unpickler = _ModelUnpickler(file, parser.metamodel)
+    model, crossrefs, instances = unpickler.load()
+    instances = {id(unpickler.references[cls_key]): objs for cls_key, objs in instances}
+    parser.input = model_str
+    parser.file_name = file_name
+    parser.position = 0
+    parser.line_ends = []
+    parser._crossrefs = crossrefs
+    parser._instances = instances
+    return model
+
+
+def _code_fingerprint(code):
+    """
+    Returns a hash of the bytecode and the constants of the given code object
+    and of the code objects nested in it (e.g. local functions).
+    """
+    fingerprint = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            const = _code_fingerprint(const)
+        elif isinstance(const, frozenset):
+            # The order of the items depends on the string hash seed.
+            const = sorted(repr(item) for item in const)
+        fingerprint.update(repr(const).encode("utf-8", "surrogatepass"))
+        fingerprint.update(b"\0")
+    return fingerprint.hexdigest()
+
+
+def _processors_fingerprint(metamodel):
+    """
+    Returns a string identifying the object processors of match rules, which
+    are called during model construction, or None if a processor can't be
+    identified by its name (e.g. a lambda). Processors are identified by
+    their module, qualified name and, for functions, their code.
+    """
+    match_rules = {
+        name
+        for namespace_name, namespace in metamodel.namespaces.items()
+        for cls in namespace.values()
+        if cls._tx_type is RULE_MATCH
+        for name in (cls.__name__, f"{namespace_name}.{cls.__name__}")
+    }
+    processors = []
+    for name, processor in sorted(metamodel._obj_processors.items()):
+        if name not in match_rules or (
+            processor is metamodel._default_obj_processors.get(name)
+        ):
+            continue
+        qualname = getattr(processor, "__qualname__", "<unknown>")
+        if "<" in qualname:
+            # A lambda, a local function or an object without a name
+            return None
+        code = getattr(processor, "__code__", None)
+        code = _code_fingerprint(code) if code is not None else ""
+        processors.append(f"{name}={processor.__module__}.{qualname}:{code}")
+    return repr(processors)
+
+
+class ModelCache:
+    """
+    On-disk cache of models constructed from files. See the `model_cache_dir`
+    meta-model parameter.
+
+    The model is stored after it is constructed from the parse tree and before
+    its references are resolved. The cache key is the model file content and
+    the meta-model fingerprint, so a model is parsed again only if the file,
+    the grammar, the meta-model parameters or the match rule object processors
+    are changed.
+
+    Attributes:
+        cache_dir(str): The directory where models are cached.
+        hits(int): The number of models loaded from the cache.
+        misses(int): The number of models which could be cached but were not
+            found in the cache.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.fspath(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"<ModelCache {self.cache_dir}: {self.hits} hits, {self.misses} misses>"
+
+    def _key(self, metamodel, model_str):
+        """
+        Returns the cache key for the given model content or None if models
+        of the given meta-model can't be cached.
+        """
+        fingerprint = metamodel_fingerprint(metamodel)
+        if fingerprint is None or metamodel.textx_tools_support:
+            return None
+        processors = _processors_fingerprint(metamodel)
+        if processors is None:
+            return None
+        key = hashlib.sha256()
+        for part in (fingerprint, processors, model_str):
+            key.update(part.encode("utf-8", "surrogatepass"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def load(self, parser, model_str, file_name):
+        """
+        Returns the model for the given content from the cache or None if it
+        is not cached (see load_constructed_model).
+        """
+        key = self._key(parser.metamodel, model_str)
+        if key is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.pickle"), "rb") as f:
+                model = load_constructed_model(parser, f, model_str, file_name)
+        except Exception:
+            # Not cached or an unreadable cache entry.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return model
+
+    def save(self, parser, model):
+        """
+        Stores the model constructed by the given model parser in the cache.
+        Models which can't be pickled are not cached.
+        """
+        key = self._key(parser.metamodel, parser.input)
+        if key is not None:
+            _write_cache_file(
+                self.cache_dir, key, partial(dump_constructed_model, parser, model)
+            )
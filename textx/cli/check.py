@@ -17,6 +17,7 @@ from textx import (
     metamodel_for_language,
     metamodel_from_file,
 )
+from textx.cache import ModelCache
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +34,20 @@ def check(textx):
         is_flag=True,
         help='Case-insensitive model parsing. Used only if "grammar" is provided.',
     )
+    @click.option(
+        "--model-cache",
+        type=click.Path(file_okay=False),
+        help="A directory where parsed models are cached between runs.",
+    )
     @click.pass_context
-    def check(ctx, model_files, language=None, grammar=None, ignore_case=False):
+    def check(
+        ctx,
+        model_files,
+        language=None,
+        grammar=None,
+        ignore_case=False,
+        model_cache=None,
+    ):
         """
         Check/validate model given its file path. If grammar is given use it to
         construct the meta-model. If language is given use it to retrieve the
@@ -62,10 +75,17 @@ def check(textx):
         # Or to check multiple model files and deduce meta-model by extension
         textx check *
 
+        \b
+        # Reuse models parsed in previous runs if the files are not changed:
+        textx check * --model-cache .textx_cache
+
         """  # noqa
 
         debug = ctx.obj["debug"]
 
+        if model_cache:
+            model_cache = ModelCache(model_cache)
+
         try:
             per_file_metamodel = False
             if grammar:
@@ -81,9 +101,19 @@ def check(textx):
                 if per_file_metamodel:
                     metamodel = metamodel_for_file(model_file)
 
+                if model_cache:
+                    metamodel.model_cache = model_cache
+
                 metamodel.model_from_file(model_file, debug=debug)
                 logger.info("%s: OK.", os.path.abspath(model_file))
 
+            if model_cache:
+                logger.info(
+                    "Model cache: %d hits, %d misses.",
+                    model_cache.hits,
+                    model_cache.misses,
+                )
+
         except TextXRegistrationError as e:
             logging.error("ERROR: %s", str(e))
             sys.exit(1)
@@ -0,0 +1,118 @@
+import json
+import logging
+import sys
+
+try:
+    import click
+except ImportError as e:
+    raise Exception(
+        "textX must be installed with CLI dependencies to use "
+        "textx command.\npip install textX[cli]"
+    ) from e
+
+from textx import (
+    TextXError,
+    TextXRegistrationError,
+    metamodel_for_file,
+    metamodel_for_language,
+    metamodel_from_file,
+)
+from textx.profiler import ParseProfiler
+
+
+def profile(textx):
+    @textx.command()
+    @click.argument("model_files", type=click.Path(), required=True, nargs=-1)
+    @click.option("--language", help="A name of the language model conforms to.")
+    @click.option("--grammar", help="A file name of the grammar used as a meta-model.")
+    @click.option(
+        "--ignore-case/",
+        "-i/",
+        default=False,
+        is_flag=True,
+        help='Case-insensitive model parsing. Used only if "grammar" is provided.',
+    )
+    @click.option(
+        "--memoization/",
+        default=False,
+        is_flag=True,
+        help='Use memoization. Used only if "grammar" is provided.',
+    )
+    @click.option(
+        "--top",
+        default=20,
+        show_default=True,
+        help="The number of the hottest rules to show (0 for all).",
+    )
+    @click.option("--json", "as_json", default=False, is_flag=True, help="Output JSON.")
+    @click.pass_context
+    def profile(
+        ctx,
+        model_files,
+        language=None,
+        grammar=None,
+        ignore_case=False,
+        memoization=False,
+        top=20,
+        as_json=False,
+    ):
+        """
+        Parse models and show the grammar rules where the parsing time is
+        spent, with the number of attempts, matches, fails (backtracking) and
+        memoization hits of each rule. Rules are sorted by the time spent in
+        the rule itself, excluding the nested rules.
+
+        Examples:
+
+        \b
+        # Show the 20 hottest rules of the entity grammar:
+        textx profile person.ent --grammar entity.tx
+
+        \b
+        # Show all rules as JSON:
+        textx profile person.ent --language entity --top 0 --json
+
+        """  # noqa
+
+        try:
+            per_file_metamodel = False
+            if grammar:
+                metamodel = metamodel_from_file(
+                    grammar, ignore_case=ignore_case, memoization=memoization
+                )
+            elif language:
+                metamodel = metamodel_for_language(language)
+            else:
+                per_file_metamodel = True
+
+            profilers = {}
+            for model_file in model_files:
+                if per_file_metamodel:
+                    metamodel = metamodel_for_file(model_file)
+                # Models are parsed even if a model cache is configured.
+                metamodel.model_cache = None
+
+                profiler = profilers.get(id(metamodel))
+                if profiler is None:
+                    profiler = profilers[id(metamodel)] = ParseProfiler(metamodel)
+                with profiler:
+                    metamodel.model_from_file(model_file)
+
+        except TextXRegistrationError as e:
+            logging.error("ERROR: %s", str(e))
+            sys.exit(1)
+
+        except TextXError as e:
+            logging.error("ERROR: %s", str(e))
+            sys.exit(1)
+
+        count = top or None
+        if as_json:
+            result = [
+                {"grammar": p.metamodel.file_name, "rules": p.as_dict(count)}
+                for p in profilers.values()
+            ]
+            click.echo(json.dumps(result, indent=2))
+        else:
+            for p in profilers.values():
+                click.echo(f"Grammar: {p.metamodel.file_name}\n{p.report(count)}\n")
@@ -429,6 +429,21 @@ def model_export_to_file(f, model=None, repo=None):
     f.write(HEADER)
 
     def _export(obj):
+        # Objects are exported depth-first using an explicit stack of
+        # `_export_obj` generators instead of Python recursion.
+        stack = [_export_obj(obj)]
+        while stack:
+            nested = next(stack[-1], None)
+            if nested is None:
+                stack.pop()
+            else:
+                stack.append(nested)
+
+    def _export_obj(obj):
+        """
+        Exports a single object. This is a generator yielding generators for
+        the export of referenced objects.
+        """
         if obj is None or id(obj) in processed_set or type(obj) in PRIMITIVE_PYTHON_TYPES:
             return
 
@@ -464,7 +479,7 @@ def model_export_to_file(f, model=None, repo=None):
                                         f"{id(obj)} -> {id(list_obj)} "
                                         f'[label="{attr_name}:{idx}" {endmark}]\n'
                                     )
-                                    _export(list_obj)
+                                    yield _export_obj(list_obj)
                 else:
                     # Plain attributes
                     if isinstance(attr_value, str) and attr_name != "name":
@@ -485,7 +500,7 @@ def model_export_to_file(f, model=None, repo=None):
                                 f"{id(obj)} -> {id(attr_value)} "
                                 f'[label="{attr_name}" {endmark}]\n'
                             )
-                            _export(attr_value)
+                            yield _export_obj(attr_value)
 
         name = f"{name}:{obj_cls.__name__}"
 
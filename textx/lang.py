@@ -46,6 +46,7 @@ from .const import (
     mult_lt,
 )
 from .exceptions import TextXError, TextXSemanticError, TextXSyntaxError
+from .lookahead import LookaheadChoice, compile_lookahead
 
 # Interpreting backslash sequences.
 # See https://stackoverflow.com/a/24519338/2024430
@@ -256,10 +257,11 @@ STRICTFLOAT = _(
     root=True,
 )
 STRING = _(r'("(\\"|[^"])*")|(\'(\\\'|[^\'])*\')', "STRING", root=True)
-NUMBER = OrderedChoice(nodes=[STRICTFLOAT, INT], rule_name="NUMBER", root=True)
-BASETYPE = OrderedChoice(
+NUMBER = LookaheadChoice(nodes=[STRICTFLOAT, INT], rule_name="NUMBER", root=True)
+BASETYPE = LookaheadChoice(
     nodes=[NUMBER, FLOAT, BOOL, ID, STRING], rule_name="BASETYPE", root=True
 )
+compile_lookahead([BASETYPE])
 
 # A dummy rule for generic type. This rule should never be used for parsing.
 OBJECT = _(r"", rule_name="OBJECT", root=True)
@@ -361,23 +363,8 @@ class TextXVisitor(RRELVisitor):
             comments_model = None
 
         root_rule = children[0]
-        from .model import get_model_parser
-
-        model_parser = get_model_parser(
-            root_rule,
-            comments_model,
-            ignore_case=self.metamodel.ignore_case,
-            skipws=self.metamodel.skipws,
-            ws=self.metamodel.ws,
-            autokwd=self.metamodel.autokwd,
-            memoization=self.metamodel.memoization,
-            debug=self.metamodel.debug,
-            file=self.metamodel.file,
-        )
-
-        model_parser.metamodel = self.metamodel
 
-        return model_parser
+        return new_model_parser(self.metamodel, root_rule, comments_model)
 
     def second_textx_model(self, model_parser):
         """Cross reference resolving for parser model."""
@@ -388,6 +375,11 @@ class TextXVisitor(RRELVisitor):
         self._resolve_rule_refs(self.grammar_parser, model_parser)
         self._determine_rule_types(model_parser.metamodel)
         self._resolve_cls_refs(self.grammar_parser, model_parser)
+        self._compile_construction_plans(model_parser.metamodel)
+        compile_lookahead(
+            [model_parser.parser_model]
+            + [cls._tx_peg_rule for cls in model_parser.metamodel]
+        )
 
         return model_parser
 
@@ -547,6 +539,15 @@ class TextXVisitor(RRELVisitor):
             for cls in metamodel:
                 _determine_rule_type(cls)
 
+    def _compile_construction_plans(self, metamodel):
+        """
+        Precomputes per-class data used for each object during model
+        construction once the meta-classes are resolved.
+        """
+        for cls in metamodel:
+            if cls._tx_type == RULE_COMMON:
+                metamodel._compile_attr_defaults(cls)
+
     def _resolve_cls_refs(self, grammar_parser, model_parser):
         resolved_classes = {}
 
@@ -795,7 +796,7 @@ class TextXVisitor(RRELVisitor):
     def visit_textx_rule_body(self, node, children):
         if len(children) == 1:
             return children[0]
-        return OrderedChoice(nodes=children[:])
+        return LookaheadChoice(nodes=children[:])
 
     def visit_sequence(self, node, children):
         if len(children) == 1:
@@ -807,7 +808,7 @@ class TextXVisitor(RRELVisitor):
         # this ordered choice is unnecessary
         if len(children) == 1:
             return children[0]
-        return OrderedChoice(nodes=children[:])
+        return LookaheadChoice(nodes=children[:])
 
     def visit_expression(self, node, children):
         if len(children) == 1:
@@ -1018,6 +1019,8 @@ class TextXVisitor(RRELVisitor):
             )
 
         assignment_rule._attr_name = attr_name
+        # "plain", "optional", "oneormore" or "zeroormore"
+        assignment_rule._tx_asgn_op = assignment_rule.rule_name[len("__asgn_") :]
         assignment_rule._exp_str = attr_name  # For nice error reporting
         return assignment_rule
 
@@ -1085,6 +1088,29 @@ class TextXVisitor(RRELVisitor):
         return children[0]
 
 
+def new_model_parser(metamodel, root_rule, comments_model):
+    """
+    Creates the parser for models of the given meta-model.
+    """
+    from .model import get_model_parser
+
+    model_parser = get_model_parser(
+        root_rule,
+        comments_model,
+        ignore_case=metamodel.ignore_case,
+        skipws=metamodel.skipws,
+        ws=metamodel.ws,
+        autokwd=metamodel.autokwd,
+        memoization=metamodel.memoization,
+        debug=metamodel.debug,
+        file=metamodel.file,
+    )
+
+    model_parser.metamodel = metamodel
+
+    return model_parser
+
+
 # parser object cache. To speed up parser initialization (e.g. during imports)
 textX_parsers: Dict[bool, Parser] = {}
 
@@ -0,0 +1,459 @@
+"""
+Lookahead dispatch for ordered choices.
+
+An ordered choice tries its alternatives one after the other. For a choice
+with many alternatives, e.g. statements starting with different keywords,
+most of the parsing time is spent in the alternatives which fail on the first
+token. The FIRST set of each alternative, i.e. the characters (and the literal
+prefix, e.g. a keyword) a match of the alternative can start with, is computed
+when the grammar is loaded and `LookaheadChoice` tries only the alternatives
+which can start at the current input position, still in the order of the
+grammar. When FIRST sets of the alternatives overlap or can't be computed, all
+such alternatives are tried so the PEG ordered choice semantics is preserved.
+"""
+
+import os
+import re
+
+from arpeggio import (
+    EndOfFile,
+    Match,
+    NoMatch,
+    OneOrMore,
+    Optional,
+    OrderedChoice,
+    RegExMatch,
+    Repetition,
+    Sequence,
+    StrMatch,
+    SyntaxPredicate,
+    UnorderedGroup,
+    ZeroOrMore,
+)
+
+try:
+    from re import _compiler as sre_compile  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_compile
+    import sre_parse
+
+_ASCII = [chr(c) for c in range(128)]
+
+_REPEATS = tuple(
+    getattr(sre_parse, op)
+    for op in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, op)
+)
+_GROUPS = tuple(
+    getattr(sre_parse, op)
+    for op in ("SUBPATTERN", "ATOMIC_GROUP")
+    if hasattr(sre_parse, op)
+)
+
+
+class FirstSet:
+    """
+    Characters a match of a parsing expression can start with.
+
+    Attributes:
+        chars (frozenset): ASCII characters a match can start with.
+        other (bool): If a match can start with a non-ASCII character.
+        empty (bool): If the expression can match without consuming input (or
+            the FIRST set is not known), in which case the expression can be
+            followed by any character.
+        prefix (str): A string each match starts with, e.g. a keyword.
+    """
+
+    __slots__ = ("chars", "other", "empty", "prefix")
+
+    def __init__(self, chars=frozenset(), other=False, empty=False, prefix=""):
+        self.chars = frozenset(chars)
+        self.other = other
+        self.empty = empty
+        self.prefix = "" if empty else prefix
+
+    def may_start(self, char):
+        """
+        Returns if a match can start with the given character.
+        """
+        return self.empty or char in self.chars or (self.other and char > "\x7f")
+
+
+_UNKNOWN = FirstSet(_ASCII, other=True, empty=True)
+_EMPTY = FirstSet(empty=True)
+
+
+def _union(firsts, empty):
+    """
+    Returns the `FirstSet` of a match starting as any of the given FIRST sets.
+    """
+    return FirstSet(
+        frozenset().union(*(first.chars for first in firsts)),
+        any(first.other for first in firsts),
+        empty,
+        os.path.commonprefix([first.prefix for first in firsts]),
+    )
+
+
+class LookaheadChoice(OrderedChoice):
+    """
+    An ordered choice which tries only the alternatives that can start at the
+    next character of the input. Dispatch tables are computed by
+    `compile_lookahead`; without them all alternatives are tried.
+
+    If none of the candidate alternatives matches, all the alternatives are
+    tried in order so that the same syntax error is reported as for the
+    `OrderedChoice`.
+    """
+
+    # Alternatives to try for each ASCII character, for other characters and
+    # at the end of input. If an alternative list is `nodes` all alternatives
+    # are tried.
+    _dispatch = None
+    _dispatch_other = None
+    _dispatch_end = None
+    # Prefixes of the alternatives for the characters whose alternatives are
+    # further filtered by the prefix, e.g. keywords starting with the same
+    # character.
+    _prefixes = None
+    _in_predicate = False
+
+    def _parse(self, parser):
+        if self._dispatch is None:
+            return super()._parse(parser)
+
+        if self.ws is not None:
+            old_ws = parser.ws
+            parser.ws = self.ws
+
+        if self.skipws is not None:
+            old_skipws = parser.skipws
+            parser.skipws = self.skipws
+
+        try:
+            return self._parse_alternatives(parser)
+        finally:
+            if self.ws is not None:
+                parser.ws = old_ws
+            if self.skipws is not None:
+                parser.skipws = old_skipws
+
+    def _parse_alternatives(self, parser):
+        c_pos = parser.position
+
+        nodes = self._candidates(parser)
+        if nodes is not self.nodes:
+            # The errors of the candidates are forgotten if they don't match
+            # so that the ordered choice below reports them in the order of
+            # the alternatives. Only the error state is kept, not the error,
+            # as the frames in the tracebacks of the errors would keep
+            # previous errors alive.
+            nm_state = (
+                (parser.nm.rules, len(parser.nm.rules), parser.nm.position)
+                if parser.nm is not None
+                else None
+            )
+            result = self._parse_candidates(parser, nodes, c_pos)
+            if result is not None:
+                return result
+
+            # Failed matches are cached with memoization and not reported
+            # again so the errors are kept in that case.
+            if not parser.memoization:
+                if nm_state is None:
+                    parser.nm = None
+                else:
+                    rules, count, position = nm_state
+                    del rules[count:]
+                    if parser.nm is None or parser.nm.rules is not rules:
+                        parser.nm = NoMatch(rules, position, parser)
+
+        for e in self.nodes:
+            try:
+                result = e.parse(parser)
+                if result is not None:
+                    return [result]
+            except NoMatch:
+                parser.position = c_pos  # Backtracking
+
+        parser._nm_raise(self, c_pos, parser)
+
+    @staticmethod
+    def _parse_candidates(parser, nodes, c_pos):
+        for e in nodes:
+            try:
+                result = e.parse(parser)
+            except NoMatch:
+                parser.position = c_pos  # Backtracking
+                continue
+            if result is not None:
+                return [result]
+            if parser.position != c_pos:
+                # Matched without a result. The following alternatives must
+                # start from the new position so leave it to the ordered
+                # choice.
+                parser.position = c_pos
+                break
+        return None
+
+    def _candidates(self, parser):
+        """
+        Returns the alternatives which can match at the next character,
+        skipping whitespaces and comments the same way as `Match.parse`.
+        """
+        position = parser.position
+        text = parser.input
+        if parser.skipws and not parser.in_lex_rule:
+            ws = parser.ws
+            length = len(text)
+            while position < length and text[position] in ws:
+                position += 1
+
+        comment_start = parser._comment_start
+        if parser.skipws and position in parser.comment_positions:
+            position = parser.comment_positions[position]
+            comment_start = None
+
+        if position >= len(text):
+            return self._dispatch_end
+
+        char = text[position]
+        if (
+            comment_start is not None
+            and not parser.in_parse_comments
+            and not parser.in_lex_rule
+            and comment_start.may_start(char)
+        ):
+            return self.nodes
+
+        nodes = self._dispatch.get(char, self._dispatch_other)
+        prefixes = self._prefixes.get(char)
+        if prefixes is not None:
+            nodes = [
+                node
+                for node, prefix in zip(nodes, prefixes)
+                if text.startswith(prefix, position)
+            ] or self.nodes
+        return nodes
+
+
+def compile_lookahead(rules):
+    """
+    Computes the dispatch tables of all `LookaheadChoice` expressions
+    reachable from the given rules. Must be called after the rule references
+    are resolved.
+
+    Choices used inside syntax predicates always try all alternatives as the
+    errors of the failed alternatives may be reported after the predicate
+    has restored the position.
+    """
+    firsts = {}
+    visited = set()
+    to_visit = [(rule, False) for rule in rules]
+    while to_visit:
+        node, in_predicate = to_visit.pop()
+        if (id(node), in_predicate) in visited:
+            continue
+        visited.add((id(node), in_predicate))
+        in_predicate = in_predicate or isinstance(node, SyntaxPredicate)
+        if isinstance(node, LookaheadChoice):
+            if in_predicate:
+                node._in_predicate = True
+                node._dispatch = None
+            elif not node._in_predicate:
+                _compile_choice(node, firsts)
+        to_visit.extend((child, in_predicate) for child in node.nodes)
+        if isinstance(node, Repetition) and node.sep is not None:
+            to_visit.append((node.sep, in_predicate))
+
+
+def _compile_choice(choice, firsts):
+    alternatives = [(node, first_set(node, firsts)) for node in choice.nodes]
+    buckets = {}
+
+    def bucket(may_start):
+        nodes = tuple(node for node, first in alternatives if may_start(first))
+        if not nodes or len(nodes) == len(choice.nodes):
+            # No alternative can match or no alternative is skipped.
+            return choice.nodes
+        return buckets.setdefault(nodes, nodes)
+
+    dispatch = {
+        char: bucket(lambda first, char=char: first.may_start(char)) for char in _ASCII
+    }
+    dispatch_other = bucket(lambda first: first.empty or first.other)
+
+    prefixes = {}
+    for char in _ASCII:
+        char_prefixes = tuple(
+            first.prefix for _, first in alternatives if first.may_start(char)
+        )
+        if len(char_prefixes) > 1 and any(len(prefix) > 1 for prefix in char_prefixes):
+            dispatch[char] = tuple(
+                node for node, first in alternatives if first.may_start(char)
+            )
+            prefixes[char] = char_prefixes
+
+    if (
+        not prefixes
+        and dispatch_other is choice.nodes
+        and all(nodes is choice.nodes for nodes in dispatch.values())
+    ):
+        choice._dispatch = None
+        return
+
+    choice._dispatch = dispatch
+    choice._dispatch_other = dispatch_other
+    choice._dispatch_end = bucket(lambda first: first.empty)
+    choice._prefixes = prefixes
+
+
+def first_set(node, firsts=None):
+    """
+    Returns the `FirstSet` of the given parsing expression.
+
+    Args:
+        node (ParsingExpression): A parsing expression with resolved rule
+            references.
+        firsts (dict): A cache of the computed FIRST sets keyed by the
+            expression ids.
+    """
+    if firsts is None:
+        firsts = {}
+    key = id(node)
+    if key in firsts:
+        # None for the expressions being computed, i.e. left recursion.
+        return firsts[key] or _UNKNOWN
+    firsts[key] = None
+    first = firsts[key] = _first_set(node, firsts)
+    return first
+
+
+def _first_set(node, firsts):
+    if (
+        getattr(node, "ws", None) is not None
+        or getattr(node, "skipws", None) is not None
+        or getattr(node, "eolterm", False)
+    ):
+        # Whitespaces are skipped differently than in the choice.
+        return _UNKNOWN
+
+    if isinstance(node, StrMatch):
+        return _str_first_set(node)
+    if isinstance(node, RegExMatch):
+        return _regex_first_set(node)
+    if isinstance(node, Match):
+        return _UNKNOWN
+    if isinstance(node, (SyntaxPredicate, EndOfFile)):
+        return _EMPTY
+
+    if isinstance(node, OrderedChoice):
+        alternatives = [first_set(alternative, firsts) for alternative in node.nodes]
+        return _union(alternatives, any(first.empty for first in alternatives))
+    if isinstance(node, Sequence):
+        elements = []
+        for element in node.nodes:
+            elements.append(first_set(element, firsts))
+            if not elements[-1].empty:
+                if len(elements) == 1:
+                    return elements[0]
+                return _union(elements, False)
+        return _EMPTY if not elements else _union(elements, True)
+
+    if isinstance(node, (Optional, ZeroOrMore)):
+        return _union([first_set(node.nodes[0], firsts)], True)
+    if isinstance(node, OneOrMore):
+        return first_set(node.nodes[0], firsts)
+    if isinstance(node, UnorderedGroup):
+        elements = [first_set(element, firsts) for element in node.nodes]
+        return _union(elements, all(first.empty for first in elements))
+
+    return _UNKNOWN
+
+
+def _str_first_set(node):
+    if not node.to_match:
+        return _EMPTY
+    if node.ignore_case:
+        start = node.to_match.lower()[0]
+        return FirstSet([c for c in _ASCII if c.lower() == start], other=True)
+    start = node.to_match[0]
+    if start > "\x7f":
+        return FirstSet(other=True, prefix=node.to_match)
+    return FirstSet(start, prefix=node.to_match)
+
+
+def _regex_first_set(node):
+    regex = getattr(node, "regex", None)
+    if regex is None:
+        return _UNKNOWN
+    try:
+        pattern = sre_parse.parse(regex.pattern, regex.flags)
+        items = []
+        empty = _regex_first_items(pattern, items)
+        first = _union(
+            [_regex_item_first_set(pattern, item, regex.flags) for item in items],
+            empty,
+        )
+    except Exception:
+        return _UNKNOWN
+
+    if not empty and not regex.flags & re.IGNORECASE:
+        # Leading literals, e.g. keywords matched on word boundaries.
+        prefix = []
+        for op, av in pattern:
+            if op is not sre_parse.LITERAL:
+                break
+            prefix.append(chr(av))
+        first.prefix = "".join(prefix)
+    return first
+
+
+def _regex_first_items(pattern, items):
+    """
+    Collects the single character items a match of the given parsed regex can
+    start with and returns if it can match the empty string.
+    """
+    for op, av in pattern:
+        if op in (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.ANY, sre_parse.IN):
+            items.append((op, av))
+            return False
+        elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # Zero-width
+            continue
+        elif op in _GROUPS:
+            if not _regex_first_items(av[-1], items):
+                return False
+        elif op in _REPEATS:
+            low, _, item = av
+            if not _regex_first_items(item, items) and low > 0:
+                return False
+        elif op is sre_parse.BRANCH:
+            empty = False
+            for branch in av[1]:
+                empty = _regex_first_items(branch, items) or empty
+            if not empty:
+                return False
+        else:
+            raise ValueError(f'Unsupported regex operation "{op}".')
+    return True
+
+
+def _regex_item_first_set(pattern, item, flags):
+    op, av = item
+    item_regex = sre_compile.compile(sre_parse.SubPattern(pattern.state, [item]), flags)
+    chars = [c for c in _ASCII if item_regex.match(c)]
+    if flags & re.IGNORECASE:
+        other = True
+    elif op is sre_parse.LITERAL:
+        other = av > 0x7F
+    elif op is sre_parse.IN:
+        other = not all(
+            (o is sre_parse.LITERAL and a <= 0x7F)
+            or (o is sre_parse.RANGE and a[1] <= 0x7F)
+            for o, a in av
+        )
+    else:
+        other = True
+    return FirstSet(chars, other=other)
@@ -45,6 +45,7 @@ __all__ = ["metamodel_from_str", "metamodel_from_file"]
 def metamodel_from_str(
     lang_desc: str,
     metamodel: TextXMetaModel | None = None,
+    cache_dir: str | os.PathLike[str] | None = None,
     **kwargs: Any,
 ) -> TextXMetaModel:
     """
@@ -53,12 +54,22 @@ def metamodel_from_str(
     Args:
         lang_desc(str): A textX language description.
         metamodel(TextXMetaModel): A metamodel that should be used.
+        cache_dir(str): A directory where the compiled metamodel is cached.
+            If given, the cached metamodel is used if the language
+            description, imported grammars and other params are the same.
         other params: See TextXMetaModel.
 
     """
 
     is_main_metamodel = metamodel is None
 
+    if cache_dir is not None and is_main_metamodel:
+        from textx.cache import load_metamodel
+
+        metamodel = load_metamodel(cache_dir, lang_desc, kwargs)
+        if metamodel is not None:
+            return metamodel
+
     if not metamodel:
         metamodel = TextXMetaModel(**kwargs)
 
@@ -67,8 +78,15 @@ def metamodel_from_str(
     language_from_str(lang_desc, metamodel, file_name)
 
     if is_main_metamodel:
+        from textx.cache import metamodel_key, save_metamodel
+
         metamodel.validate_user_classes()
 
+        metamodel._cache_key = metamodel_key(metamodel, lang_desc, kwargs)
+
+        if cache_dir is not None:
+            save_metamodel(cache_dir, metamodel, lang_desc, kwargs)
+
     return metamodel
 
 
@@ -90,6 +108,10 @@ def metamodel_from_file(
     return metamodel
 
 
+# Marks attributes initialized with a new empty list (see _init_obj_attrs)
+_NEW_LIST = object()
+
+
 class MetaAttr:
     """
     A metaclass for attribute description.
@@ -171,6 +193,51 @@ class TextXMetaClass(type):
         return f"<textx:{cls._tx_fqn} class at {id(cls)}>"
 
 
+def _release_parser_state(obj):
+    """
+    Available as `_tx_release` method of the objects of textX classes (see
+    textx.model.release_model).
+    """
+    from textx.model import release_model
+
+    release_model(obj)
+
+
+def _textx_class(metamodel, name, use_slots):
+    """
+    Creates an empty class for the textX rule with the given name (see
+    TextXMetaModel._new_class).
+    """
+
+    class TextXClass(metaclass=TextXMetaClass):
+        """
+        Dynamically created class. Each textX rule will result in
+        creating one Python class with the type name of the rule.
+        textX model is a graph of instances of these Python classes.
+
+        """
+
+        if use_slots:
+            __slots__ = ()
+
+            def __new__(cls):
+                return object.__new__(metamodel._instance_class(cls))
+
+        _tx_release = _release_parser_state
+
+        def __repr__(self):
+            """
+            Used for TextXClass bellow.
+            """
+            if hasattr(self, "name"):
+                return f"<{name}:{self.name}>"
+            else:
+                return f"<textx:{self._tx_fqn} instance at {hex(id(self))}>"
+
+    TextXClass.__name__ = name
+    return TextXClass
+
+
 class TextXMetaModel(DebugPrinter):
     """
     Meta-model contains all information about language abstract syntax.
@@ -234,6 +301,17 @@ class TextXMetaModel(DebugPrinter):
             "global_repository=GlobalModelRepository()".
         use_regexp_group (bool): if True, regexp terminals are
             replaced with the group value, if they have exactly one group.
+        use_slots (bool): if True, model objects are created without
+            `__dict__`, with a slot for each attribute instead.
+        model_cache_dir (str): a directory where models constructed from
+            files are cached (see textx.cache.ModelCache).
+        model_cache (ModelCache): the model cache or None.
+        release_parser_state (bool): if True, the parse tree and the parser
+            state not needed after a model is loaded are dropped (see
+            TextXModelParser.release).
+        stats (bool): if True, the time and counters of the phases of loading
+            each model are collected in its `_tx_stats` attribute (see
+            textx.model.ModelStats).
     """
 
     def __init__(
@@ -250,6 +328,10 @@ class TextXMetaModel(DebugPrinter):
         memoization=False,
         textx_tools_support=False,
         use_regexp_group=False,
+        use_slots=False,
+        model_cache_dir=None,
+        release_parser_state=False,
+        stats=False,
         **kwargs,
     ):
         # evaluate optional parameter "global_repository"
@@ -292,6 +374,23 @@ class TextXMetaModel(DebugPrinter):
         self.memoization = memoization
         self.textx_tools_support = textx_tools_support
         self.use_regexp_group = use_regexp_group
+        self.use_slots = use_slots
+        self.release_parser_state = release_parser_state
+        self.stats = stats
+
+        # Cache of models constructed from files
+        self.model_cache = None
+        if model_cache_dir is not None:
+            from textx.cache import ModelCache
+
+            self.model_cache = ModelCache(model_cache_dir)
+
+        # Identifies the language description and the meta-model parameters
+        # (see textx.cache.metamodel_key). None if unknown.
+        self._cache_key = None
+        # The key together with the imported grammars, computed when the model
+        # cache is first used (see textx.cache.metamodel_fingerprint).
+        self._fingerprint = None
 
         # Registered model processors
         self._model_processors = []
@@ -317,6 +416,14 @@ class TextXMetaModel(DebugPrinter):
 
         # Registered scope provider
         self.scope_providers = {}
+        # Scope providers already looked up for (class, attribute name)
+        self._scope_provider_cache = {}
+
+        # Initial attribute values per class (see _compile_attr_defaults)
+        self._attr_defaults = {}
+
+        # Classes of model objects if `use_slots` is set (see _instance_class)
+        self._instance_classes = {}
 
         # Namespaces
         self.namespaces = {}
@@ -368,10 +475,34 @@ class TextXMetaModel(DebugPrinter):
 
     def register_scope_providers(self, sp):
         self.scope_providers = sp
+        self._scope_provider_cache = {}
         for k, v in self.scope_providers.items():
             if isinstance(v, str):
                 self.scope_providers[k] = create_rrel_scope_provider(v)
 
+    def _get_scope_provider(self, cls, attr_name):
+        """
+        Returns the scope provider registered for the attribute `attr_name` of
+        the class `cls` or None if there is none. The most specific of the
+        keys "Cls.attr", "*.attr", "Cls.*" and "*.*" is used.
+        """
+        key = (cls, attr_name)
+        if key in self._scope_provider_cache:
+            return self._scope_provider_cache[key]
+
+        provider = None
+        for attr_ref in (
+            f"{cls.__name__}.{attr_name}",
+            f"*.{attr_name}",
+            f"{cls.__name__}.*",
+            "*.*",
+        ):
+            if attr_ref in self.scope_providers:
+                provider = self.scope_providers[attr_ref]
+                break
+        self._scope_provider_cache[key] = provider
+        return provider
+
     def _namespace_for_file_name(self, file_name):
         if file_name is None or self.root_path is None:
             return None
@@ -448,6 +579,8 @@ class TextXMetaModel(DebugPrinter):
     ):
         """
         Creates a new class with the given name in the current namespace.
+        If `use_slots` is set, instances of the class are created from a
+        subclass with slots (see `_instance_class`).
         Args:
             name(str): The name of the class.
             peg_rule(ParserExpression): An arpeggio peg rule used to match
@@ -458,25 +591,7 @@ class TextXMetaModel(DebugPrinter):
                 RULE_COMMON, RULE_ABSTRACT or RULE_MATCH.
         """
 
-        class TextXClass(metaclass=TextXMetaClass):
-            """
-            Dynamically created class. Each textX rule will result in
-            creating one Python class with the type name of the rule.
-            textX model is a graph of instances of these Python classes.
-
-            """
-
-            def __repr__(self):
-                """
-                Used for TextXClass bellow.
-                """
-                if hasattr(self, "name"):
-                    return f"<{name}:{self.name}>"
-                else:
-                    return f"<textx:{self._tx_fqn} instance at {hex(id(self))}>"
-
-        cls = TextXClass
-        cls.__name__ = name
+        cls = _textx_class(self, name, self.use_slots)
 
         self._init_class(cls, peg_rule, position, position_end, inherits, root, rule_type)
 
@@ -527,8 +642,10 @@ class TextXMetaModel(DebugPrinter):
         if root:
             self.rootcls = cls
 
-        if external_attributes:
-            cls._tx_obj_attrs = {}
+        if external_attributes and "_tx_loading_class" not in cls.__dict__:
+            from textx.model import user_loading_class
+
+            cls._tx_loading_class = user_loading_class(cls)
 
     def _cls_fqn(self, cls) -> str:
         """
@@ -547,29 +664,89 @@ class TextXMetaModel(DebugPrinter):
         Args:
             obj(object): A python object to set attributes to.
         """
-        for attr in obj.__class__._tx_attrs.values():
+        defaults = self._attr_defaults.get(obj.__class__)
+        if defaults is None:
+            defaults = self._compile_attr_defaults(obj.__class__)
+        for name, value in defaults:
+            setattr(obj, name, [] if value is _NEW_LIST else value)
+
+    def _compile_attr_defaults(self, cls):
+        """
+        Computes and caches the initial values of the attributes of the given
+        class as a list of (name, value) pairs. `_NEW_LIST` stands for a new
+        empty list.
+        Called for all classes once the meta-model is constructed and for
+        other classes on first use.
+        """
+        defaults = []
+        for attr in cls._tx_attrs.values():
             if attr.mult in [MULT_ZEROORMORE, MULT_ONEORMORE]:
                 # list
-                setattr(obj, attr.name, [])
+                defaults.append((attr.name, _NEW_LIST))
             elif attr.cls.__name__ in BASE_TYPE_NAMES:
                 # Instantiate base python type
                 if self.auto_init_attributes:
-                    setattr(obj, attr.name, python_type(attr.cls.__name__)())
+                    defaults.append((attr.name, python_type(attr.cls.__name__)()))
                 else:
                     # See https://github.com/textX/textX/issues/11
                     if attr.bool_assignment:
                         # Only ?= assignments shall have default
                         # value of False.
-                        setattr(obj, attr.name, False)
+                        defaults.append((attr.name, False))
                     else:
                         # Set base type attribute to None initially
                         # in order to be able to detect if an optional
                         # values are given in the model. Default values
                         # can be specified using object processors.
-                        setattr(obj, attr.name, None)
+                        defaults.append((attr.name, None))
             else:
                 # Reference to other obj
-                setattr(obj, attr.name, None)
+                defaults.append((attr.name, None))
+        self._attr_defaults[cls] = defaults
+        return defaults
+
+    def _instance_class(self, cls):
+        """
+        Returns a subclass of the given class used for its instances if
+        `use_slots` is set. The subclass is created on first use and has a
+        slot for each attribute of the class and for the attributes textX
+        sets on model objects. Objects that may be the model root keep the
+        `__dict__` for the model attributes (e.g. `_tx_filename`).
+        """
+        instance_class = self._instance_classes.get(cls)
+        if instance_class is not None:
+            return instance_class
+
+        slots = list(cls._tx_attrs)
+        slots.extend(["parent", "_tx_position", "_tx_position_end"])
+        if "importURI" in cls._tx_attrs:
+            # Set by the ImportURI based scope providers
+            slots.extend(["_tx_loaded_models", "name"])
+
+        root_classes = []
+        root_candidates = [self.rootcls]
+        parser = getattr(self, "_parser_blueprint", None)
+        if parser is not None:
+            # The class of the starting rule of the model parser
+            root_candidates.append(
+                getattr(parser.parser_model.nodes[0], "_tx_class", None)
+            )
+        while root_candidates:
+            root_cls = root_candidates.pop()
+            if root_cls is not None and root_cls not in root_classes:
+                root_classes.append(root_cls)
+                root_candidates.extend(root_cls._tx_inh_by)
+        if cls in root_classes:
+            slots.extend(["__dict__", "__weakref__"])
+
+        instance_class = type(cls)(
+            cls.__name__,
+            (cls,),
+            {"__slots__": tuple(dict.fromkeys(slots)), "__module__": cls.__module__},
+        )
+        self._instance_classes[cls] = instance_class
+        self._instance_classes[instance_class] = instance_class
+        return instance_class
 
     def _new_cls_attr(
         self,
@@ -590,7 +767,17 @@ class TextXMetaModel(DebugPrinter):
     def has_obj_processor(self, _type):
         return _type in self._obj_processors
 
-    def process(self, value, _type, filename, col, line, nchar=None):
+    def process(
+        self,
+        value,
+        _type,
+        filename=None,
+        col=None,
+        line=None,
+        nchar=None,
+        position=None,
+        parser=None,
+    ):
         """
         Process a value with the given type
         Convert instances of textx types and match rules to python types.
@@ -602,16 +789,28 @@ class TextXMetaModel(DebugPrinter):
             col: col for current object
             line: line for current object
             nchar: character count for current object (default: None)
+            position: position of the current object in the input. If given
+                with the parser instead of line and col, line and col are
+                computed only if an error has to be reported (default: None)
+            parser: the parser of the current model (default: None)
         Returns:
             None or a value used by TextX to replace the object during
             model creation.
         """
+        obj_processor = self._obj_processors.get(_type)
+        if obj_processor is None:
+            return value
         try:
-            return self._obj_processors.get(_type, lambda x: x)(value)
+            return obj_processor(value)
         except Exception as e:
             from textx.exceptions import TextXError
 
             if isinstance(e, TextXError):
+                if parser is not None:
+                    if filename is None:
+                        filename = parser.file_name
+                    if line is None and position is not None:
+                        line, col = parser.pos_to_linecol(position)
                 if e.col is None:
                     e.col = col
                 if e.line is None:
@@ -727,20 +926,11 @@ class TextXMetaModel(DebugPrinter):
         if not isinstance(model_str, str):
             raise TextXError("textX accepts only strings.")
 
+        self._invalidate_file_cache()
         if file_name is None:
-
-            def kwargs_callback(other_model):
-                if hasattr(other_model, "_tx_metamodel"):
-                    other_model._tx_model_params = ModelParams(kwargs)
-                if pre_ref_resolution_callback:
-                    pre_ref_resolution_callback(other_model)
-
-            model = self._parser_blueprint.clone().get_model_from_str(
-                model_str, debug=debug, pre_ref_resolution_callback=kwargs_callback
+            model = self._model_from_str(
+                model_str, debug, pre_ref_resolution_callback, kwargs
             )
-
-            for p in self._model_processors:
-                p(model, self)
         else:
             model = self.internal_model_from_file(
                 file_name,
@@ -753,13 +943,169 @@ class TextXMetaModel(DebugPrinter):
 
         return model
 
+    def _model_from_str(
+        self,
+        model_str,
+        debug,
+        pre_ref_resolution_callback,
+        kwargs,
+        constructed_model=None,
+    ):
+        """
+        Instantiates model from the given string which is not loaded from a
+        file (see model_from_str).
+        """
+
+        def kwargs_callback(other_model):
+            if hasattr(other_model, "_tx_metamodel"):
+                other_model._tx_model_params = ModelParams(kwargs)
+            if pre_ref_resolution_callback:
+                pre_ref_resolution_callback(other_model)
+
+        model = self._parser_blueprint.clone().get_model_from_str(
+            model_str,
+            debug=debug,
+            pre_ref_resolution_callback=kwargs_callback,
+            constructed_model=constructed_model,
+        )
+
+        self._call_model_processors(model)
+
+        return model
+
     def model_from_file(self, file_name, encoding="utf-8", debug=None, **kwargs):
         self.model_param_defs.check_params(file_name, **kwargs)
 
+        self._invalidate_file_cache()
         return self.internal_model_from_file(
             file_name, encoding, debug, model_params=ModelParams(kwargs)
         )
 
+    def models_from_strs(
+        self, model_strs, debug=None, workers=1, executor=None, **kwargs
+    ):
+        """
+        Instantiates models from the given strings (see model_from_str).
+        :param workers: the number of threads or processes loading the models
+        :param executor: "thread" or "process" to load the models in threads
+               (the default if workers > 1) or to parse them in forked worker
+               processes and resolve references in this process. An instance
+               of concurrent.futures.Executor (e.g. a shared ThreadPoolExecutor)
+               is used to load the models; a ProcessPoolExecutor is rejected.
+               With a global model repository the models are loaded one by
+               one in this thread unless the executor is "process".
+        :param **kwargs model parameters used for all models
+        Returns:
+            A list with the model or the exception raised while loading it
+            for each string, in the order of model_strs.
+        """
+        self.model_param_defs.check_params("from_str", **kwargs)
+        model_strs = list(model_strs)
+
+        def load(model_str, constructed_model):
+            if not isinstance(model_str, str):
+                raise TextXError("textX accepts only strings.")
+            return self._model_from_str(
+                model_str, debug, None, kwargs, constructed_model=constructed_model
+            )
+
+        def construct(model_strs):
+            from textx.scoping import construct_models_in_workers
+
+            return construct_models_in_workers(
+                [self] * len(model_strs),
+                [None] * len(model_strs),
+                None,
+                workers,
+                model_strs=model_strs,
+            )
+
+        return self._load_models(load, construct, model_strs, workers, executor)
+
+    def models_from_files(
+        self, file_names, encoding="utf-8", debug=None, workers=1, executor=None, **kwargs
+    ):
+        """
+        Instantiates models from the given files (see model_from_file).
+        :param workers: the number of threads or processes loading the models
+        :param executor: "thread" or "process" to load the models in threads
+               (the default if workers > 1) or to parse them in forked worker
+               processes and resolve references in this process. An instance
+               of concurrent.futures.Executor (e.g. a shared ThreadPoolExecutor)
+               is used to load the models; a ProcessPoolExecutor is rejected.
+               With a global model repository the models are loaded one by
+               one in this thread unless the executor is "process".
+        :param **kwargs model parameters used for all models
+        Returns:
+            A list with the model or the exception raised while loading it
+            for each file, in the order of file_names.
+        """
+        self.model_param_defs.check_params("from_files", **kwargs)
+        file_names = [abspath(file_name) for file_name in file_names]
+
+        def load(file_name, constructed_model):
+            return self.internal_model_from_file(
+                file_name,
+                encoding,
+                debug,
+                model_params=ModelParams(kwargs),
+                constructed_model=constructed_model,
+            )
+
+        def construct(file_names):
+            from textx.scoping import construct_models_in_workers
+
+            return construct_models_in_workers(
+                [self] * len(file_names), file_names, encoding, workers
+            )
+
+        return self._load_models(load, construct, file_names, workers, executor)
+
+    def _load_models(self, load, construct, sources, workers, executor):
+        """
+        Loads models from the given sources (strings or file names) by calling
+        `load(source, constructed_model)` for each source. With the "process"
+        executor the models are first constructed in worker processes by
+        `construct(sources)`.
+        """
+
+        def load_or_error(source, constructed_model=None):
+            try:
+                return load(source, constructed_model)
+            except Exception as e:
+                return e
+
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if isinstance(executor, str) and executor not in ("thread", "process"):
+            raise TextXError(f'Unknown executor "{executor}".')
+        if isinstance(executor, ProcessPoolExecutor):
+            raise TextXError(
+                'Process pool executors are not supported, use executor="process".'
+            )
+        if executor is None and workers > 1:
+            executor = "thread"
+        self._invalidate_file_cache()
+        if executor != "process" and hasattr(self, "_tx_model_repository"):
+            # The models and their imports are added to the global model
+            # repository while they are loaded, so they are loaded one by one.
+            executor = None
+
+        if executor is None:
+            return [load_or_error(source) for source in sources]
+        if executor == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(load_or_error, sources))
+        if executor == "process":
+            # References are resolved in this process as the models may
+            # reference each other through the model repository.
+            constructed = construct(sources) if workers > 1 else [None] * len(sources)
+            return [
+                load_or_error(source, constructed_model)
+                for source, constructed_model in zip(sources, constructed)
+            ]
+        return list(executor.map(load_or_error, sources))
+
     def internal_model_from_file(
         self,
         file_name,
@@ -769,12 +1115,15 @@ class TextXMetaModel(DebugPrinter):
         is_main_model=True,
         model_str=None,
         model_params=None,
+        constructed_model=None,
     ):
         """
         Instantiates model from the given file.
         :param pre_ref_resolution_callback: called before references are
                resolved. This can be useful to manage models distributed
                across files (scoping)
+        :param constructed_model: the model object graph constructed from
+               the file by a worker process (see ModelParser.get_model_from_str)
         """
         assert model_params is not None, "model_params are required in all cases"
         file_name = abspath(file_name)
@@ -784,19 +1133,7 @@ class TextXMetaModel(DebugPrinter):
         if hasattr(self, "_tx_model_repository"):
             # metamodel has a global repo
             if not callback:
-
-                def _pre_ref_resolution_callback(other_model):
-                    from textx.scoping import GlobalModelRepository
-
-                    filename = other_model._tx_filename
-                    assert filename
-                    # print("METAMODEL PRE-CALLBACK => {}".format(filename))
-                    other_model._tx_model_repository = GlobalModelRepository(
-                        self._tx_model_repository.all_models
-                    )
-                    self._tx_model_repository.all_models[filename] = other_model
-
-                callback = _pre_ref_resolution_callback
+                callback = self._add_to_global_repository
             if self._tx_model_repository.all_models.has_model(file_name):
                 model = self._tx_model_repository.all_models[file_name]
 
@@ -819,13 +1156,84 @@ class TextXMetaModel(DebugPrinter):
                 encoding=encoding,
                 pre_ref_resolution_callback=kwargs_callback,
                 is_main_model=is_main_model,
+                constructed_model=constructed_model,
             )
 
-        for p in self._model_processors:
-            p(model, self)
+        self._call_model_processors(model)
 
         return model
 
+    def _invalidate_file_cache(self):
+        """
+        Clears the file system lookups cached in the global model repository
+        by the previous load, so files added or removed since then are seen.
+        """
+        if hasattr(self, "_tx_model_repository"):
+            self._tx_model_repository.invalidate_file_cache()
+
+    def _call_model_processors(self, model):
+        from textx.model import _phase
+
+        with _phase(getattr(model, "_tx_stats", None), "model_processors"):
+            for p in self._model_processors:
+                p(model, self)
+
+    def _add_to_global_repository(self, model):
+        """
+        Adds the model loaded from a file to the global model repository of
+        this meta-model.
+        """
+        from textx.scoping import GlobalModelRepository
+
+        filename = model._tx_filename
+        assert filename
+        model._tx_model_repository = GlobalModelRepository(
+            self._tx_model_repository.all_models
+        )
+        self._tx_model_repository.all_models[filename] = model
+
+    def iter_model_from_file(
+        self, file_name, encoding="utf-8", debug=None, keep_elements=True, **kwargs
+    ):
+        """
+        Returns an iterator over the top-level elements of the model loaded
+        from the given file. Each element is yielded once it is constructed,
+        its references are resolved and its object processors are called.
+        The root rule must consist of a single repeated assignment, e.g.
+        `Model: elements*=Element;`. Model processors are called with the
+        model root after the last element.
+        :param keep_elements: keep the yielded elements in the model root.
+               If False, only references within an element can be resolved.
+        :param **kwargs additional arguments available through
+                _tx_model_params (see model_from_file)
+        """
+        self.model_param_defs.check_params(file_name, **kwargs)
+        file_name = abspath(file_name)
+        model_params = ModelParams(kwargs)
+
+        def kwargs_callback(model):
+            model._tx_model_params = model_params
+            if hasattr(self, "_tx_model_repository"):
+                self._add_to_global_repository(model)
+
+        with open(file_name, encoding=encoding) as f:
+            model_str = f.read()
+        self._invalidate_file_cache()
+        elements = self._parser_blueprint.clone().iter_model_from_str(
+            model_str,
+            file_name,
+            debug=debug,
+            pre_ref_resolution_callback=kwargs_callback,
+            encoding=encoding,
+            keep_elements=keep_elements,
+        )
+
+        def iter_elements():
+            model = yield from elements
+            self._call_model_processors(model)
+
+        return iter_elements()
+
     def register_model_processor(self, model_processor):
         """
         Model processor is callable that will be called after
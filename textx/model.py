@@ -4,13 +4,15 @@ Model construction from parse trees and the model API.
 
 from __future__ import annotations
 
+import io
 import traceback
 from collections import OrderedDict
 from collections.abc import Callable
-from contextlib import suppress
+from contextlib import contextmanager, nullcontext, suppress
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, TypeVar
 
-from arpeggio import EOF, NoMatch, Parser, Sequence, Terminal
+from arpeggio import EOF, NoMatch, Parser, RegExMatch, Sequence, Terminal
 
 from textx.const import (
     MULT_ASSIGN_ERROR,
@@ -24,7 +26,14 @@ from textx.const import (
 )
 from textx.exceptions import TextXError, TextXSemanticError, TextXSyntaxError
 from textx.lang import PRIMITIVE_PYTHON_TYPES
-from textx.scoping import Postponed, get_included_models, remove_models_from_repositories
+from textx.lookahead import first_set
+from textx.scoping import (
+    ModelLoader,
+    Postponed,
+    get_included_models,
+    remove_models_from_repositories,
+)
+from textx.scoping.providers import ImportURI
 from textx.scoping.providers import PlainName as DefaultScopeProvider
 
 if TYPE_CHECKING:
@@ -74,6 +83,15 @@ def get_model(obj: T) -> Any:
     return p
 
 
+def release_model(obj: Any) -> None:
+    """
+    Drops the parse tree and the parser state of the model the given object
+    belongs to (see TextXModelParser.release). Works also for models whose
+    objects are instances of user classes.
+    """
+    get_model(obj)._tx_parser.release()
+
+
 def get_metamodel(obj: Any) -> TextXMetaModel:
     """
     Returns metamodel of the given object's model.
@@ -125,38 +143,52 @@ def get_children(
     collected = []
     collected_ids = set()
 
-    def follow(elem):
-        if id(elem) in collected_ids:
-            # Use id to avoid relying on __eq__ of user class
-            return
-
+    # Depth-first traversal using an explicit stack. Each entry is an
+    # element and a flag telling if its children have already been pushed
+    # (used to collect the element after its children if children_first).
+    stack = [(root, False)]
+    while stack:
+        elem, children_done = stack.pop()
         # Use meta-model to search for all contained child elements.
         cls = elem.__class__
 
-        if not children_first and hasattr(cls, "_tx_attrs") and selector(elem):
-            collected.append(elem)
-            collected_ids.add(id(elem))
+        if children_done:
+            if selector(elem):
+                collected.append(elem)
+                collected_ids.add(id(elem))
+            continue
 
-        if hasattr(cls, "_tx_attrs"):
-            for attr_name, attr in cls._tx_attrs.items():
-                # Follow only attributes with containment semantics
-                if attr.cont:
-                    if attr.mult in (MULT_ONE, MULT_OPTIONAL):
-                        new_elem = getattr(elem, attr_name)
-                        if new_elem is not None and should_follow(new_elem):
-                            follow(new_elem)
-                    else:
-                        new_elem_list = getattr(elem, attr_name)
-                        if new_elem_list:
-                            for new_elem in new_elem_list:
-                                if should_follow(new_elem):
-                                    follow(new_elem)
+        if id(elem) in collected_ids:
+            # Use id to avoid relying on __eq__ of user class
+            continue
 
-        if children_first and hasattr(cls, "_tx_attrs") and selector(elem):
+        if not hasattr(cls, "_tx_attrs"):
+            continue
+
+        if children_first:
+            # collected when popped again after its children
+            stack.append((elem, True))
+        elif selector(elem):
             collected.append(elem)
             collected_ids.add(id(elem))
 
-    follow(root)
+        children = []
+        for attr_name, attr in cls._tx_attrs.items():
+            # Follow only attributes with containment semantics
+            if attr.cont:
+                if attr.mult in (MULT_ONE, MULT_OPTIONAL):
+                    new_elem = getattr(elem, attr_name)
+                    if new_elem is not None and should_follow(new_elem):
+                        children.append((new_elem, False))
+                else:
+                    new_elem_list = getattr(elem, attr_name)
+                    if new_elem_list:
+                        for new_elem in new_elem_list:
+                            if should_follow(new_elem):
+                                children.append((new_elem, False))
+        # Push in reverse order so that children are visited in order
+        stack.extend(reversed(children))
+
     return collected
 
 
@@ -271,6 +303,110 @@ class ObjCrossRef:
         self.match_rule_name = match_rule_name
 
 
+class NameIndex:
+    """
+    Named objects of a single model keyed by their name and grouped by their
+    class. It is built once per model and used by the `PlainName` scope
+    provider during reference resolution instead of walking the whole model
+    for each reference.
+
+    Attributes:
+        model: the model the index is built for.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._index = {}
+        self.add(model)
+
+    def add(self, container):
+        """
+        Adds the named objects contained in `container` (and `container`
+        itself) to the index.
+        """
+        for obj in get_children(lambda x: hasattr(x, "name"), container):
+            try:
+                by_cls = self._index.setdefault(obj.name, {})
+            except TypeError:
+                # Objects with unhashable names can't be referenced by name.
+                continue
+            by_cls.setdefault(obj.__class__, []).append(obj)
+
+    def find(self, name, cls):
+        """
+        Returns a list of all objects named `name` which are instances of
+        `cls` (see textx_isinstance).
+        """
+        try:
+            by_cls = self._index.get(name)
+        except TypeError:
+            return []
+        if not by_cls:
+            return []
+        # textx_isinstance depends on the class only, so it is enough to
+        # check the first object of each group.
+        return [
+            obj
+            for objs in by_cls.values()
+            if textx_isinstance(objs[0], cls)
+            for obj in objs
+        ]
+
+
+class FQNIndex:
+    """
+    Named objects of a single model keyed by their container and their name.
+    It is built once per model and used by the `FQN` scope provider (if
+    created with `indexed=True`) to follow fully qualified names without
+    inspecting the attributes of each visited object. Only containment
+    attributes are taken into account.
+
+    Attributes:
+        model: the model the index is built for.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._children = {}
+        self.add(model)
+
+    def add(self, container):
+        """
+        Adds `container` and its contained objects to the index. If the parent
+        of `container` is in the index, `container` is added to its children.
+        """
+        parent_children = self._children.get(id(getattr(container, "parent", None)))
+        if parent_children is not None and hasattr(container, "name"):
+            with suppress(TypeError):
+                parent_children.setdefault(container.name, container)
+        for obj in get_children(lambda x: True, container):
+            children = {}
+            for attr in obj.__class__._tx_attrs.values():
+                if not attr.cont:
+                    continue
+                value = getattr(obj, attr.name)
+                if attr.mult in (MULT_ONE, MULT_OPTIONAL):
+                    value = [value]
+                for child in value or []:
+                    if hasattr(child, "name"):
+                        # The first object with a given name wins.
+                        with suppress(TypeError):
+                            children.setdefault(child.name, child)
+            self._children[id(obj)] = children
+
+    def __contains__(self, obj):
+        return id(obj) in self._children
+
+    def find_child(self, parent, name):
+        """
+        Returns the object named `name` directly contained in `parent` or None.
+        """
+        try:
+            return self._children[id(parent)].get(name)
+        except TypeError:
+            return None
+
+
 class RefRulePosition:
     """
     Used for "go to definition" support in textx-languageserver
@@ -317,6 +453,11 @@ def get_model_parser(top_rule, comments_model, **kwargs):
             )
             self.comments_model = comments_model
 
+            # Characters the comments can start with (see LookaheadChoice)
+            self._comment_start = (
+                first_set(comments_model) if comments_model is not None else None
+            )
+
             # Stack for metaclass instances
             self._inst_stack = []
 
@@ -328,6 +469,9 @@ def get_model_parser(top_rule, comments_model, **kwargs):
             # Contained elements are tuples: (instance, metaattr, cross-ref)
             self._crossrefs = []
 
+            # Stats of the model being loaded (see ModelStats)
+            self._stats = None
+
         def clone(self):
             """
             Responsibility: create a clone in order to parse a separate file.
@@ -357,15 +501,18 @@ def get_model_parser(top_rule, comments_model, **kwargs):
             try:
                 return self.parser_model.parse(self)
             except NoMatch as e:
-                e.eval_attrs()
-                raise TextXSyntaxError(
-                    message=e.message,
-                    line=e.line,
-                    col=e.col,
-                    filename=e.parser.file_name,
-                    context=e.context,
-                    expected_rules=e.rules,
-                ) from e
+                raise self._syntax_error(e) from e
+
+        def _syntax_error(self, e):
+            e.eval_attrs()
+            return TextXSyntaxError(
+                message=e.message,
+                line=e.line,
+                col=e.col,
+                filename=e.parser.file_name,
+                context=e.context,
+                expected_rules=e.rules,
+            )
 
         def get_model_from_file(
             self,
@@ -402,9 +549,14 @@ def get_model_parser(top_rule, comments_model, **kwargs):
             pre_ref_resolution_callback=None,
             is_main_model=True,
             encoding="utf-8",
+            constructed_model=None,
         ):
             """
             Parses given string and creates model object graph.
+            :param constructed_model: the pickled object graph constructed
+                   from the given string by a worker process (see
+                   textx.cache.dump_constructed_model). If given, the string
+                   is not parsed again.
             """
             old_debug_state = self.debug
 
@@ -415,27 +567,51 @@ def get_model_parser(top_rule, comments_model, **kwargs):
                 if self.debug:
                     self.dprint("*** PARSING MODEL ***")
 
-                self.parse(model_str, file_name=file_name)
-
                 # Used to keep track of user class instances
                 self._user_class_inst = []
+                self._stats = ModelStats() if self.metamodel.stats else None
 
-                self._replace_user_attr_methods()
+                model_cache = self.metamodel.model_cache
+                cached_model = None
+                if constructed_model is not None:
+                    from textx.cache import load_constructed_model
 
-                # Transform parse tree to model. Skip root node which
-                # represents the whole file ending in EOF.
-                model = parse_tree_to_objgraph(
-                    self,
-                    self.parse_tree[0],
-                    file_name=file_name,
-                    pre_ref_resolution_callback=pre_ref_resolution_callback,
-                    is_main_model=is_main_model,
-                    encoding=encoding,
-                )
+                    # If it can't be loaded the model is parsed again.
+                    with suppress(Exception):
+                        cached_model = load_constructed_model(
+                            self, io.BytesIO(constructed_model), model_str, file_name
+                        )
+                elif file_name and not self.debug and model_cache is not None:
+                    # The model constructed from the same content before
+                    cached_model = model_cache.load(self, model_str, file_name)
+
+                if cached_model is None:
+                    with _phase(self._stats, "parse"):
+                        self.parse(model_str, file_name=file_name)
+
+                if cached_model is None:
+                    # Transform parse tree to model. Skip root node which
+                    # represents the whole file ending in EOF.
+                    model = parse_tree_to_objgraph(
+                        self,
+                        self.parse_tree[0],
+                        file_name=file_name,
+                        pre_ref_resolution_callback=pre_ref_resolution_callback,
+                        is_main_model=is_main_model,
+                        encoding=encoding,
+                    )
+                else:
+                    model = finish_model(
+                        self,
+                        cached_model,
+                        file_name=file_name,
+                        pre_ref_resolution_callback=pre_ref_resolution_callback,
+                        is_main_model=is_main_model,
+                        encoding=encoding,
+                    )
 
             except:  # noqa
-                # Restore of user classes replaced attr methods
-                self._restore_user_attr_methods()
+                self._discard_user_obj_attrs()
                 raise
 
             finally:
@@ -444,84 +620,265 @@ def get_model_parser(top_rule, comments_model, **kwargs):
 
             return model
 
-        def _replace_user_attr_methods_for_class(self, user_class):
-            assert hasattr(user_class, "_tx_obj_attrs")
+        def iter_model_from_str(
+            self,
+            model_str,
+            file_name=None,
+            debug=None,
+            pre_ref_resolution_callback=None,
+            encoding="utf-8",
+            keep_elements=True,
+        ):
+            """
+            Returns an iterator over the top-level elements of the model
+            parsed from the given string. The root rule must consist of a
+            single repeated assignment (e.g. `Model: elements*=Element;`).
+            Elements are parsed one by one and yielded once they are
+            constructed, their references are resolved and their object
+            processors are called. The parse tree of an element is dropped
+            before the next element is parsed.
+            :param keep_elements: keep the yielded elements in the model root.
+                   If False, only references within an element can be resolved.
+            The iterator returns the model root when it is exhausted.
+            """
+            metamodel = self.metamodel
+            root_rule = self.parser_model.nodes[0]
+            assignment = root_rule.nodes[0] if len(root_rule.nodes) == 1 else None
+            if (
+                getattr(assignment, "_tx_asgn_op", None)
+                not in ("zeroormore", "oneormore")
+                or assignment.sep is not None
+                or metamodel.rootcls.__name__ in metamodel.user_classes
+            ):
+                raise TextXError(
+                    "Models can be iterated only if the root rule is not a user"
+                    " class and consists of a single repeated assignment without"
+                    ' separator, e.g. "Model: elements*=Element;".'
+                )
 
-            # Custom attr dunder methods used for user classes during loading
-            def _getattribute(obj, name):
-                if name == "__dict__":
-                    try:
-                        return user_class._tx_obj_attrs[id(obj)]
-                    except KeyError:
-                        pass
-                else:
-                    try:
-                        return user_class._tx_obj_attrs[id(obj)][name]
-                    except KeyError:
-                        pass
+            self.position = 0
+            self.nm = None
+            self.line_ends = []
+            self.input = model_str
+            self.file_name = file_name
+            self.parse_tree = None
+            self._user_class_inst = []
+            self._stats = ModelStats() if metamodel.stats else None
+
+            return self._iter_elements(
+                assignment,
+                debug,
+                pre_ref_resolution_callback,
+                encoding,
+                keep_elements,
+            )
 
-                return super(user_class, obj).__getattribute__(name)
+        def _iter_elements(
+            self,
+            assignment,
+            debug,
+            pre_ref_resolution_callback,
+            encoding,
+            keep_elements,
+        ):
+            """
+            Parses and yields the elements of the model (see
+            iter_model_from_str).
+            """
+            metamodel = self.metamodel
+            stats = self._stats
+            old_debug_state = self.debug
+            model = None
 
-            def _setattr(obj, name, value):
-                try:
-                    user_class._tx_obj_attrs[id(obj)][name] = value
-                except KeyError:
-                    try:
-                        return user_class._tx_real_setattr(name, value)
-                    except (AttributeError, TypeError):
-                        return super(user_class, obj).__setattr__(name, value)
+            try:
+                if debug is not None:
+                    self.debug = debug
 
-            def _delattr(obj, name):
-                try:
-                    user_class._tx_obj_attrs[id(obj)].pop(name)
-                except KeyError:
+                root_cls = metamodel.rootcls
+                attr = root_cls._tx_attrs[assignment._attr_name]
+                model = root_cls.__new__(root_cls)
+                metamodel._init_obj_attrs(model)
+                model._tx_position = 0
+                model._tx_position_end = len(self.input)
+                elements = getattr(model, attr.name)
+
+                finish_model(
+                    self,
+                    model,
+                    file_name=self.file_name,
+                    pre_ref_resolution_callback=pre_ref_resolution_callback,
+                    is_main_model=False,
+                    encoding=encoding,
+                )
+                resolver = model._tx_reference_resolver
+                model_loaders = [
+                    scope_provider
+                    for scope_provider in metamodel.scope_providers.values()
+                    if isinstance(scope_provider, ModelLoader)
+                ]
+
+                # The number of models in the model repository when the models
+                # in construction were last collected.
+                repository_size = 0
+
+                def models_in_construction():
+                    # The models loaded by the scope providers (e.g. GlobalRepo
+                    # or imports) are added to the model repository.
+                    nonlocal repository_size
+                    repository = getattr(model, "_tx_model_repository", None)
+                    if (
+                        repository is None
+                        or len(repository.all_models) == repository_size
+                    ):
+                        return [model]
+                    repository_size = len(repository.all_models)
+                    return [
+                        m
+                        for m in get_included_models(model)
+                        if m is model or hasattr(m, "_tx_reference_resolver")
+                    ]
+
+                def resolve_references():
+                    models = models_in_construction()
+                    with _phase(stats, "resolve"):
+                        _resolve_references(
+                            self,
+                            models,
+                            invalidate_indexes=False,
+                            new_models=models_in_construction,
+                        )
+                    for m in models:
+                        if m is model:
+                            continue
+                        m_stats = getattr(m, "_tx_stats", None)
+                        with _phase(m_stats, "user_classes"):
+                            _end_model_construction(m)
+                        with _phase(m_stats, "obj_processors"):
+                            call_obj_processors(m._tx_metamodel, m)
+                        if stats is not None and m_stats is not None:
+                            stats.imported.append(m_stats)
+
+                def load_element_models(element):
+                    # Load the models imported by the element (e.g. using
+                    # importURI) like finish_model does for the whole model.
+                    providers = list(model_loaders)
+                    for crossref in self._crossrefs:
+                        scope_provider = crossref[2].scope_provider
+                        if isinstance(scope_provider, ModelLoader):
+                            providers.append(scope_provider)
+                    with _phase(stats, "imports"):
+                        for scope_provider in providers:
+                            scope_provider.load_element_models(
+                                model, element, encoding=encoding
+                            )
+
+                element_rule = assignment.nodes[0]
+                eof = self.parser_model.nodes[1]
+                parsed_elements = 0
+                while True:
+                    self._crossrefs = []
+                    self._user_class_inst = []
+                    self.comments = []
+                    self.comment_positions = {}
+                    if self.memoization:
+                        self._clear_caches()
+
+                    position = self.position
                     try:
-                        return user_class._tx_real_delattr(name)
-                    except (AttributeError, TypeError):
-                        return super(user_class, obj).__delattr__(name)
-
-            for a_name in ("setattr", "delattr", "getattribute"):
-                real_name = f"__{a_name}__"
-                cached_name = f"_tx_real_{a_name}"
-                setattr(user_class, cached_name, user_class.__dict__.get(real_name, None))
-                setattr(user_class, real_name, locals()[f"_{a_name}"])
-            user_class._tx_instrumented = 1
-
-        def _replace_user_attr_methods(self):
+                        with _phase(stats, "parse"):
+                            node = element_rule.parse(self)
+                    except NoMatch as e:
+                        if parsed_elements or assignment._tx_asgn_op == "zeroormore":
+                            self.position = position
+                            try:
+                                eof.parse(self)
+                                break
+                            except NoMatch as e:
+                                raise self._syntax_error(e) from e
+                        raise self._syntax_error(e) from e
+                    finally:
+                        self.nm = None
+
+                    # Construct the element as a child of the model root
+                    self._inst_stack.append((model, model))
+                    with _phase(stats, "construct"):
+                        element, _ = construct_model(self, node)
+                    self._inst_stack.pop()
+                    del node
+
+                    elements.append(element)
+                    parsed_elements += 1
+                    resolver.add_object(element)
+                    resolver.add_crossrefs(self._crossrefs)
+                    if stats is not None:
+                        stats.crossrefs += len(self._crossrefs)
+                    load_element_models(element)
+                    resolve_references()
+
+                    with _phase(stats, "user_classes"):
+                        _init_user_class_objs(self)
+                    with _phase(stats, "obj_processors"):
+                        result = call_obj_processors(metamodel, model, element, attr.cls)
+                    if result is not None:
+                        elements[-1] = element = result
+                    if not keep_elements:
+                        elements.clear()
+                        resolver.invalidate_indexes()
+                        self._instances = {}
+
+                    yield element
+
+                resolve_references()
+                _end_model_construction(model)
+                if metamodel.release_parser_state:
+                    self.release()
+                if metamodel.has_obj_processor(root_cls.__name__):
+                    with _phase(stats, "obj_processors"):
+                        metamodel.process(
+                            model,
+                            root_cls.__name__,
+                            position=0,
+                            nchar=len(self.input),
+                            filename=self.file_name,
+                            parser=self,
+                        )
+
+            except:  # noqa
+                self._discard_user_obj_attrs()
+                if model is not None:
+                    _remove_all_affected_models_in_construction(model)
+                raise
+
+            finally:
+                if debug is not None:
+                    self.debug = old_debug_state
+
+            return model
+
+        def release(self):
             """
-            Replace get/set/del(attr) methods on user classes
-            to support postponing of user obj initialization.
+            Drops the parse tree and the parser state which are not needed
+            once the model is loaded. The input, the file name and the line
+            ends are kept for the location of the model objects (see
+            get_location) and error reporting.
             """
-            for user_class in self.metamodel.user_classes.values():
-                if "_tx_instrumented" not in user_class.__dict__:
-                    self._replace_user_attr_methods_for_class(user_class)
-                else:
-                    user_class._tx_instrumented += 1
+            self.parse_tree = None
+            self.nm = None
+            self.comments = []
+            self.comment_positions = {}
+            self.sem_actions = {}
+            self._inst_stack = []
+            self._instances = {}
+            self._crossrefs = []
+            self._user_class_inst = []
 
-        def _restore_user_attr_methods(self):
+        def _discard_user_obj_attrs(self):
             """
-            Restore original get/set/del(attr) methods on user
-            classes.
+            Discards the attributes collected for the user class objects of
+            the model being loaded (see user_loading_class).
             """
-            for user_class in self.metamodel.user_classes.values():
-                if hasattr(user_class, "_tx_instrumented"):
-                    user_class._tx_instrumented -= 1
-                    if user_class._tx_instrumented == 0:
-                        delattr(user_class, "_tx_instrumented")
-                        for a_name in ("getattr", "setattr", "delattr", "getattribute"):
-                            cached_name = f"_tx_real_{a_name}"
-                            real_name = f"__{a_name}__"
-                            if hasattr(user_class, cached_name):
-                                cached_meth = getattr(user_class, cached_name)
-                                if hasattr(cached_meth, "im_func"):
-                                    # Python 2: func is converted to
-                                    # instancemethod
-                                    cached_meth = cached_meth.im_func
-                                if cached_meth is not None:
-                                    setattr(user_class, real_name, cached_meth)
-                                else:
-                                    delattr(user_class, real_name)
-                                delattr(user_class, cached_name)
+            discard_user_obj_attrs(self._user_class_inst)
+            discard_user_obj_attrs(obj for obj, _ in self._inst_stack)
 
     return TextXModelParser(**kwargs)
 
@@ -541,18 +898,49 @@ def parse_tree_to_objgraph(
 
     metamodel = parser.metamodel
 
-    if metamodel.textx_tools_support:
-        pos_rule_dict = {}
-    pos_crossref_list = []
+    # load model from file (w/o reference resolution)
+    # Note: if an exception happens here, the model was not yet
+    # added to any repository. Thus, we have no special exception
+    # safety handling at this point...
+    with _phase(parser._stats, "construct"):
+        model, pos_rule_dict = construct_model(parser, parse_tree)
+
+    if file_name and metamodel.model_cache is not None:
+        metamodel.model_cache.save(parser, model)
+
+    return finish_model(
+        parser,
+        model,
+        file_name=file_name,
+        pre_ref_resolution_callback=pre_ref_resolution_callback,
+        is_main_model=is_main_model,
+        encoding=encoding,
+        pos_rule_dict=pos_rule_dict,
+    )
+
+
+def construct_model(parser, parse_tree):
+    """
+    Transforms parse_tree to the object graph of the model without resolving
+    references. The references to resolve are collected by the parser.
+
+    Returns:
+        The model and the rule instances by their position if the meta-model
+        has `textx_tools_support` (None otherwise).
+    """
+
+    metamodel = parser.metamodel
+    stats = parser._stats
+
+    pos_rule_dict = {} if metamodel.textx_tools_support else None
 
     def process_match(nt):
         """
         Process subtree for match rules.
         """
-        line, col = parser.pos_to_linecol(nt.position)
         if isinstance(nt, Terminal):
             return metamodel.process(
-                nt.value, nt.rule_name, filename=parser.file_name, line=line, col=col
+                nt.value, nt.rule_name, position=nt.position, parser=parser
             )
         else:
             # If RHS of assignment is NonTerminal it is a product of
@@ -562,73 +950,113 @@ def parse_tree_to_objgraph(
             else:
                 result = process_match(nt[0])
             return metamodel.process(
-                result, nt.rule_name, filename=parser.file_name, line=line, col=col
+                result, nt.rule_name, position=nt.position, parser=parser
+            )
+
+    def process_terminal(node):
+        value = node.value
+        if (
+            metamodel.use_regexp_group
+            and isinstance(node.rule, RegExMatch)
+            and node.rule.regex.groups == 1
+        ):
+            value = node.extra_info.group(1)
+        return metamodel.process(
+            value, node.rule_name, position=node.position, parser=parser
+        )
+
+    def process_plain_assignment(node, value):
+        """
+        Assigns the value of a plain assignment node to the object on top of
+        the instance stack. Returns True if a cross-reference is created.
+        """
+        attr_name = node.rule._attr_name
+        model_obj, obj_attr = parser._inst_stack[-1]
+        metaattr = type(model_obj)._tx_attrs[attr_name]
+
+        attr_value = getattr(obj_attr, attr_name)
+        if attr_value and not isinstance(attr_value, list):
+            fmt = "Multiple assignments to attribute {} at {}"
+            raise TextXSemanticError(
+                message=fmt.format(attr_name, parser.pos_to_linecol(node.position)),
+                err_type=MULT_ASSIGN_ERROR,
             )
 
+        if metaattr.ref and not metaattr.cont:
+            # If this is non-containing reference create ObjCrossRef
+            p = metaattr.scope_provider
+            rn = metaattr.match_rule_name
+            value = ObjCrossRef(
+                obj_name=value,
+                cls=metaattr.cls,
+                position=node[0].position,
+                scope_provider=p,
+                match_rule_name=rn,
+            )
+            parser._crossrefs.append((model_obj, metaattr, value))
+            return True
+
+        if isinstance(attr_value, list):
+            attr_value.append(value)
+        else:
+            setattr(obj_attr, attr_name, value)
+        return False
+
+    # Values of processed nodes (see `construct` and `process_node`)
+    values = []
+
     def process_node(node):
-        line, col = parser.pos_to_linecol(node.position)
-        if isinstance(node, Terminal):
-            from arpeggio import RegExMatch
-
-            if metamodel.use_regexp_group and isinstance(node.rule, RegExMatch):
-                if node.rule.regex.groups == 1:
-                    value = node.extra_info.group(1)
-                    return metamodel.process(
-                        value,
-                        node.rule_name,
-                        filename=parser.file_name,
-                        line=line,
-                        col=col,
-                    )
-                else:
-                    return metamodel.process(
-                        node.value,
-                        node.rule_name,
-                        filename=parser.file_name,
-                        line=line,
-                        col=col,
-                    )
-            else:
-                return metamodel.process(
-                    node.value,
-                    node.rule_name,
-                    filename=parser.file_name,
-                    line=line,
-                    col=col,
+        """
+        Processes a non-terminal node and appends its value to `values`.
+        This is a generator which yields the non-terminal child nodes to be
+        processed (see `construct`), so that deeply nested models do not hit
+        the recursion limit. After a child node is yielded its value is on
+        top of `values`. Terminal child nodes are processed directly.
+        """
+        assert node.rule.root, f"Not a root node: {node.rule.rule_name}"
+        # The assignment operation is precomputed for assignment rules by
+        # the TextXVisitor
+        op = getattr(node.rule, "_tx_asgn_op", None)
+
+        while op is None and node.rule._tx_class._tx_type == RULE_ABSTRACT:
+            # If this meta-class is product of abstract rule replace it
+            # with matched concrete meta-class down the inheritance tree.
+            # Abstract meta-class should never be instantiated.
+            if len(node) > 1:
+                concrete_node = next(
+                    (
+                        n
+                        for n in node
+                        if type(n) is not Terminal and n.rule._tx_class is not RULE_MATCH
+                    ),
+                    None,
                 )
+                if concrete_node is None:
+                    # All nodes are match rules, do concatenation
+                    values.append("".join(str(n) for n in node))
+                    return
+                node = concrete_node
+            else:
+                node = node[0]
+                if isinstance(node, Terminal):
+                    values.append(process_terminal(node))
+                    return
+            assert node.rule.root, f"Not a root node: {node.rule.rule_name}"
+            op = getattr(node.rule, "_tx_asgn_op", None)
 
-        assert node.rule.root, f"Not a root node: {node.rule.rule_name}"
         # If this node is created by some root rule
         # create metaclass instance.
         inst = None
-        if not node.rule_name.startswith("__asgn"):
+        if op is None:
             # If not assignment
             # Get class
             mclass = node.rule._tx_class
 
-            if mclass._tx_type == RULE_ABSTRACT:
-                # If this meta-class is product of abstract rule replace it
-                # with matched concrete meta-class down the inheritance tree.
-                # Abstract meta-class should never be instantiated.
-                if len(node) > 1:
-                    try:
-                        return process_node(
-                            next(
-                                n
-                                for n in node
-                                if type(n) is not Terminal
-                                and n.rule._tx_class is not RULE_MATCH
-                            )
-                        )  # noqa
-                    except StopIteration:
-                        # All nodes are match rules, do concatenation
-                        return "".join(str(n) for n in node)
-                else:
-                    return process_node(node[0])
-            elif mclass._tx_type == RULE_MATCH:
+            if mclass._tx_type == RULE_MATCH:
                 # If this is a product of match rule handle it as a RHS
                 # of assignment and return converted python type.
-                return process_match(node)
+                values.append(process_match(node))
+                return
 
             if parser.debug:
                 parser.dprint(f"CREATING INSTANCE {node.rule_name}")
@@ -641,9 +1069,13 @@ def parse_tree_to_objgraph(
 
                 # Object initialization will be done afterwards
                 # At this point we need object to be allocated
-                # So that nested object get correct reference
+                # So that nested object get correct reference.
+                # Until then the object is an instance of the loading
+                # class which collects its attributes.
                 inst = user_class.__new__(user_class)
-                user_class._tx_obj_attrs[id(inst)] = {}
+                loading_class = user_class._tx_loading_class
+                loading_class._tx_obj_attrs[id(inst)] = {}
+                object.__setattr__(inst, "__class__", loading_class)
                 is_user = True
 
             else:
@@ -662,11 +1094,26 @@ def parse_tree_to_objgraph(
 
             # Push real obj. and dummy attr obj on the instance stack
             parser._inst_stack.append((inst, obj_attrs))
+            if stats is not None:
+                stats.objects += 1
 
             for n in node:
                 if parser.debug:
                     parser.dprint(f"Recursing into {type(n).__name__} = '{n}'")
-                process_node(n)
+                if isinstance(n, Terminal):
+                    process_terminal(n)
+                elif getattr(n.rule, "_tx_asgn_op", None) == "plain" and isinstance(
+                    n[0], Terminal
+                ):
+                    # Fast path for the most common case, e.g. `name=ID`
+                    if parser.debug:
+                        parser.dprint(
+                            f"Handling assignment: plain {n.rule._attr_name}..."
+                        )
+                    process_plain_assignment(n, process_terminal(n[0]))
+                else:
+                    yield n
+                    values.pop()
 
             parser._inst_stack.pop()
 
@@ -680,10 +1127,10 @@ def parse_tree_to_objgraph(
             # Special case for 'name' attrib. It is used for cross-referencing
             if hasattr(inst, "name") and inst.name:
                 # Objects of each class are in its own namespace
-                if id(inst.__class__) not in parser._instances:
-                    parser._instances[id(inst.__class__)] = {}
+                if id(mclass) not in parser._instances:
+                    parser._instances[id(mclass)] = {}
                 try:
-                    parser._instances[id(inst.__class__)][inst.name] = inst
+                    parser._instances[id(mclass)][inst.name] = inst
                 except TypeError as e:
                     if "unhashable type" in e.args[0]:
                         raise TextXSemanticError(
@@ -699,7 +1146,6 @@ def parse_tree_to_objgraph(
         else:
             # Handle assignments
             attr_name = node.rule._attr_name
-            op = node.rule_name.split("_")[-1]
             model_obj, obj_attr = parser._inst_stack[-1]
             cls = type(model_obj)
             metaattr = cls._tx_attrs[attr_name]
@@ -711,37 +1157,16 @@ def parse_tree_to_objgraph(
                 setattr(obj_attr, attr_name, True)
 
             elif op == "plain":
-                attr_value = getattr(obj_attr, attr_name)
-                if attr_value and not isinstance(attr_value, list):
-                    fmt = "Multiple assignments to attribute {} at {}"
-                    raise TextXSemanticError(
-                        message=fmt.format(
-                            attr_name, parser.pos_to_linecol(node.position)
-                        ),
-                        err_type=MULT_ASSIGN_ERROR,
-                    )
-
                 # Convert tree bellow assignment to proper value
-                value = process_node(node[0])
-
-                if metaattr.ref and not metaattr.cont:
-                    # If this is non-containing reference create ObjCrossRef
-                    p = metaattr.scope_provider
-                    rn = metaattr.match_rule_name
-                    value = ObjCrossRef(
-                        obj_name=value,
-                        cls=metaattr.cls,
-                        position=node[0].position,
-                        scope_provider=p,
-                        match_rule_name=rn,
-                    )
-                    parser._crossrefs.append((model_obj, metaattr, value))
-                    return model_obj
-
-                if isinstance(attr_value, list):
-                    attr_value.append(value)
+                if isinstance(node[0], Terminal):
+                    value = process_terminal(node[0])
                 else:
-                    setattr(obj_attr, attr_name, value)
+                    yield node[0]
+                    value = values.pop()
+
+                if process_plain_assignment(node, value):
+                    values.append(model_obj)
+                    return
 
             elif op in ["list", "oneormore", "zeroormore"]:
                 for n in node:
@@ -749,7 +1174,11 @@ def parse_tree_to_objgraph(
                     if n.rule_name != "sep":
                         # Convert node to proper type
                         # Rule links will be resolved later
-                        value = process_node(n)
+                        if isinstance(n, Terminal):
+                            value = process_terminal(n)
+                        else:
+                            yield n
+                            value = values.pop()
 
                         if metaattr.ref and not metaattr.cont:
                             # If this is non-containing reference
@@ -783,102 +1212,182 @@ def parse_tree_to_objgraph(
             pos = (inst._tx_position, inst._tx_position_end)
             pos_rule_dict[pos] = inst
 
-        return inst
+        values.append(inst)
 
-    def call_obj_processors(metamodel, model_obj, metaclass_of_grammar_rule=None):
+    def construct(node):
         """
-        Depth-first model object processing.
+        Processes the given node and all its child nodes depth-first using
+        an explicit stack of `process_node` generators.
         """
-        try:
-            if metaclass_of_grammar_rule is None:
-                metaclass_of_grammar_rule = metamodel[model_obj.__class__.__name__]
-        except KeyError as e:
-            raise TextXSemanticError(
-                f'Unknown meta-class "{model_obj.__class__.__name__}".'
-            ) from e
-
-        if metaclass_of_grammar_rule._tx_type is RULE_MATCH:
-            # Object processors for match rules are already called
-            # in `process_match`
-            return
+        if isinstance(node, Terminal):
+            return process_terminal(node)
+        stack = [process_node(node)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            else:
+                stack.append(process_node(child))
+        return values.pop()
 
-        many = [MULT_ONEORMORE, MULT_ZEROORMORE]
+    return construct(parse_tree), pos_rule_dict
 
-        # return value of obj_processor
-        return_value_grammar = None
-        return_value_current = None
 
-        # enter recursive visit of attributes only, if the class of the
-        # object being processed is a meta class of the current meta model
-        if model_obj.__class__.__name__ in metamodel:
-            if hasattr(model_obj, "_tx_fqn"):
-                current_metaclass_of_obj = metamodel[model_obj._tx_fqn]
-            else:
-                # fallback (not used - unsure if this case is required...):
-                current_metaclass_of_obj = metamodel[model_obj.__class__.__name__]
-            assert current_metaclass_of_obj is not None
-
-            for metaattr in current_metaclass_of_obj._tx_attrs.values():
-                # If attribute is base type or containment reference go down
-                if metaattr.cont:
-                    attr = getattr(model_obj, metaattr.name)
-                    if attr is not None:
-                        if metaattr.mult in many:
-                            for idx, obj in enumerate(attr):
-                                if obj is not None:
-                                    result = call_obj_processors(
-                                        metamodel, obj, metaattr.cls
-                                    )
-                                    if result is not None:
-                                        attr[idx] = result
-                        else:
-                            result = call_obj_processors(metamodel, attr, metaattr.cls)
-                            if result is not None:
-                                setattr(model_obj, metaattr.name, result)
+def call_obj_processors(metamodel, model, obj=None, metaclass_of_grammar_rule=None):
+    """
+    Depth-first model object processing using an explicit stack of
+    `process_obj` generators. If `obj` is given, only `obj` and its contained
+    objects are processed.
+    """
+    results = []
+
+    def location(obj):
+        # Line and column are computed by `metamodel.process` only if an
+        # error is reported.
+        return {
+            "position": obj._tx_position,
+            "nchar": obj._tx_position_end - obj._tx_position,
+            "filename": model._tx_filename,
+            "parser": model._tx_parser,
+        }
+
+    stack = [
+        process_obj(
+            metamodel,
+            model if obj is None else obj,
+            results,
+            location,
+            metaclass_of_grammar_rule,
+        )
+    ]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+        else:
+            obj, metaclass_of_grammar_rule = child
+            stack.append(
+                process_obj(metamodel, obj, results, location, metaclass_of_grammar_rule)
+            )
+    return results.pop()
 
-            if (
-                current_metaclass_of_obj._tx_fqn != metaclass_of_grammar_rule._tx_fqn
-                and metamodel.has_obj_processor(current_metaclass_of_obj.__name__)
-            ):
-                # This can happen if grammar rule is abstract or if model is
-                # modified (e.g. expression reduction)
-                return_value_current = metamodel.process(
-                    model_obj,
-                    current_metaclass_of_obj.__name__,
-                    **get_location(model_obj),
-                )
 
-        # call obj_proc of rule found in grammar
-        if metamodel.has_obj_processor(metaclass_of_grammar_rule.__name__):
-            loc = get_location(model_obj)
-            return_value_grammar = metamodel.process(
-                model_obj, metaclass_of_grammar_rule.__name__, **loc
+def process_obj(metamodel, model_obj, results, location, metaclass_of_grammar_rule=None):
+    """
+    Calls object processors for a model object after processing its
+    contained objects and appends the result to `results`. This is a
+    generator which yields the contained objects (with the meta-class of
+    the containing attribute, see `call_obj_processors`). After a
+    contained object is yielded the result of its processing is on top of
+    `results`.
+    """
+    try:
+        if metaclass_of_grammar_rule is None:
+            metaclass_of_grammar_rule = metamodel[model_obj.__class__.__name__]
+    except KeyError as e:
+        raise TextXSemanticError(
+            f'Unknown meta-class "{model_obj.__class__.__name__}".'
+        ) from e
+
+    if metaclass_of_grammar_rule._tx_type is RULE_MATCH:
+        # Object processors for match rules are already called
+        # in `process_match`
+        results.append(None)
+        return
+
+    many = [MULT_ONEORMORE, MULT_ZEROORMORE]
+
+    # return value of obj_processor
+    return_value_grammar = None
+    return_value_current = None
+
+    # enter recursive visit of attributes only, if the class of the
+    # object being processed is a meta class of the current meta model
+    if model_obj.__class__.__name__ in metamodel:
+        if hasattr(model_obj, "_tx_fqn"):
+            current_metaclass_of_obj = metamodel[model_obj._tx_fqn]
+        else:
+            # fallback (not used - unsure if this case is required...):
+            current_metaclass_of_obj = metamodel[model_obj.__class__.__name__]
+        assert current_metaclass_of_obj is not None
+
+        for metaattr in current_metaclass_of_obj._tx_attrs.values():
+            # If attribute is containment reference go down. Object
+            # processors for match rules are already called in
+            # `process_match`.
+            if metaattr.cont and metaattr.cls._tx_type is not RULE_MATCH:
+                attr = getattr(model_obj, metaattr.name)
+                if attr is not None:
+                    if metaattr.mult in many:
+                        for idx, obj in enumerate(attr):
+                            if obj is not None:
+                                yield obj, metaattr.cls
+                                result = results.pop()
+                                if result is not None:
+                                    attr[idx] = result
+                    else:
+                        yield attr, metaattr.cls
+                        result = results.pop()
+                        if result is not None:
+                            setattr(model_obj, metaattr.name, result)
+
+        if (
+            current_metaclass_of_obj._tx_fqn != metaclass_of_grammar_rule._tx_fqn
+            and metamodel.has_obj_processor(current_metaclass_of_obj.__name__)
+        ):
+            # This can happen if grammar rule is abstract or if model is
+            # modified (e.g. expression reduction)
+            return_value_current = metamodel.process(
+                model_obj,
+                current_metaclass_of_obj.__name__,
+                **location(model_obj),
             )
 
-        # both obj_processors are called, if two different processors
-        # are defined for the object metaclass and the grammar metaclass
-        # (can happen with type==RULE_ABSTRACT):
-        # e.g.
-        #   Base: Special1|Special2;
-        #   RuleCurrentlyChecked: att_to_be_checked=[Base]
-        # with object processors defined for Base, Special1, and Special2.
-        #
-        # Both processors are called, but for the return value the
-        # obj_processor corresponding to the object (e.g. of type Special1)
-        # dominates over the obj_processor of the grammar rule (Base).
-        #
-        # The order they are called is: first object (e.g., Special1), then
-        # the grammar based metaclass object processor (e.g., Base).
-        if return_value_current is not None:
-            return return_value_current
-        else:
-            return return_value_grammar  # may be None
+    # call obj_proc of rule found in grammar
+    if metamodel.has_obj_processor(metaclass_of_grammar_rule.__name__):
+        loc = location(model_obj)
+        return_value_grammar = metamodel.process(
+            model_obj, metaclass_of_grammar_rule.__name__, **loc
+        )
+
+    # both obj_processors are called, if two different processors
+    # are defined for the object metaclass and the grammar metaclass
+    # (can happen with type==RULE_ABSTRACT):
+    # e.g.
+    #   Base: Special1|Special2;
+    #   RuleCurrentlyChecked: att_to_be_checked=[Base]
+    # with object processors defined for Base, Special1, and Special2.
+    #
+    # Both processors are called, but for the return value the
+    # obj_processor corresponding to the object (e.g. of type Special1)
+    # dominates over the obj_processor of the grammar rule (Base).
+    #
+    # The order they are called is: first object (e.g., Special1), then
+    # the grammar based metaclass object processor (e.g., Base).
+    if return_value_current is not None:
+        results.append(return_value_current)
+    else:
+        results.append(return_value_grammar)  # may be None
+
+
+def finish_model(
+    parser,
+    model,
+    file_name=None,
+    pre_ref_resolution_callback=None,
+    is_main_model=True,
+    encoding="utf-8",
+    pos_rule_dict=None,
+):
+    """
+    Resolves references and calls object processors of the model constructed
+    from the parse tree (see parse_tree_to_objgraph) or loaded from the model
+    cache.
+    """
 
-    # load model from file (w/o reference resolution)
-    # Note: if an exception happens here, the model was not yet
-    # added to any repository. Thus, we have no special exception
-    # safety handling at this point...
-    model = process_node(parse_tree)
+    metamodel = parser.metamodel
+    stats = parser._stats
+    pos_crossref_list = []
 
     # Now, the initial version of the model is created.
     # We catch any exceptions here, to clean up cached models
@@ -894,6 +1403,9 @@ def parse_tree_to_objgraph(
             model._tx_metamodel = metamodel
             # mark model as "model being constructed"
             _start_model_construction(model)
+            if stats is not None:
+                stats.crossrefs += len(parser._crossrefs)
+                model._tx_stats = stats
         except AttributeError:
             # model is of some immutable type
             is_immutable_obj = True
@@ -905,27 +1417,28 @@ def parse_tree_to_objgraph(
         if hasattr(model, "_tx_metamodel"):
             assert hasattr(model, "_tx_model_params")
 
-        # Load all imported models (e.g. using importURI)
-        # based on the maker `ModelLoader` found in the
-        # defined scope providers:
-        for scope_provider in metamodel.scope_providers.values():
-            from textx.scoping import ModelLoader
-
-            if isinstance(scope_provider, ModelLoader):
-                scope_provider.load_models(model, encoding=encoding)
-
-        # Load all imported models based on the maker
-        # `ModelLoader` directly attached to model references
-        # (e.g. in case of RREL expressions defined in the grammar):
-        for crossref in parser._crossrefs:
-            crossref = crossref[2]
-            if crossref.scope_provider is not None:
+        with _phase(stats, "imports"):
+            # Load all imported models (e.g. using importURI)
+            # based on the maker `ModelLoader` found in the
+            # defined scope providers:
+            for scope_provider in metamodel.scope_providers.values():
                 from textx.scoping import ModelLoader
 
-                scope_provider = crossref.scope_provider
                 if isinstance(scope_provider, ModelLoader):
                     scope_provider.load_models(model, encoding=encoding)
 
+            # Load all imported models based on the maker
+            # `ModelLoader` directly attached to model references
+            # (e.g. in case of RREL expressions defined in the grammar):
+            for crossref in parser._crossrefs:
+                crossref = crossref[2]
+                if crossref.scope_provider is not None:
+                    from textx.scoping import ModelLoader
+
+                    scope_provider = crossref.scope_provider
+                    if isinstance(scope_provider, ModelLoader):
+                        scope_provider.load_models(model, encoding=encoding)
+
         if not is_immutable_obj:
             model._tx_reference_resolver = ReferenceResolver(
                 parser, model, pos_crossref_list
@@ -933,46 +1446,29 @@ def parse_tree_to_objgraph(
             model._tx_parser = parser
 
         if is_main_model:
-            models = get_included_models(model)
-            try:
+
+            def models_in_construction():
                 # filter out all models w/o resolver:
-                models = list(
-                    filter(lambda x: hasattr(x, "_tx_reference_resolver"), models)
-                )
+                return [
+                    m
+                    for m in get_included_models(model)
+                    if hasattr(m, "_tx_reference_resolver")
+                ]
 
-                resolved_count = 1
-                unresolved_count = 1
-                while unresolved_count > 0 and resolved_count > 0:
-                    resolved_count = 0
-                    unresolved_count = 0
-                    # print("***RESOLVING {} models".format(len(models)))
-                    for m in models:
-                        (
-                            resolved_count_for_this_model,
-                            delayed_crossrefs,
-                        ) = m._tx_reference_resolver.resolve_one_step()
-                        resolved_count += resolved_count_for_this_model
-                        unresolved_count += len(delayed_crossrefs)
-                    # print("DEBUG: delayed #:{} unresolved #:{}".
-                    #      format(unresolved_count,unresolved_count))
-                if unresolved_count > 0:
-                    error_text = "Unresolvable cross references:"
+            models = get_included_models(model)
+            try:
+                models = models_in_construction()
 
-                    for m in models:
-                        for _, _, delayed in m._tx_reference_resolver.delayed_crossrefs:
-                            line, col = parser.pos_to_linecol(delayed.position)
-                            error_text += (
-                                f' "{delayed.obj_name}" of class '
-                                f'"{delayed.cls.__name__}" at {(line, col)}'
-                            )
-                    raise TextXSemanticError(error_text, line=line, col=col)
+                with _phase(stats, "resolve"):
+                    _resolve_references(parser, models, new_models=models_in_construction)
 
                 for m in models:
                     assert not m._tx_reference_resolver.parser._inst_stack
 
                 # cleanup
                 for m in models:
-                    _end_model_construction(m)
+                    with _phase(getattr(m, "_tx_stats", None), "user_classes"):
+                        _end_model_construction(m)
 
                 # final check that everything went ok
                 for m in models:
@@ -983,7 +1479,19 @@ def parse_tree_to_objgraph(
                     # processors
                     if parser.debug:
                         parser.dprint("CALLING OBJECT PROCESSORS")
-                    call_obj_processors(m._tx_metamodel, m)
+                    with _phase(getattr(m, "_tx_stats", None), "obj_processors"):
+                        call_obj_processors(m._tx_metamodel, m)
+
+                for m in models:
+                    if m._tx_metamodel.release_parser_state:
+                        m._tx_parser.release()
+
+                if stats is not None:
+                    stats.imported.extend(
+                        m._tx_stats
+                        for m in models
+                        if m is not model and hasattr(m, "_tx_stats")
+                    )
 
             except:  # noqa
                 # remove all processed models from (global) repo (if present)
@@ -1011,6 +1519,139 @@ def parse_tree_to_objgraph(
     return model
 
 
+def _resolve_references(parser, models, invalidate_indexes=True, new_models=None):
+    """
+    Resolves the references of the given models which are constructed
+    together. Raises TextXSemanticError if some references can't be resolved.
+    If given, `new_models` is called after each pass and returns the models
+    being constructed, which may include models loaded by scope providers
+    during the pass (e.g. lazily imported models). These are added to
+    `models` and resolved together with them.
+    """
+    # Unresolved references looked at by scope providers are
+    # collected in a common log, as they may belong to any of the
+    # models being constructed.
+    waits_log = []
+    for m in models:
+        m._tx_reference_resolver.waits_log = waits_log
+
+    resolved_count = 1
+    unresolved_count = 1
+    pass_count = 0
+    added_models = False
+    while (unresolved_count > 0 and resolved_count > 0) or added_models:
+        pass_count += 1
+        resolved_count = 0
+        unresolved_count = 0
+        # print("***RESOLVING {} models".format(len(models)))
+        for m in models:
+            (
+                resolved_count_for_this_model,
+                delayed_crossrefs,
+            ) = m._tx_reference_resolver.resolve_one_step(
+                invalidate_indexes=invalidate_indexes
+            )
+            resolved_count += resolved_count_for_this_model
+            unresolved_count += len(delayed_crossrefs)
+        added_models = False
+        if new_models is not None:
+            model_ids = {id(m) for m in models}
+            for m in new_models():
+                if id(m) not in model_ids:
+                    m._tx_reference_resolver.waits_log = waits_log
+                    models.append(m)
+                    added_models = True
+        # print("DEBUG: delayed #:{} unresolved #:{}".
+        #      format(unresolved_count,unresolved_count))
+    if parser.debug or parser._stats is not None:
+        retry_count = sum(m._tx_reference_resolver.retry_count for m in models)
+        if parser._stats is not None:
+            parser._stats.resolution_passes += pass_count
+            parser._stats.postponed_retries = retry_count
+        if parser.debug:
+            parser.dprint(
+                f"REFERENCE RESOLUTION: {pass_count} passes, "
+                f"{retry_count} retries of postponed references"
+            )
+    if unresolved_count > 0:
+        error_text = "Unresolvable cross references:"
+
+        for m in models:
+            for _, _, delayed in m._tx_reference_resolver.delayed_crossrefs:
+                line, col = parser.pos_to_linecol(delayed.position)
+                error_text += (
+                    f' "{delayed.obj_name}" of class '
+                    f'"{delayed.cls.__name__}" at {(line, col)}'
+                )
+        raise TextXSemanticError(error_text, line=line, col=col)
+
+
+def user_loading_class(user_class):
+    """
+    Creates a subclass of the given user class. Objects of the user class are
+    instances of this class while the model is loaded (their initialization
+    is postponed until all references are resolved). Their attributes are
+    collected in `_tx_obj_attrs` keyed by the object id and set on the objects
+    at the end of the model construction.
+
+    The user class itself is never modified so models using the same
+    meta-model can be loaded concurrently and user class objects which are
+    not being loaded are not affected.
+    """
+    obj_attrs = {}
+
+    def __getattribute__(obj, name):
+        attrs = obj_attrs.get(id(obj))
+        if attrs is not None:
+            if name == "__dict__":
+                return attrs
+            if name in attrs:
+                return attrs[name]
+        return user_class.__getattribute__(obj, name)
+
+    def __setattr__(obj, name, value):
+        attrs = obj_attrs.get(id(obj))
+        if attrs is None:
+            user_class.__setattr__(obj, name, value)
+        else:
+            attrs[name] = value
+
+    def __delattr__(obj, name):
+        attrs = obj_attrs.get(id(obj))
+        if attrs is None or name not in attrs:
+            user_class.__delattr__(obj, name)
+        else:
+            del attrs[name]
+
+    # Empty __slots__ keeps the object layout so that objects can be switched
+    # between the user class and this class.
+    return type(user_class)(
+        user_class.__name__,
+        (user_class,),
+        {
+            "__slots__": (),
+            "__module__": user_class.__module__,
+            "__qualname__": user_class.__qualname__,
+            "__getattribute__": __getattribute__,
+            "__setattr__": __setattr__,
+            "__delattr__": __delattr__,
+            "_tx_user_class": user_class,
+            "_tx_obj_attrs": obj_attrs,
+        },
+    )
+
+
+def discard_user_obj_attrs(objs):
+    """
+    Discards the attributes collected for the given user class objects which
+    are still being loaded (e.g. if the model construction failed).
+    """
+    for obj in objs:
+        obj_attrs = getattr(type(obj), "_tx_obj_attrs", None)
+        if obj_attrs is not None:
+            obj_attrs.pop(id(obj), None)
+
+
 def _start_model_construction(model):
     """
     Start model construction (internal design: use
@@ -1028,46 +1669,69 @@ def _end_model_construction(model):
     """
     del model._tx_reference_resolver
 
-    # At this point we should restore original user attr methods as
-    # attribute collection is over and we should switch back to
-    # "normal" behavior
+    # At this point attribute collection is over and we should switch
+    # objects of user classes back to "normal" behavior.
     if hasattr(model, "_tx_parser"):  # not for, e.g., str
-        the_parser = model._tx_parser
-        the_parser._restore_user_attr_methods()
+        _init_user_class_objs(model._tx_parser)
 
-        # If the the attributes to the class have been
-        # collected in _tx_obj_attrs we need to do a proper
-        # initialization at this point.
-        for obj in the_parser._user_class_inst:
-            try:
-                # Get the attributes which have been collected
-                # in metamodel.obj and remove them from this dict.
-                attrs = obj.__class__._tx_obj_attrs.pop(id(obj))
 
-                # First try to apply attributes directly. It might
-                # not be possible for some (e.g. __slots__ are used)
-                for name, value in attrs.items():
-                    with suppress(Exception):
-                        # Not possible to set the attribute
-                        setattr(obj, name, value)
+def _init_user_class_objs(parser):
+    """
+    Initializes the user class objects created by the given parser.
+    """
+    # The attributes of the user class objects have been
+    # collected in _tx_obj_attrs of their loading class, we
+    # need to do a proper initialization at this point.
+    for obj in parser._user_class_inst:
+        try:
+            # Get the attributes which have been collected
+            # and restore the user class of the object.
+            loading_class = type(obj)
+            attrs = loading_class._tx_obj_attrs.pop(id(obj))
+            object.__setattr__(obj, "__class__", loading_class._tx_user_class)
+
+            # First try to apply attributes directly. It might
+            # not be possible for some (e.g. __slots__ are used)
+            for name, value in attrs.items():
+                with suppress(Exception):
+                    # Not possible to set the attribute
+                    setattr(obj, name, value)
+
+            # We shall only pass to __init__ attributes that are
+            # defined by the meta-model, and `parent` if applicable
+            attrs = {
+                k: v
+                for k, v in attrs.items()
+                if k in obj.__class__._tx_attrs or k == "parent"
+            }
+
+            # Call constructor for custom initialization
+            obj.__init__(**attrs)
+
+        except TypeError as e:
+            # Add class name information in case of wrong
+            # constructor parameters
+            e.args += (f"for class {obj.__class__.__name__}",)
+            parser.dprint(traceback.print_exc())
+            raise e
+
+
+def _may_modify_model(scope_provider):
+    """
+    Scope providers shipped with textX never add or remove model objects.
+    User supplied scope providers may do so (see #167), thus indexes built
+    from the model must not be reused after calling them.
+    """
 
-                # We shall only pass to __init__ attributes that are
-                # defined by the meta-model, and `parent` if applicable
-                attrs = {
-                    k: v
-                    for k, v in attrs.items()
-                    if k in obj.__class__._tx_attrs or k == "parent"
-                }
+    def is_builtin(sp):
+        return type(sp).__module__.startswith("textx.")
 
-                # Call constructor for custom initialization
-                obj.__init__(**attrs)
+    while isinstance(scope_provider, ImportURI) and is_builtin(scope_provider):
+        scope_provider = scope_provider.scope_provider
+    return not is_builtin(scope_provider)
 
-            except TypeError as e:
-                # Add class name information in case of wrong
-                # constructor parameters
-                e.args += (f"for class {obj.__class__.__name__}",)
-                the_parser.dprint(traceback.print_exc())
-                raise e
+
+_default_scope_provider = DefaultScopeProvider()
 
 
 def _remove_all_affected_models_in_construction(model):
@@ -1084,6 +1748,94 @@ def _remove_all_affected_models_in_construction(model):
         filter(lambda x: hasattr(x, "_tx_reference_resolver"), all_affected_models)
     )
     remove_models_from_repositories(all_affected_models, models_to_be_removed)
+    for m in models_to_be_removed:
+        if hasattr(m, "_tx_parser"):
+            m._tx_parser._discard_user_obj_attrs()
+
+
+class ModelStats:
+    """
+    Wall time and counters of the phases of loading a model. Collected if the
+    meta-model is created with `stats=True` and available as the `_tx_stats`
+    attribute of the model.
+
+    Attributes:
+        times (dict): wall time in seconds for each phase (see PHASES). The
+            "imports" phase includes the loading of the imported models.
+        objects (int): the number of model objects created.
+        crossrefs (int): the number of references to resolve.
+        resolution_passes (int): the number of reference resolution passes.
+            The references of the models loaded together are resolved
+            together, the passes are counted for the model loaded first.
+        postponed_retries (int): the number of times postponed references
+            were tried again.
+        imported (list): the stats of the models loaded together with the
+            model (e.g. imported models).
+    """
+
+    PHASES = (
+        "parse",
+        "construct",
+        "imports",
+        "resolve",
+        "user_classes",
+        "obj_processors",
+        "model_processors",
+    )
+
+    def __init__(self):
+        self.times = dict.fromkeys(self.PHASES, 0.0)
+        self.objects = 0
+        self.crossrefs = 0
+        self.resolution_passes = 0
+        self.postponed_retries = 0
+        self.imported = []
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Adds the wall time of the `with` block to the given phase.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += perf_counter() - start
+
+    def total(self):
+        """
+        Returns the stats of this model and the models loaded together with
+        it added up. The time of the "imports" phase is the time of this model
+        only since it already includes the loading of the imported models.
+        """
+        total = ModelStats()
+        for stats in [self, *self.imported]:
+            for name, time in stats.times.items():
+                if name != "imports" or stats is self:
+                    total.times[name] += time
+            total.objects += stats.objects
+            total.crossrefs += stats.crossrefs
+            total.resolution_passes += stats.resolution_passes
+            total.postponed_retries += stats.postponed_retries
+        return total
+
+    def as_dict(self):
+        return {
+            "times": dict(self.times),
+            "objects": self.objects,
+            "crossrefs": self.crossrefs,
+            "resolution_passes": self.resolution_passes,
+            "postponed_retries": self.postponed_retries,
+            "imported": [stats.as_dict() for stats in self.imported],
+        }
+
+
+def _phase(stats, name):
+    """
+    Returns a context manager which adds the time of its block to the given
+    phase of the stats, if stats are collected.
+    """
+    return nullcontext() if stats is None else stats.phase(name)
 
 
 class ReferenceResolver:
@@ -1097,122 +1849,229 @@ class ReferenceResolver:
         self.model = model
         self.pos_crossref_list = pos_crossref_list  # tool support
         self.delayed_crossrefs = []
+        self._name_index = None
+        self._fqn_index = None
+
+        # Crossrefs of objects which do not belong to this model are kept
+        # aside and are never resolved by this resolver.
+        self._crossrefs = []
+        self._foreign_crossrefs = []
+
+        # Number of unresolved crossrefs per (id(obj), attr name) and per
+        # id(obj). Entries are removed as soon as references get resolved.
+        self._pending_attrs = {}
+        self._pending_objs = {}
+        self.add_crossrefs(parser._crossrefs)
+
+        # Unresolved references a postponed crossref was waiting on, keyed
+        # by id(crossref). The entries are (pending dict, key) pairs (see
+        # has_unresolved_crossrefs). `waits_log` collects them while a scope
+        # provider is running and may be shared between the resolvers of all
+        # models constructed together.
+        self._waiting_on = {}
+        self.waits_log = []
+        self.retry_count = 0
+
+    def add_crossrefs(self, crossrefs):
+        """
+        Adds crossrefs (obj, metaattr, ObjCrossRef) to be resolved.
+        """
+        for crossref in crossrefs:
+            obj, attr, _ = crossref
+            if get_model(obj) is not self.model:
+                self._foreign_crossrefs.append(crossref)
+                continue
+            self._crossrefs.append(crossref)
+            key = (id(obj), attr.name)
+            self._pending_attrs[key] = self._pending_attrs.get(key, 0) + 1
+            self._pending_objs[id(obj)] = self._pending_objs.get(id(obj), 0) + 1
+
+    @property
+    def name_index(self):
+        """
+        NameIndex of the model being resolved. It is built on first use and
+        rebuilt after it has been invalidated.
+        """
+        if self._name_index is None:
+            self._name_index = NameIndex(self.model)
+        return self._name_index
+
+    @property
+    def fqn_index(self):
+        """
+        FQNIndex of the model being resolved. It is built on first use and
+        rebuilt after it has been invalidated.
+        """
+        if self._fqn_index is None:
+            self._fqn_index = FQNIndex(self.model)
+        return self._fqn_index
+
+    def add_object(self, obj):
+        """
+        Updates the indexes after `obj` has been added to the model.
+        """
+        if self._name_index is not None:
+            self._name_index.add(obj)
+        if self._fqn_index is not None:
+            self._fqn_index.add(obj)
+
+    def invalidate_indexes(self):
+        """
+        Drops the name and FQN indexes. Must be called if objects are added to
+        or removed from the model while references are being resolved.
+        """
+        self._name_index = None
+        self._fqn_index = None
 
     def has_unresolved_crossrefs(self, obj, attr_name=None):
         """
         Args:
             obj: has this object unresolved crossrefs in its fields
             (non recursively)
+            attr_name: if given, only this field is checked
 
         Returns:
             True (has unresolved crossrefs) or False (else)
         """
         if get_model(obj) != self.model:
-            return get_model(obj)._tx_reference_resolver.has_unresolved_crossrefs(obj)
+            return get_model(obj)._tx_reference_resolver.has_unresolved_crossrefs(
+                obj, attr_name
+            )
+
+        if attr_name:
+            pending, key = self._pending_attrs, (id(obj), attr_name)
         else:
-            for crossref_obj, attr, _ in self.parser._crossrefs:
-                if crossref_obj is obj and ((not attr_name) or attr_name == attr.name):
-                    return True
-            return False
+            pending, key = self._pending_objs, id(obj)
+        if key in pending:
+            self.waits_log.append((pending, key))
+            return True
+        return False
+
+    def _mark_resolved(self, obj, attr):
+        for pending, key in (
+            (self._pending_attrs, (id(obj), attr.name)),
+            (self._pending_objs, id(obj)),
+        ):
+            if pending[key] == 1:
+                del pending[key]
+            else:
+                pending[key] -= 1
+
+    def _get_waits(self, obj, attr):
+        """
+        Returns the unresolved references the last scope provider call was
+        waiting on. If the provider looked at unresolved references of `obj`
+        itself, an empty list is returned, and the crossref will be retried
+        in every pass.
+        """
+        own_keys = ((id(obj), attr.name), id(obj))
+        if any(key in own_keys for _, key in self.waits_log):
+            return []
+        return list(self.waits_log)
 
-    def resolve_one_step(self):
+    def resolve_one_step(self, invalidate_indexes=True):
         """
         Resolves model references.
+        :param invalidate_indexes: drop the indexes before resolving as the
+               model may have been changed by scope providers of other models
         """
         metamodel = self.parser.metamodel
 
-        current_crossrefs = self.parser._crossrefs
         # print("DEBUG: Current crossrefs #: {}".
-        #      format(len(current_crossrefs)))
+        #      format(len(self._crossrefs)))
         new_crossrefs = []
         self.delayed_crossrefs = []
         resolved_crossref_count = 0
 
+        # The model may have been changed by scope providers of other
+        # models in the previous pass.
+        if invalidate_indexes:
+            self.invalidate_indexes()
+
         # -------------------------
         # start of resolve-loop
         # -------------------------
-        default_scope = DefaultScopeProvider()
-        for obj, attr, crossref in current_crossrefs:
-            if get_model(obj) == self.model:
-                attr_value = getattr(obj, attr.name)
-                attr_refs = [
-                    obj.__class__.__name__ + "." + attr.name,
-                    "*." + attr.name,
-                    obj.__class__.__name__ + ".*",
-                    "*.*",
-                ]
-                if crossref.scope_provider is not None:
-                    resolved = crossref.scope_provider(obj, attr, crossref)
-                else:
-                    for attr_ref in attr_refs:
-                        if attr_ref in metamodel.scope_providers:
-                            if self.parser.debug:
-                                self.parser.dprint(f" FOUND {attr_ref}")
-                            resolved = metamodel.scope_providers[attr_ref](
-                                obj, attr, crossref
-                            )
-                            break
-                    else:
-                        resolved = default_scope(obj, attr, crossref)
-
-                # Collect cross-references for textx-tools
-                if (
-                    resolved is not None
-                    and type(resolved) is not Postponed
-                    and metamodel.textx_tools_support
-                ):
-                    self.pos_crossref_list.append(
-                        RefRulePosition(
-                            name=crossref.obj_name,
-                            ref_pos_start=crossref.position,
-                            ref_pos_end=crossref.position + len(resolved.name),
-                            def_file_name=get_model(resolved)._tx_filename,
-                            def_pos_start=resolved._tx_position,
-                            def_pos_end=resolved._tx_position_end,
-                        )
+        for obj, attr, crossref in self._crossrefs:
+            waiting_on = self._waiting_on.pop(id(crossref), None)
+            if waiting_on is not None:
+                if waiting_on and all(key in pending for pending, key in waiting_on):
+                    # nothing this crossref was waiting on got resolved
+                    self._waiting_on[id(crossref)] = waiting_on
+                    self.delayed_crossrefs.append((obj, attr, crossref))
+                    new_crossrefs.append((obj, attr, crossref))
+                    continue
+                self.retry_count += 1
+
+            attr_value = getattr(obj, attr.name)
+            scope_provider = crossref.scope_provider
+            if scope_provider is None:
+                scope_provider = metamodel._get_scope_provider(obj.__class__, attr.name)
+                if scope_provider is None:
+                    scope_provider = _default_scope_provider
+            if self.parser.debug:
+                self.parser.dprint(f" SCOPE PROVIDER {scope_provider}")
+            self.waits_log.clear()
+            resolved = scope_provider(obj, attr, crossref)
+            if _may_modify_model(scope_provider):
+                self.invalidate_indexes()
+
+            # Collect cross-references for textx-tools
+            if (
+                resolved is not None
+                and type(resolved) is not Postponed
+                and metamodel.textx_tools_support
+            ):
+                self.pos_crossref_list.append(
+                    RefRulePosition(
+                        name=crossref.obj_name,
+                        ref_pos_start=crossref.position,
+                        ref_pos_end=crossref.position + len(resolved.name),
+                        def_file_name=get_model(resolved)._tx_filename,
+                        def_pos_start=resolved._tx_position,
+                        def_pos_end=resolved._tx_position_end,
                     )
+                )
 
-                # As a fall-back search builtins if given
-                if (
-                    resolved is None
-                    and metamodel.builtins
-                    and crossref.obj_name in metamodel.builtins
-                ):
-                    from textx import textx_isinstance
+            # As a fall-back search builtins if given
+            if (
+                resolved is None
+                and metamodel.builtins
+                and crossref.obj_name in metamodel.builtins
+            ):
+                from textx import textx_isinstance
 
-                    if textx_isinstance(
-                        metamodel.builtins[crossref.obj_name], crossref.cls
-                    ):
-                        resolved = metamodel.builtins[crossref.obj_name]
-
-                if resolved is None:
-                    line, col = self.parser.pos_to_linecol(crossref.position)
-                    raise TextXSemanticError(
-                        message=f'Unknown object "{crossref.obj_name}" of class '
-                        f'"{crossref.cls.__name__}"',
-                        line=line,
-                        col=col,
-                        err_type=UNKNOWN_OBJ_ERROR,
-                        expected_obj_cls=crossref.cls,
-                        filename=self.model._tx_filename,
-                    )
+                if textx_isinstance(metamodel.builtins[crossref.obj_name], crossref.cls):
+                    resolved = metamodel.builtins[crossref.obj_name]
 
-                if type(resolved) is Postponed:
-                    self.delayed_crossrefs.append((obj, attr, crossref))
-                    new_crossrefs.append((obj, attr, crossref))
-                else:
-                    resolved_crossref_count += 1
-                    if attr.mult in [MULT_ONEORMORE, MULT_ZEROORMORE]:
-                        attr_value.append(resolved)
-                    else:
-                        setattr(obj, attr.name, resolved)
-            else:  # crossref not in model
+            if resolved is None:
+                line, col = self.parser.pos_to_linecol(crossref.position)
+                raise TextXSemanticError(
+                    message=f'Unknown object "{crossref.obj_name}" of class '
+                    f'"{crossref.cls.__name__}"',
+                    line=line,
+                    col=col,
+                    err_type=UNKNOWN_OBJ_ERROR,
+                    expected_obj_cls=crossref.cls,
+                    filename=self.model._tx_filename,
+                )
+
+            if type(resolved) is Postponed:
+                self._waiting_on[id(crossref)] = self._get_waits(obj, attr)
+                self.delayed_crossrefs.append((obj, attr, crossref))
                 new_crossrefs.append((obj, attr, crossref))
+            else:
+                resolved_crossref_count += 1
+                if attr.mult in [MULT_ONEORMORE, MULT_ZEROORMORE]:
+                    attr_value.append(resolved)
+                else:
+                    setattr(obj, attr.name, resolved)
+                self._mark_resolved(obj, attr)
         # -------------------------
         # end of resolve-loop
         # -------------------------
-        # store cross-refs from other models in the parser list (for later
-        # processing)
-        self.parser._crossrefs = new_crossrefs
+        self._crossrefs = new_crossrefs
+        # keep the parser list up to date (cross-refs from other models are
+        # kept there for later processing)
+        self.parser._crossrefs = new_crossrefs + self._foreign_crossrefs
         # print("DEBUG: Next crossrefs #: {}".format(len(new_crossrefs)))
         return (resolved_crossref_count, self.delayed_crossrefs)
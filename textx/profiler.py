@@ -0,0 +1,187 @@
+"""
+Per-rule profiling of model parsing.
+"""
+
+from time import perf_counter
+
+from arpeggio import Match, NoMatch, StrMatch
+
+
+class RuleStats:
+    """
+    Parsing stats of a grammar rule (see ParseProfiler).
+
+    Attributes:
+        name (str): the rule name. Assignments are named by the rule and the
+            attribute, e.g. `Entity.name (__asgn_plain)`.
+        attempts (int): how many times the rule was tried.
+        matches (int): how many times the rule matched.
+        fails (int): how many times the rule didn't match. A high number of
+            fails indicates backtracking.
+        memo_hits (int): how many attempts used a memoized result (only if
+            the meta-model is created with memoization).
+        time (float): time in seconds spent in the rule, including the nested
+            rules. Nested attempts of a recursive rule are not counted twice.
+        own_time (float): time in seconds spent in the rule excluding the
+            nested rules.
+    """
+
+    __slots__ = (
+        "name",
+        "attempts",
+        "matches",
+        "fails",
+        "memo_hits",
+        "time",
+        "own_time",
+        "_depth",
+    )
+
+    def __init__(self, name):
+        self.name = name
+        self.attempts = 0
+        self.matches = 0
+        self.fails = 0
+        self.memo_hits = 0
+        self.time = 0.0
+        self.own_time = 0.0
+        # The number of attempts of the rule being parsed
+        self._depth = 0
+
+    def as_dict(self):
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if not name.startswith("_")
+        }
+
+
+class ParseProfiler:
+    """
+    Collects parsing stats for each rule of the given meta-model while models
+    are parsed inside the `with` block:
+
+        with ParseProfiler(metamodel) as profiler:
+            metamodel.model_from_file('model.ent')
+        print(profiler.report())
+
+    The parsing rules are shared by all models of the meta-model, so models
+    parsed by other threads in the meantime are profiled too. Models loaded
+    from the model cache are not parsed.
+    """
+
+    def __init__(self, metamodel):
+        self.metamodel = metamodel
+        self.rules = {}
+        self._profiled = []
+        # Time spent in the nested rules of the rules being parsed
+        self._nested_times = []
+
+    def __enter__(self):
+        parser = self.metamodel._parser_blueprint
+        visited = set()
+        # The parser model is a sequence of the root rule and EOF
+        for rule in parser.parser_model.nodes:
+            self._profile_rules(rule, None, visited)
+        if parser.comments_model is not None:
+            self._profile_rules(parser.comments_model, None, visited)
+        return self
+
+    def __exit__(self, *args):
+        for rule in self._profiled:
+            del rule.parse
+        self._profiled = []
+
+    def _profile_rules(self, rule, rule_name, visited):
+        to_visit = [(rule, rule_name)]
+        while to_visit:
+            rule, rule_name = to_visit.pop()
+            if id(rule) in visited:
+                continue
+            visited.add(id(rule))
+            name = self._rule_name(rule, rule_name)
+            if rule.root and not rule.rule_name.startswith("__asgn"):
+                rule_name = rule.rule_name
+            if name is not None:
+                self._profile(rule, name)
+            to_visit.extend((node, rule_name) for node in reversed(rule.nodes))
+            if getattr(rule, "sep", None) is not None:
+                to_visit.append((rule.sep, rule_name))
+
+    @staticmethod
+    def _rule_name(rule, rule_name):
+        if rule.rule_name.startswith("__asgn"):
+            return f"{rule_name}.{rule._attr_name} ({rule.rule_name})"
+        if rule.root:
+            return rule.rule_name
+        if isinstance(rule, StrMatch):
+            return repr(rule.to_match)
+        if isinstance(rule, Match):
+            return rule.name
+        return None
+
+    def _profile(self, rule, name):
+        stats = self.rules.get(name)
+        if stats is None:
+            stats = self.rules[name] = RuleStats(name)
+        parse = rule.parse
+        nested_times = self._nested_times
+
+        def profiled_parse(parser):
+            stats.attempts += 1
+            if parser.memoization and parser.position in rule._result_cache:
+                stats.memo_hits += 1
+            nested_times.append(0.0)
+            stats._depth += 1
+            start = perf_counter()
+            try:
+                result = parse(parser)
+            except NoMatch:
+                stats.fails += 1
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                stats._depth -= 1
+                if not stats._depth:
+                    stats.time += elapsed
+                stats.own_time += elapsed - nested_times.pop()
+                if nested_times:
+                    nested_times[-1] += elapsed
+            stats.matches += 1
+            return result
+
+        rule.parse = profiled_parse
+        self._profiled.append(rule)
+
+    def hottest(self, count=None):
+        """
+        Returns the stats of the tried rules sorted by the time spent in the
+        rules themselves, the most expensive first.
+        """
+        rules = sorted(
+            (stats for stats in self.rules.values() if stats.attempts),
+            key=lambda stats: (stats.own_time, stats.attempts),
+            reverse=True,
+        )
+        return rules[:count]
+
+    def as_dict(self, count=None):
+        return [stats.as_dict() for stats in self.hottest(count)]
+
+    def report(self, count=None):
+        """
+        Returns the stats of the hottest rules as a text table.
+        """
+        rules = self.hottest(count)
+        width = max([len(stats.name) for stats in rules] + [4])
+        lines = [
+            f"{'Rule':<{width}} {'Attempts':>9} {'Matches':>9} {'Fails':>9}"
+            f" {'Memo hits':>9} {'Time ms':>9} {'Own ms':>9}"
+        ]
+        for stats in rules:
+            lines.append(
+                f"{stats.name:<{width}} {stats.attempts:>9} {stats.matches:>9}"
+                f" {stats.fails:>9} {stats.memo_hits:>9}"
+                f" {stats.time * 1000:>9.2f} {stats.own_time * 1000:>9.2f}"
+            )
+        return "\n".join(lines)
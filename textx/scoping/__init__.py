@@ -7,7 +7,14 @@
 
 import errno
 import glob
+import io
+import multiprocessing
 import os
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from os.path import abspath, exists, join
 
 
@@ -21,6 +28,141 @@ def metamodel_for_file_or_default_metamodel(filename, the_metamodel):
         return the_metamodel
 
 
+# Meta-models of the models constructed by a worker process, set by
+# _init_worker when the worker is started.
+_worker_metamodels = []
+
+
+def _init_worker(metamodels):
+    # Worker processes are forked so the meta-models with all registered
+    # processors are not pickled.
+    _worker_metamodels[:] = metamodels
+
+
+def _construct_model(metamodel_idx, filename, encoding, model_str=None):
+    """
+    Parses the given model file (or string) in a worker process and returns
+    the pickled object graph of the model before reference resolution (see
+    textx.cache.dump_constructed_model) or None if the model can't be
+    constructed because of an error in the model or the model can't be
+    pickled. In that case the model is loaded again in the main process which
+    reports the errors. Other errors are raised.
+
+    Returns:
+        The pickled model and the number of model cache hits and misses.
+    """
+    from textx.cache import dump_constructed_model
+    from textx.exceptions import TextXError
+    from textx.model import construct_model
+
+    metamodel = _worker_metamodels[metamodel_idx]
+    # Models given as strings are not cached
+    model_cache = metamodel.model_cache if filename else None
+    if model_cache is not None:
+        hits, misses = model_cache.hits, model_cache.misses
+    try:
+        if model_str is None:
+            with open(filename, encoding=encoding) as f:
+                model_str = f.read()
+        parser = metamodel._parser_blueprint.clone()
+        model = None
+        if model_cache is not None:
+            model = model_cache.load(parser, model_str, filename)
+        if model is None:
+            parser.parse(model_str, file_name=filename)
+            model, _ = construct_model(parser, parser.parse_tree[0])
+            if model_cache is not None:
+                model_cache.save(parser, model)
+    except (TextXError, OSError, UnicodeError):
+        constructed_model = None
+    else:
+        f = io.BytesIO()
+        try:
+            dump_constructed_model(parser, model, f)
+            constructed_model = f.getvalue()
+        except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+            # E.g. a lambda in a model object
+            constructed_model = None
+    if model_cache is None:
+        return constructed_model, 0, 0
+    return constructed_model, model_cache.hits - hits, model_cache.misses - misses
+
+
+def construct_models_in_workers(
+    metamodels, filenames, encoding, workers, model_strs=None
+):
+    """
+    Parses the given model files (or strings) in forked worker processes.
+    Only the `fork` start method is supported, so the workers get the
+    meta-models with all registered processors. Forking a process with
+    several threads is not safe (the forked process may e.g. inherit locks
+    held by other threads), so the models are not constructed by workers if
+    other threads are running.
+
+    Returns:
+        A list with the pickled model before reference resolution (see
+        _construct_model) for each file or None if the model was not
+        constructed by a worker (see _can_construct_in_worker).
+    """
+    constructed = [None] * len(filenames)
+    if (
+        "fork" not in multiprocessing.get_all_start_methods()
+        or threading.active_count() > 1
+    ):
+        return constructed
+    if model_strs is None:
+        model_strs = [None] * len(filenames)
+
+    to_construct = [
+        idx
+        for idx, the_metamodel in enumerate(metamodels)
+        if the_metamodel is not None and _can_construct_in_worker(the_metamodel)
+    ]
+    if len(to_construct) < 2:
+        return constructed
+
+    metamodel_idx = {}
+    for idx in to_construct:
+        metamodel_idx.setdefault(metamodels[idx], len(metamodel_idx))
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(to_construct)),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(list(metamodel_idx),),
+    ) as executor:
+        results = list(
+            executor.map(
+                _construct_model,
+                [metamodel_idx[metamodels[idx]] for idx in to_construct],
+                [filenames[idx] for idx in to_construct],
+                [encoding] * len(to_construct),
+                [model_strs[idx] for idx in to_construct],
+                chunksize=max(1, len(to_construct) // (workers * 4)),
+            )
+        )
+
+    for idx, (constructed_model, hits, misses) in zip(to_construct, results):
+        model_cache = metamodels[idx].model_cache
+        if model_cache is not None:
+            model_cache.hits += hits
+            model_cache.misses += misses
+        constructed[idx] = constructed_model
+    return constructed
+
+
+def _can_construct_in_worker(metamodel):
+    """
+    Models with user classes are initialized while the references are
+    resolved. Tool support needs the data collected while parsing.
+    """
+    return not (
+        metamodel.user_classes
+        or metamodel.user_classes_provider
+        or metamodel.textx_tools_support
+        or metamodel.debug
+    )
+
+
 # -----------------------------------------------------------------------------
 # Scope helper classes:
 # -----------------------------------------------------------------------------
@@ -40,14 +182,40 @@ class ModelRepository:
     model) pairs as dictionary.
     In case of some scoping providers the model-identifier is the absolute
     filename of the model.
+
+    If `max_models` is given, only that many most recently used models are
+    kept by the repository. The other models are evicted: the repository
+    keeps only a weak reference to them, so they are still found while they
+    are in use (e.g. referenced from another model) and are garbage
+    collected otherwise. A collected model is loaded again from its file
+    when it is needed. `evictions` and `reloads` count the evicted models and
+    the models loaded again after they were collected.
     """
 
-    def __init__(self):
+    def __init__(self, max_models=None):
         self.name_idx = 1
-        self.filename_to_model = {}
+        self.filename_to_model = OrderedDict()
+        # Models parsed by worker processes but not loaded yet, by filename
+        # (see GlobalModelRepository.load_models_using_filepattern)
+        self.constructed_models = {}
+        self.max_models = max_models
+        # Weak references to the evicted models, by filename
+        self.evicted_models = {}
+        # Filenames of the evicted models which were garbage collected
+        self.collected_models = set()
+        self.evictions = 0
+        self.reloads = 0
+        # Results of the file system lookups done while loading models (see
+        # GlobalModelRepository.invalidate_file_cache)
+        self.glob_cache = {}
+        self.exists_cache = {}
 
     def has_model(self, filename):
-        return abspath(filename) in self.filename_to_model
+        filename = abspath(filename)
+        return (
+            filename in self.filename_to_model
+            or self._evicted_model(filename) is not None
+        )
 
     def add_model(self, model):
         if model._tx_filename:
@@ -55,31 +223,89 @@ class ModelRepository:
         else:
             filename = f"builtin_model_{self.name_idx}"
             self.name_idx += 1
-        self.filename_to_model[filename] = model
+        self[filename] = model
 
     def remove_model(self, model):
         filename = None
-        for f, m in self.filename_to_model.items():
+        for f, m in self._items():
             if m == model:
                 filename = f
         if filename:
             # print("*** delete {}".format(filename))
-            del self.filename_to_model[filename]
+            self.filename_to_model.pop(filename, None)
+            self.evicted_models.pop(filename, None)
+
+    def _evicted_model(self, filename):
+        ref = self.evicted_models.get(filename)
+        return ref() if ref is not None else None
+
+    def _items(self):
+        items = list(self.filename_to_model.items())
+        for filename in list(self.evicted_models):
+            model = self._evicted_model(filename)
+            if model is not None:
+                items.append((filename, model))
+        return items
+
+    def _evict(self):
+        """
+        Evicts the least recently used models over `max_models`. Models
+        which can't be weakly referenced are kept by a strong reference.
+        """
+        while len(self.filename_to_model) > self.max_models:
+            filename, model = self.filename_to_model.popitem(last=False)
+            try:
+                ref = weakref.ref(
+                    model, lambda ref, filename=filename: self._collected(filename, ref)
+                )
+            except TypeError:
+                self.evicted_models[filename] = lambda model=model: model
+                continue
+            self.evicted_models[filename] = ref
+            self.evictions += 1
+
+    def _collected(self, filename, ref):
+        if self.evicted_models.get(filename) is ref:
+            del self.evicted_models[filename]
+            self.collected_models.add(filename)
 
     def __contains__(self, filename):
         return self.has_model(filename)
 
     def __iter__(self):
-        return iter(self.filename_to_model.values())
+        if not self.evicted_models:
+            return iter(self.filename_to_model.values())
+        return iter([m for _, m in self._items()])
 
     def __len__(self):
-        return len(self.filename_to_model)
+        if not self.evicted_models:
+            return len(self.filename_to_model)
+        return len(self._items())
 
     def __getitem__(self, filename):
-        return self.filename_to_model[filename]
+        if self.max_models is None:
+            return self.filename_to_model[filename]
+        if filename in self.filename_to_model:
+            # Most recently used
+            self.filename_to_model.move_to_end(filename)
+            return self.filename_to_model[filename]
+        model = self._evicted_model(filename)
+        if model is None:
+            raise KeyError(filename)
+        self[filename] = model
+        return model
 
     def __setitem__(self, filename, model):
+        if self.max_models is None:
+            self.filename_to_model[filename] = model
+            return
+        if filename in self.collected_models:
+            self.collected_models.discard(filename)
+            self.reloads += 1
+        self.evicted_models.pop(filename, None)
         self.filename_to_model[filename] = model
+        self.filename_to_model.move_to_end(filename)
+        self._evict()
 
 
 class GlobalModelRepository:
@@ -104,23 +330,53 @@ class GlobalModelRepository:
 
     """
 
-    def __init__(self, all_models=None):
+    def __init__(self, all_models=None, max_models=None):
         """
         Create a new repo for a model.
 
         Args:
             all_models: models to be added to this new repository.
+            max_models: the number of models kept by a new `all_models`
+                        repository (see ModelRepository).
         """
         self.local_models = ModelRepository()  # used for current model
+        # Functions loading the lazily imported models which are not loaded
+        # yet (see ImportURI)
+        self.pending_imports = []
         if all_models is not None:
             self.all_models = all_models  # used to reuse already loaded models
         else:
-            self.all_models = ModelRepository()
+            self.all_models = ModelRepository(max_models)
 
     def remove_model(self, model):
         self.all_models.remove_model(model)
         self.local_models.remove_model(model)
 
+    def invalidate_file_cache(self):
+        """
+        Clears the cached results of the file system lookups (globbing and
+        search path probing) shared by all models using the `all_models`
+        repository. The meta-model calls it at the start of each load, so it
+        is needed only if model files are added or removed during a load.
+        """
+        self.all_models.glob_cache.clear()
+        self.all_models.exists_cache.clear()
+
+    def _glob(self, filename_pattern, glob_args):
+        key = (filename_pattern, tuple(sorted(glob_args.items())))
+        filenames = self.all_models.glob_cache.get(key)
+        if filenames is None:
+            filenames = glob.glob(filename_pattern, **glob_args)
+            self.all_models.glob_cache[key] = filenames
+        return list(filenames)
+
+    def _exists(self, filename):
+        found = self.all_models.exists_cache.get(filename)
+        if found is None:
+            found = exists(filename)
+            self.all_models.exists_cache[filename] = found
+        return found
+
     def remove_models(self, models):
         for m in models:
             self.remove_model(m)
@@ -134,6 +390,7 @@ class GlobalModelRepository:
         encoding="utf-8",
         add_to_local_models=True,
         model_params=None,
+        workers=1,
     ):
         """
         Add a new model to all relevant objects.
@@ -143,6 +400,8 @@ class GlobalModelRepository:
             model: model holding the loaded models in its _tx_model_repository
                    field (may be None).
             glob_args: arguments passed to the glob.glob function.
+            workers: the number of processes used to parse the models. The
+                     references are resolved in the current process.
 
         Returns:
             the list of loaded models
@@ -154,14 +413,19 @@ class GlobalModelRepository:
             the_metamodel = get_metamodel(model)  # default metamodel
         else:
             the_metamodel = None
-        filenames = glob.glob(filename_pattern, **glob_args)
+        filenames = self._glob(filename_pattern, glob_args)
         if len(filenames) == 0:
             raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), filename_pattern)
-        loaded_models = []
+        metamodels = []
         for filename in filenames:
             the_metamodel = metamodel_for_file_or_default_metamodel(
                 filename, the_metamodel
             )
+            metamodels.append(the_metamodel)
+        if workers > 1:
+            self._construct_models(metamodels, filenames, encoding, workers)
+        loaded_models = []
+        for the_metamodel, filename in zip(metamodels, filenames):
             loaded_models.append(
                 self.load_model(
                     the_metamodel,
@@ -174,6 +438,29 @@ class GlobalModelRepository:
             )
         return loaded_models
 
+    def _construct_models(self, metamodels, filenames, encoding, workers):
+        """
+        Parses the model files which are not loaded yet in worker processes
+        and stores the pickled models before reference resolution in
+        `all_models.constructed_models` (see construct_models_in_workers).
+        Otherwise, the models are parsed when they are loaded.
+        """
+        to_construct = {}
+        for the_metamodel, filename in zip(metamodels, filenames):
+            filename = abspath(filename)
+            if (
+                not self.all_models.has_model(filename)
+                and filename not in self.all_models.constructed_models
+            ):
+                to_construct[filename] = the_metamodel
+
+        constructed = construct_models_in_workers(
+            list(to_construct.values()), list(to_construct), encoding, workers
+        )
+        for filename, constructed_model in zip(to_construct, constructed):
+            if constructed_model is not None:
+                self.all_models.constructed_models[filename] = constructed_model
+
     def load_model_using_search_path(
         self,
         filename,
@@ -203,7 +490,7 @@ class GlobalModelRepository:
         for the_path in search_path:
             full_filename = join(the_path, filename)
             # print(full_filename)
-            if exists(full_filename):
+            if self._exists(full_filename):
                 the_metamodel = get_metamodel(model) if model is not None else None
                 the_metamodel = metamodel_for_file_or_default_metamodel(
                     filename, the_metamodel
@@ -259,6 +546,9 @@ class GlobalModelRepository:
                     is_main_model=is_main_model,
                     encoding=encoding,
                     model_params=model_params,
+                    constructed_model=self.all_models.constructed_models.pop(
+                        filename, None
+                    ),
                 )
                 self.all_models[filename] = new_model
             # print("ADDING {}".format(filename))
@@ -288,8 +578,8 @@ class GlobalModelRepository:
             the filename of the model added to the repo
         """
         if model._tx_filename is None:
-            for fn in self.all_models.filename_to_model:
-                if self.all_models.filename_to_model[fn] == model:
+            for fn, m in self.all_models._items():
+                if m == model:
                     # print("UPDATED/CACHED {}".format(fn))
                     return fn
             i = 0
@@ -334,6 +624,13 @@ class ModelLoader:
     def load_models(self, model):
         pass
 
+    def load_element_models(self, model, element, encoding="utf-8"):
+        """
+        Loads the models needed by the given top-level element of a model
+        whose elements are loaded one by one (see iter_model_from_file).
+        """
+        pass
+
 
 def get_all_models_including_attached_models(model):
     """
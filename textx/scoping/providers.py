@@ -88,14 +88,20 @@ class PlainName:
         if self.multi_metamodel_support:
             from textx import get_children, get_model, textx_isinstance
 
-            result_lst = get_children(
-                lambda x: (
-                    hasattr(x, "name")
-                    and x.name == obj_ref.obj_name
-                    and textx_isinstance(x, obj_ref.cls)
-                ),
-                get_model(obj),
-            )
+            model = get_model(obj)
+            resolver = getattr(model, "_tx_reference_resolver", None)
+            if resolver is not None:
+                # Model is being resolved, use the name index of the model.
+                result_lst = resolver.name_index.find(obj_ref.obj_name, obj_ref.cls)
+            else:
+                result_lst = get_children(
+                    lambda x: (
+                        hasattr(x, "name")
+                        and x.name == obj_ref.obj_name
+                        and textx_isinstance(x, obj_ref.cls)
+                    ),
+                    model,
+                )
             if len(result_lst) == 1:
                 result = result_lst[0]
             elif len(result_lst) > 1:
@@ -104,7 +110,7 @@ class PlainName:
                     f"name {obj_ref.obj_name} is not unique.",
                     line=line,
                     col=col,
-                    filename=get_model(obj)._tx_filename,
+                    filename=model._tx_filename,
                 )
             else:
                 result = None
@@ -118,7 +124,7 @@ class FQN:
     fully qualified name scope provider
     """
 
-    def __init__(self, scope_redirection_logic=None):
+    def __init__(self, scope_redirection_logic=None, indexed=False):
         """
         Args:
             scope_redirection_logic: this callable gets a
@@ -132,8 +138,14 @@ class FQN:
             scope_redirection_logic is not applied for the
             object containing the reference to be resolved
             (in order to prevent getting circular dependencies).
+            indexed: if True, named objects are looked up in a
+            per-model index of contained named objects (see
+            textx.model.FQNIndex) built once per resolution pass.
+            Only containment attributes are followed in this mode
+            (default: False).
         """
         self.scope_redirection_logic = scope_redirection_logic
+        self.indexed = indexed
 
     def __call__(self, current_obj, attr, obj_ref):
         """
@@ -151,6 +163,23 @@ class FQN:
         Returns: None or the referenced object
         """
 
+        def _get_fqn_index(obj):
+            """
+            Helper function:
+            find the FQNIndex of the model being resolved which contains obj.
+
+            Returns:
+                the index or None (model not being resolved)
+            """
+            if current_index is not None and obj in current_index:
+                return current_index
+            from textx import get_model
+
+            resolver = getattr(get_model(obj), "_tx_reference_resolver", None)
+            if resolver is not None and obj in resolver.fqn_index:
+                return resolver.fqn_index
+            return None
+
         def _find_obj_fqn(p, fqn_name, cls):
             """
             Helper function:
@@ -177,11 +206,20 @@ class FQN:
                         return_value = find_obj(m, name)
                         if return_value is not None:
                             return return_value
+                if self.indexed:
+                    index = _get_fqn_index(parent)
+                    if index is not None:
+                        return index.find_child(parent, name)
+                # Model objects may have slots instead of (or besides) the
+                # `__dict__` (see `use_slots` meta-model parameter)
+                attr_names = list(getattr(type(parent), "__slots__", ()))
+                attr_names.extend(getattr(parent, "__dict__", ()))
                 for attr in [
                     a
-                    for a in parent.__dict__
+                    for a in attr_names
                     if not a.startswith("__")
                     and not a.startswith("_tx_")
+                    and hasattr(parent, a)
                     and not callable(getattr(parent, a))
                 ]:
                     obj = getattr(parent, attr)
@@ -238,6 +276,9 @@ class FQN:
 
         assert type(obj_ref) is ObjCrossRef, type(obj_ref)
         obj_cls, obj_name = obj_ref.cls, obj_ref.obj_name
+        current_index = None
+        if self.indexed:
+            current_index = _get_fqn_index(current_obj)
         return _find_referenced_obj(current_obj, obj_name, obj_cls)
 
 
@@ -257,6 +298,11 @@ class ImportURI(scoping.ModelLoader):
 
     The importURI_converter is used to process the importURI attribute to
     yield a filename or a filename pattern.
+
+    If "lazy" is enabled, the imported models (except the ones imported with
+    "importAs") are not loaded with the model. They are loaded in the order of
+    the imports when a reference is not found in the model and in the models
+    loaded so far.
     """
 
     def __init__(
@@ -267,6 +313,7 @@ class ImportURI(scoping.ModelLoader):
         importAs=False,
         importURI_converter=None,
         importURI_to_scope_name=None,
+        lazy=False,
     ):
         """
         Creates a new ImportURI Provider.
@@ -288,6 +335,8 @@ class ImportURI(scoping.ModelLoader):
                 you can set the name of the importURI object to something
                 dependent of the original importURI value (caution: for an
                 FQN based lookup, this name should NOT contain dots '.').
+            lazy: load the imported models only when a reference is not found
+                in the models loaded so far (see class documentation).
 
         """
         from textx.scoping import ModelLoader
@@ -304,6 +353,7 @@ class ImportURI(scoping.ModelLoader):
         else:
             self.importURI_converter = lambda x: x
         self.importURI_to_scope_name = importURI_to_scope_name
+        self.lazy = lazy
         if glob_args:
             self.set_glob_args(glob_args)
 
@@ -311,11 +361,18 @@ class ImportURI(scoping.ModelLoader):
         self.glob_args = glob_args
 
     def _load_referenced_models(self, model, encoding):
+        self._load_imports(model, model, encoding)
+
+    def _load_imports(self, model, root, encoding):
+        """
+        Loads the models imported by the importURI objects contained in the
+        given root object of the model.
+        """
         from textx.model import get_children
 
-        visited = []
+        visited = set()
         for obj in get_children(
-            lambda x: hasattr(x, "importURI") and x not in visited, model
+            lambda x: hasattr(x, "importURI") and id(x) not in visited, root
         ):
             add_to_local_models = True
             if self.importURI_to_scope_name is not None:
@@ -324,37 +381,50 @@ class ImportURI(scoping.ModelLoader):
             if hasattr(obj, "name") and obj.name is not None and obj.name != "":
                 add_to_local_models = not self.importAs
 
-            visited.append(obj)
-            if self.search_path is not None:
-                # search_path based i/o:
-                my_search_path = [dirname(model._tx_filename)] + self.search_path
-                loaded_model = model._tx_model_repository.load_model_using_search_path(
-                    self.importURI_converter(obj.importURI),
+            visited.add(id(obj))
+            if self.lazy and add_to_local_models:
+                model._tx_model_repository.pending_imports.append(
+                    lambda obj=obj: self._load_import(model, obj, True, encoding)
+                )
+            else:
+                self._load_import(model, obj, add_to_local_models, encoding)
+
+    def _load_import(self, model, obj, add_to_local_models, encoding):
+        """
+        Loads the models imported by the given importURI object and returns
+        them.
+        """
+        if self.search_path is not None:
+            # search_path based i/o:
+            my_search_path = [dirname(model._tx_filename)] + self.search_path
+            loaded_model = model._tx_model_repository.load_model_using_search_path(
+                self.importURI_converter(obj.importURI),
+                model=model,
+                search_path=my_search_path,
+                encoding=encoding,
+                add_to_local_models=add_to_local_models,
+                model_params=model._tx_model_params,
+            )
+            obj._tx_loaded_models = [loaded_model]
+
+        else:
+            # globing based i/o:
+            basedir = dirname(model._tx_filename)
+            filename_pattern = abspath(
+                join(basedir, self.importURI_converter(obj.importURI))
+            )
+
+            obj._tx_loaded_models = (
+                model._tx_model_repository.load_models_using_filepattern(
+                    filename_pattern,
                     model=model,
-                    search_path=my_search_path,
+                    glob_args=self.glob_args,
                     encoding=encoding,
                     add_to_local_models=add_to_local_models,
                     model_params=model._tx_model_params,
                 )
-                obj._tx_loaded_models = [loaded_model]
-
-            else:
-                # globing based i/o:
-                basedir = dirname(model._tx_filename)
-                filename_pattern = abspath(
-                    join(basedir, self.importURI_converter(obj.importURI))
-                )
-
-                obj._tx_loaded_models = (
-                    model._tx_model_repository.load_models_using_filepattern(
-                        filename_pattern,
-                        model=model,
-                        glob_args=self.glob_args,
-                        encoding=encoding,
-                        add_to_local_models=add_to_local_models,
-                        model_params=model._tx_model_params,
-                    )
-                )
+            )
+        return obj._tx_loaded_models
 
     def load_models(self, model, encoding="utf-8"):
         from textx.model import get_metamodel
@@ -373,6 +443,9 @@ class ImportURI(scoping.ModelLoader):
             model._tx_model_repository = model_repository
         self._load_referenced_models(model, encoding=encoding)
 
+    def load_element_models(self, model, element, encoding="utf-8"):
+        self._load_imports(model, element, encoding)
+
     def __call__(self, obj, attr, obj_ref):
         from textx.model import ObjCrossRef, get_model
 
@@ -397,7 +470,14 @@ class ImportURI(scoping.ModelLoader):
             if ret:
                 return ret
 
-        # 3) Use builtin models as a fallback if provided
+        # 3) load the lazily imported models until the object is found
+        while model_repository.pending_imports:
+            for m in model_repository.pending_imports.pop(0)():
+                ret = self.scope_provider(m, attr, obj_ref)
+                if ret:
+                    return ret
+
+        # 4) Use builtin models as a fallback if provided
         if model._tx_metamodel.builtin_models:
             for m in model._tx_metamodel.builtin_models:
                 ret = self.scope_provider(m, attr, obj_ref)
@@ -438,6 +518,8 @@ class FQNImportURI(ImportURI):
         importURI_converter=None,
         importURI_to_scope_name=None,
         scope_redirection_logic=None,
+        indexed=False,
+        lazy=False,
     ):
         if importAs:
 
@@ -451,12 +533,13 @@ class FQNImportURI(ImportURI):
             my_scope_redirection_logic = scope_redirection_logic
         ImportURI.__init__(
             self,
-            FQN(scope_redirection_logic=my_scope_redirection_logic),
+            FQN(scope_redirection_logic=my_scope_redirection_logic, indexed=indexed),
             glob_args=glob_args,
             search_path=search_path,
             importAs=importAs,
             importURI_converter=importURI_converter,
             importURI_to_scope_name=importURI_to_scope_name,
+            lazy=lazy,
         )
 
 
@@ -465,13 +548,16 @@ class PlainNameImportURI(ImportURI):
     scope provider with ImportURI and PlainName names
     """
 
-    def __init__(self, glob_args=None, search_path=None, importURI_converter=None):
+    def __init__(
+        self, glob_args=None, search_path=None, importURI_converter=None, lazy=False
+    ):
         ImportURI.__init__(
             self,
             PlainName(),
             glob_args=glob_args,
             search_path=search_path,
             importURI_converter=importURI_converter,
+            lazy=lazy,
         )
 
 
@@ -489,12 +575,17 @@ class GlobalRepo(ImportURI):
     The model parameter `project_root` (see _tx_model_params) can be used to
     set a project directory, where all file patterns not referring to an
     absolute file position are looked up.
+
+    If `workers` is greater than one, the registered models are parsed by
+    that many processes (see
+    GlobalModelRepository.load_models_using_filepattern).
     """
 
-    def __init__(self, scope_provider, filename_pattern=None, glob_args=None):
+    def __init__(self, scope_provider, filename_pattern=None, glob_args=None, workers=1):
         ImportURI.__init__(self, scope_provider, glob_args=glob_args)
         self.filename_pattern_list = []
         self.models_to_be_added_directly = []
+        self.workers = workers
         if filename_pattern:
             self.register_models(filename_pattern)
 
@@ -522,10 +613,15 @@ class GlobalRepo(ImportURI):
                 glob_args=self.glob_args,
                 encoding=encoding,
                 model_params=model._tx_model_params,
+                workers=self.workers,
             )
         for m in self.models_to_be_added_directly:
             model._tx_model_repository._add_model(m)
 
+    def load_element_models(self, model, element, encoding="utf-8"):
+        # The registered models are loaded with the model.
+        pass
+
     def add_model(self, model):
         """
         Adds a model directly. Useful when combining models
@@ -536,7 +632,7 @@ class GlobalRepo(ImportURI):
         self.models_to_be_added_directly.append(model)
 
     def load_models_in_model_repo(
-        self, global_model_repo=None, encoding="utf-8", **kwargs
+        self, global_model_repo=None, encoding="utf-8", workers=None, **kwargs
     ):
         """
         load all registered models (called explicitly from
@@ -555,6 +651,9 @@ class GlobalRepo(ImportURI):
         to check for undefined parameters (else, undefined
         parameters passed via kwargs here are ignored).
 
+        `workers` is the number of processes used to parse the
+        models (default: the `workers` given to the constructor).
+
         Returns:
             a GlobalModelRepository with the loaded models
         """
@@ -571,6 +670,7 @@ class GlobalRepo(ImportURI):
                 is_main_model=True,
                 encoding=encoding,
                 model_params=ModelParams(kwargs),
+                workers=self.workers if workers is None else workers,
             )
         return global_model_repo
 
@@ -580,8 +680,14 @@ class FQNGlobalRepo(GlobalRepo):
     scope provider with FQN and global repo
     """
 
-    def __init__(self, filename_pattern=None, glob_args=None):
-        GlobalRepo.__init__(self, FQN(), filename_pattern, glob_args=glob_args)
+    def __init__(self, filename_pattern=None, glob_args=None, indexed=False, workers=1):
+        GlobalRepo.__init__(
+            self,
+            FQN(indexed=indexed),
+            filename_pattern,
+            glob_args=glob_args,
+            workers=workers,
+        )
 
 
 class PlainNameGlobalRepo(GlobalRepo):
@@ -589,8 +695,10 @@ class PlainNameGlobalRepo(GlobalRepo):
     scope provider with PlainName names and global repo
     """
 
-    def __init__(self, filename_pattern=None, glob_args=None):
-        GlobalRepo.__init__(self, PlainName(), filename_pattern, glob_args=glob_args)
+    def __init__(self, filename_pattern=None, glob_args=None, workers=1):
+        GlobalRepo.__init__(
+            self, PlainName(), filename_pattern, glob_args=glob_args, workers=workers
+        )
 
 
 class RelativeName:
@@ -1,3 +1,6 @@
+import threading
+from functools import lru_cache, partial
+
 from arpeggio import EOF, Optional, PTNodeVisitor, visit_parse_tree
 from arpeggio import RegExMatch as _
 from arpeggio import ZeroOrMore as ArpeggioZeroOrMore
@@ -56,6 +59,9 @@ def rrel_standalone():
     return rrel_expression, EOF
 
 
+_MISSING = object()
+
+
 class RRELBase:
     def __init__(self):
         pass
@@ -188,50 +194,28 @@ class RRELNavigation(RRELBase):
         if len(lookup_list) == 0 and self.consume_name:
             return None, lookup_list, matched_path
 
+        name = self.name
+        if self.fixed_name is not None:
+            match_name, rest_lookup_list = self.fixed_name, lookup_list
+        elif self.consume_name:
+            match_name, rest_lookup_list = lookup_list[0], lookup_list[1:]
+        else:
+            match_name = None  # return the attribute value as is
+
         def lookup(obj):
-            if needs_to_be_resolved(obj, self.name):
+            if needs_to_be_resolved(obj, name):
                 return Postponed(), lookup_list, matched_path
-            if hasattr(obj, self.name):
-                target = getattr(obj, self.name)
-                if not self.consume_name and self.fixed_name is None:
-                    return target, lookup_list, matched_path  # return list
-                else:
-                    if not isinstance(target, list):
-                        target = [target]
-                    if self.fixed_name is not None:
-                        lst = list(
-                            filter(
-                                lambda x: (
-                                    hasattr(x, "name") and x.name == self.fixed_name
-                                ),
-                                target,
-                            )
-                        )
-                        if len(lst) > 0:
-                            return (
-                                lst[0],
-                                lookup_list,
-                                matched_path + [lst[0]],
-                            )  # return obj
-                        else:
-                            return None, lookup_list, matched_path  # return None
-                    else:
-                        lst = list(
-                            filter(
-                                lambda x: hasattr(x, "name") and x.name == lookup_list[0],
-                                target,
-                            )
-                        )
-                        if len(lst) > 0:
-                            return (
-                                lst[0],
-                                lookup_list[1:],
-                                matched_path + [lst[0]],
-                            )  # return obj
-                        else:
-                            return None, lookup_list, matched_path  # return None
-            else:
+            target = getattr(obj, name, _MISSING)
+            if target is _MISSING:
                 return None, lookup_list, matched_path
+            if match_name is None:
+                return target, lookup_list, matched_path  # return list
+            if not isinstance(target, list):
+                target = [target]
+            for x in target:
+                if getattr(x, "name", _MISSING) == match_name:
+                    return x, rest_lookup_list, matched_path + [x]  # return obj
+            return None, lookup_list, matched_path  # return None
 
         for start_obj in start:
             res, res_lookup_list, res_lookup_path = lookup(start_obj)
@@ -246,12 +230,14 @@ class RRELBrackets(RRELBase):
         super().__init__()
         assert isinstance(oc, RRELSequence)
         self.seq = oc
+        self._start_locally = oc.start_locally()
+        self._start_at_root = oc.start_at_root()
 
     def start_locally(self):
-        return self.seq.start_locally()
+        return self._start_locally
 
     def start_at_root(self):
-        return self.seq.start_at_root()
+        return self._start_at_root
 
     def __repr__(self):
         return "(" + str(self.seq) + ")"
@@ -303,21 +289,17 @@ class RRELSequence(RRELBase):
     def __init__(self, paths):
         super().__init__()
         self.paths = paths
+        self._start_locally = any(p.start_locally() for p in paths)
+        self._start_at_root = any(p.start_at_root() for p in paths)
 
     def __repr__(self):
         return ",".join(map(lambda x: str(x), self.paths))
 
     def start_locally(self):
-        res = False
-        for p in self.paths:
-            res = res or p.start_locally()
-        return res
+        return self._start_locally
 
     def start_at_root(self):
-        res = False
-        for p in self.paths:
-            res = res or p.start_at_root()
-        return res
+        return self._start_at_root
 
     def get_next_matches(
         self, obj, lookup_list, allowed, matched_path, first_element=False
@@ -337,12 +319,14 @@ class RRELZeroOrMore(RRELBase):
             path_element = RRELBrackets(RRELSequence([RRELPath([path_element])]))
         self.path_element = path_element
         assert isinstance(self.path_element, RRELBrackets)
+        self._start_locally = path_element.start_locally()
+        self._start_at_root = path_element.start_at_root()
 
     def start_locally(self):
-        return self.path_element.start_locally()
+        return self._start_locally
 
     def start_at_root(self):
-        return self.path_element.start_at_root()
+        return self._start_at_root
 
     def __repr__(self):
         return str(self.path_element) + "*"
@@ -351,16 +335,16 @@ class RRELZeroOrMore(RRELBase):
         self, obj, lookup_list, allowed, matched_path, first_element=False
     ):
         assert isinstance(self.path_element, RRELBrackets)
+        assert self._start_locally or self._start_at_root  # or, not xor
         from textx.scoping import Postponed
 
         def get_from_zero_or_more(obj, lookup_list, matched_path, first_element=False):
-            assert self.start_locally() or self.start_at_root()  # or, not xor
             if not allowed(obj, lookup_list, self):  # also adjusts visited objs
                 return  # recursion stopper
             if first_element:
-                if self.start_locally():
+                if self._start_locally:
                     yield obj, lookup_list, matched_path
-                if self.start_at_root():
+                if self._start_at_root:
                     from textx import get_model
 
                     yield get_model(obj), lookup_list, matched_path
@@ -401,6 +385,8 @@ class RRELPath(RRELBase):
             self.path_elements[0] = RRELZeroOrMore(
                 RRELBrackets(RRELSequence([RRELPath([RRELDots(2)])]))
             )
+        self._start_locally = self.path_elements[0].start_locally()
+        self._start_at_root = self.path_elements[0].start_at_root()
 
     def __repr__(self):
         if isinstance(self.path_elements[0], RRELDots):
@@ -411,10 +397,10 @@ class RRELPath(RRELBase):
             return ".".join(map(lambda x: str(x), self.path_elements))
 
     def start_locally(self):
-        return self.path_elements[0].start_locally()
+        return self._start_locally
 
     def start_at_root(self):
-        return self.path_elements[0].start_at_root()
+        return self._start_at_root
 
     def get_next_matches(
         self, obj, lookup_list, allowed, matched_path, first_element=False
@@ -573,11 +559,28 @@ def parse(rrel_expression):
 
     Returns:
         A RREL expression tree.
+
+    Parsed expressions are cached by their text and shared between callers,
+    so the returned tree must not be modified.
     """
-    from arpeggio import ParserPython
+    return _parse_cached(rrel_expression)
+
+
+# Arpeggio parsers keep the state of the current parse, so each thread has
+# its own parser.
+_rrel_parsers = threading.local()
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(rrel_expression):
+    rrel_parser = getattr(_rrel_parsers, "parser", None)
+    if rrel_parser is None:
+        from arpeggio import ParserPython
 
-    parser = ParserPython(rrel_standalone, reduce_tree=False)
-    parse_tree = parser.parse(rrel_expression)
+        rrel_parser = _rrel_parsers.parser = ParserPython(
+            rrel_standalone, reduce_tree=False
+        )
+    parse_tree = rrel_parser.parse(rrel_expression)
     return visit_parse_tree(parse_tree, RRELVisitor())
 
 
@@ -662,11 +665,21 @@ def create_rrel_scope_provider(rrel_tree_or_string, split_string=None, **kwargs)
     """
     from textx.scoping.providers import ImportURI
 
+    def reduce_provider(self):
+        # The provider classes are local so a provider is pickled (e.g. in
+        # a cached meta-model) as a call to this function.
+        return (
+            partial(create_rrel_scope_provider, **kwargs),
+            (rrel_tree_or_string, split_string),
+        )
+
     class RREL:
         """
         RREL scope provider
         """
 
+        __reduce__ = reduce_provider
+
         def __init__(self, rrel_tree, split_string, use_proxy):
             """
             Creates a RREL scope provider
@@ -720,6 +733,8 @@ def create_rrel_scope_provider(rrel_tree_or_string, split_string=None, **kwargs)
         scope provider with ImportURI and RREL
         """
 
+        __reduce__ = reduce_provider
+
         def __init__(
             self,
             rrel_tree,
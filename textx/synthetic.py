@@ -0,0 +1,658 @@
+"""
+Generating synthetic models of a given size from the grammar of a meta-model,
+e.g. to measure how parsing and reference resolution scale with model size.
+"""
+
+import os
+import random
+import re
+import string
+from contextlib import suppress
+
+from arpeggio import (
+    EndOfFile,
+    Match,
+    OneOrMore,
+    Optional,
+    OrderedChoice,
+    RegExMatch,
+    Repetition,
+    SyntaxPredicate,
+    ZeroOrMore,
+)
+
+from textx.const import RULE_COMMON
+from textx.exceptions import TextXError
+from textx.model import textx_isinstance
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+# The minimal size and height of rules which can't be matched without
+# recursion.
+_INFINITE = 1000
+
+# Base type values used instead of the values sampled from the regex.
+_BASE_TYPE_VALUES = {
+    "INT": lambda gen: str(gen.random.randint(0, 1000)),
+    "FLOAT": lambda gen: f"{gen.random.randint(0, 1000)}.5",
+    "STRICTFLOAT": lambda gen: f"{gen.random.randint(0, 1000)}.5",
+    "STRING": lambda gen: f'"{gen._new_id("s")}"',
+    "ID": lambda gen: gen._new_id("x"),
+}
+
+_CHARACTERS = string.ascii_letters + string.digits + "_-.+ "
+
+
+class _Ref:
+    """A reference to be rendered once all objects are known."""
+
+    def __init__(self, cls, match_rule):
+        self.cls = cls
+        self.match_rule = match_rule
+
+
+class _Group:
+    """
+    An optional part of the model which is dropped if one of the references
+    inside can't be resolved.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+
+class _Repetition:
+    def __init__(self, items, sep, minimum):
+        self.items = items
+        self.sep = sep
+        self.minimum = minimum
+
+
+class _Object:
+    """A generated model object."""
+
+    def __init__(self, cls, parent):
+        self.cls = cls
+        self.parent = parent
+        self.name = None
+
+    def fqn(self):
+        names = []
+        obj = self
+        while obj is not None:
+            if obj.name is not None:
+                names.append(obj.name)
+            obj = obj.parent
+        return ".".join(reversed(names))
+
+
+class _NoTarget(Exception):
+    pass
+
+
+class SyntheticModelGenerator:
+    """
+    Generates the text of models conforming to the grammar of the given
+    meta-model by walking its parsing rules:
+
+        generator = SyntheticModelGenerator(metamodel, size=10000, seed=1)
+        model = metamodel.model_from_str(generator.model_str())
+
+    Args:
+        metamodel (TextXMetaModel): the meta-model of the models.
+        size (int): the approximate number of objects in a model.
+        max_depth (int): the maximal nesting depth of the objects.
+        ref_density (float): the probability of generating an optional
+            reference, or one more reference in a repetition.
+        fqn (bool): if True, references are given by the fully qualified
+            names (e.g. for the FQN scope providers), otherwise by the names.
+        seed: the seed of the random generator, used to generate the same
+            models again.
+
+    Attributes `name` are generated unique for the whole model and references
+    point to existing objects of the right type (or to the meta-model
+    builtins), so they are resolved by the PlainName and FQN scope providers
+    and by the ImportURI and GlobalRepo variants for the multi-file models
+    (see `model_files`).
+
+    The tokens are separated by whitespaces, so grammars which don't skip
+    whitespaces are not supported. Choices and repetitions are not checked
+    against the PEG lookahead, so ambiguous grammars (e.g. a repetition
+    of IDs followed by an ID) may give models which don't parse.
+    """
+
+    def __init__(
+        self, metamodel, size=100, max_depth=5, ref_density=0.5, fqn=False, seed=None
+    ):
+        self.metamodel = metamodel
+        self.size = size
+        self.max_depth = max_depth
+        self.ref_density = ref_density
+        self.fqn = fqn
+        self.random = random.Random(seed)
+        self.newlines = "\n" in (metamodel.ws or "\t\n\r ")
+        self._ids = {}
+        self._keywords = set()
+        # Objects of the generated models by file name
+        self._file_objects = {}
+        self._nodes = []
+        self._collect_nodes(metamodel.rootcls._tx_peg_rule)
+        self._attrs = self._assignment_attrs()
+        self._min_size, self._min_height, self._max_height = self._measure()
+        self._with_refs = {id(n) for n in self._nodes if self._contains_refs(n)}
+        self._imports_nodes = {id(n) for n in self._nodes if self._contains_imports(n)}
+
+    def model_str(self, imports=(), imported_objects=()):
+        """
+        Returns the text of a new model. `imports` are the import URIs of the
+        models to import and `imported_objects` the objects of other models
+        which may be referenced.
+        """
+        self._imports = list(imports)
+        self._objects = []
+        self._parents = [None]
+        tokens = self._gen(self.metamodel.rootcls._tx_peg_rule, self.size, 0)
+        if self._imports:
+            raise TextXError(
+                f'The grammar of "{self.metamodel.rootcls.__name__}" has no'
+                " import rule for the imports."
+            )
+        self._targets = list(imported_objects) + self._objects
+        self._targets_by_cls = {}
+        try:
+            text = " ".join(self._render(tokens))
+        except _NoTarget as e:
+            raise TextXError(
+                "Can't generate references, there are no objects to reference."
+            ) from e
+        return re.sub(" ?\n[ \n]*", "\n", text).strip() + "\n"
+
+    def model_files(self, folder, files=10, fan_out=1, file_name="model{}.txt"):
+        """
+        Writes a multi-file model to the given folder and returns the file
+        names. Each file imports the previous `fan_out` files and references
+        their objects. If the grammar has no import rule (e.g. for the
+        GlobalRepo scope providers) the files reference the objects of the
+        previous files without importing them.
+
+        Args:
+            folder (str): the output folder.
+            files (int): the number of files, each with `size` objects.
+            fan_out (int): the number of files each file imports.
+            file_name (str): the file name format, `{}` is the file index.
+        """
+        has_imports = bool(self._imports_nodes)
+        file_names = []
+        for idx in range(files):
+            imported = file_names[max(0, idx - fan_out) : idx]
+            imported_objects = [
+                obj for name in imported for obj in self._file_objects[name]
+            ]
+            model_str = self.model_str(
+                imports=[os.path.basename(name) for name in imported]
+                if has_imports
+                else (),
+                imported_objects=imported_objects,
+            )
+            name = os.path.join(folder, file_name.format(idx))
+            with open(name, "w") as f:
+                f.write(model_str)
+            self._file_objects[name] = self._objects
+            file_names.append(name)
+        return file_names
+
+    def _collect_nodes(self, rule):
+        visited = set()
+        to_visit = [rule]
+        while to_visit:
+            node = to_visit.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            self._nodes.append(node)
+            if isinstance(node, Match):
+                keyword = getattr(node, "str_repr", None) or getattr(
+                    node, "to_match", None
+                )
+                if keyword and keyword[0].isalpha():
+                    self._keywords.add(keyword.lower())
+            to_visit.extend(node.nodes)
+            if getattr(node, "sep", None) is not None:
+                to_visit.append(node.sep)
+
+    def _assignment_attrs(self):
+        """
+        Returns the class attributes of the assignment rules by the rule id.
+        """
+        attrs = {}
+        for rule in self._nodes:
+            cls = getattr(rule, "_tx_class", None)
+            if not rule.root or cls is None or not hasattr(cls, "_tx_attrs"):
+                continue
+            to_visit = list(rule.nodes)
+            visited = set()
+            while to_visit:
+                node = to_visit.pop()
+                if id(node) in visited:
+                    continue
+                visited.add(id(node))
+                if node.rule_name.startswith("__asgn"):
+                    attrs[id(node)] = cls._tx_attrs[node._attr_name]
+                elif not node.root:
+                    to_visit.extend(node.nodes)
+        return attrs
+
+    def _measure(self):
+        """
+        Calculates for each node the minimal number of objects, and the
+        minimal and the maximal nesting of objects created while parsing the
+        node. The minimal height is used to stop the recursion at the maximal
+        depth, the maximal height and the minimal size to distribute the
+        objects over the nesting levels.
+        """
+        min_size = {id(node): _INFINITE for node in self._nodes}
+        min_height = {id(node): _INFINITE for node in self._nodes}
+        max_height = {id(node): 0 for node in self._nodes}
+        changed = True
+        while changed:
+            changed = False
+            for node in self._nodes:
+                if self._ref_attr(node) is not None or isinstance(
+                    node, (Match, SyntaxPredicate)
+                ):
+                    size = min_h = max_h = 0
+                else:
+                    children_size = [min_size[id(n)] for n in node.nodes]
+                    children_min = [min_height[id(n)] for n in node.nodes]
+                    if isinstance(node, OrderedChoice):
+                        size, min_h = min(children_size), min(children_min)
+                    elif isinstance(node, (Optional, ZeroOrMore)):
+                        size = min_h = 0
+                    else:
+                        size, min_h = sum(children_size), max(children_min)
+                    max_h = max(max_height[id(n)] for n in node.nodes)
+                    if self._is_object(node):
+                        size, min_h, max_h = size + 1, min_h + 1, max_h + 1
+                    size = min(size, _INFINITE)
+                    min_h = min(min_h, _INFINITE)
+                    # Deeper nesting is never generated
+                    max_h = min(max_h, self.max_depth)
+                if (
+                    size < min_size[id(node)]
+                    or min_h < min_height[id(node)]
+                    or max_h > max_height[id(node)]
+                ):
+                    min_size[id(node)] = min(size, min_size[id(node)])
+                    min_height[id(node)] = min(min_h, min_height[id(node)])
+                    max_height[id(node)] = max(max_h, max_height[id(node)])
+                    changed = True
+        return min_size, min_height, max_height
+
+    @staticmethod
+    def _is_object(node):
+        cls = getattr(node, "_tx_class", None)
+        return (
+            node.root
+            and cls is not None
+            and cls._tx_type == RULE_COMMON
+            and not node.rule_name.startswith("__asgn")
+        )
+
+    def _ref_attr(self, node):
+        attr = self._attrs.get(id(node))
+        return attr if attr is not None and attr.ref and not attr.cont else None
+
+    def _new_id(self, prefix):
+        while True:
+            self._ids[prefix] = self._ids.get(prefix, 0) + 1
+            new_id = f"{prefix}{self._ids[prefix]}"
+            if new_id.lower() not in self._keywords:
+                return new_id
+
+    def _gen(self, node, quota, depth):
+        """
+        Returns the tokens of the text matched by the given node. `quota` is
+        the number of objects to create.
+        """
+        if self._is_object(node):
+            obj = _Object(node._tx_class, self._parents[-1])
+            self._objects.append(obj)
+            self._parents.append(obj)
+            try:
+                tokens = self._gen_expression(node, max(quota - 1, 0), depth + 1)
+            finally:
+                self._parents.pop()
+            return tokens
+
+        attr = self._attrs.get(id(node))
+        if attr is not None:
+            if attr.ref and not attr.cont:
+                return self._gen_ref(node, attr)
+            if attr.name == "importURI" and not isinstance(node, (ZeroOrMore, OneOrMore)):
+                return self._gen_import_uri()
+            if attr.name == "name" and not isinstance(node, (ZeroOrMore, OneOrMore)):
+                return self._gen_name(node)
+        return self._gen_expression(node, quota, depth)
+
+    def _gen_expression(self, node, quota, depth):
+        if isinstance(node, (EndOfFile, SyntaxPredicate)):
+            return []
+        if isinstance(node, Match):
+            return [self._gen_match(node)]
+        if isinstance(node, OrderedChoice):
+            return self._gen_choice(node, quota, depth)
+        # Optional is a repetition in Arpeggio
+        if isinstance(node, Optional):
+            return self._gen_optional(node, quota, depth)
+        if isinstance(node, Repetition):
+            return self._gen_repetition(node, quota, depth)
+
+        # Sequence and unordered group: the quota is divided among the
+        # children creating objects.
+        creating = [
+            n
+            for n in node.nodes
+            if self._max_height[id(n)] > 0 and not self._is_import(n)
+        ]
+        child_quota = quota / len(creating) if creating else 0
+        tokens = []
+        for child in node.nodes:
+            tokens.extend(
+                self._gen(child, child_quota if child in creating else 0, depth)
+            )
+        return tokens
+
+    def _gen_choice(self, node, quota, depth):
+        if depth >= self.max_depth or quota < 1:
+            min_height = min(self._min_height[id(n)] for n in node.nodes)
+            choices = [n for n in node.nodes if self._min_height[id(n)] == min_height]
+        else:
+            choices = [n for n in node.nodes if self._min_height[id(n)] < _INFINITE]
+            # Objects are preferred while there is a quota to fill
+            choices = [n for n in choices if self._max_height[id(n)] > 0] or choices
+        return self._gen(self.random.choice(choices), quota, depth)
+
+    def _gen_optional(self, node, quota, depth):
+        if self._max_height[id(node)] > 0:
+            generate = quota >= 1 and depth < self.max_depth
+        elif self._has_refs(node):
+            generate = self.random.random() < self.ref_density
+        else:
+            generate = self.random.random() < 0.5
+        if not generate:
+            return []
+        return self._droppable(node, self._gen(node.nodes[0], quota, depth))
+
+    def _gen_repetition(self, node, quota, depth):
+        minimum = 1 if isinstance(node, OneOrMore) else 0
+        item = node.nodes[0]
+        if self._is_import(node):
+            count = max(len(self._imports), minimum)
+        elif self._max_height[id(node)] > 0:
+            # The number of items is chosen so that the nested repetitions
+            # have about the same number of items.
+            levels = min(self._max_height[id(node)], self.max_depth - depth)
+            items = quota / max(self._min_size[id(item)], 1)
+            if levels <= 0 or items < 1:
+                count = minimum
+            else:
+                count = min(round(items ** (1 / levels)), int(items))
+        else:
+            probability = self.ref_density if self._has_refs(node) else 0.5
+            count = 0
+            while count < 10 and self.random.random() < probability:
+                count += 1
+        count = max(count, minimum)
+
+        items = [
+            self._droppable(node, self._gen(item, quota / count, depth))
+            for _ in range(count)
+        ]
+        if self.newlines and self._max_height[id(node)] > 0:
+            # An object per line
+            items = [["\n", *tokens] for tokens in items]
+        sep = self._gen(node.sep, 0, depth) if node.sep is not None else None
+        return [_Repetition(items, sep, minimum)]
+
+    def _droppable(self, node, tokens):
+        """
+        Optional parts with references but without objects are dropped if the
+        references can't be resolved.
+        """
+        if self._has_refs(node) and self._max_height[id(node)] == 0:
+            return [_Group(tokens)]
+        return tokens
+
+    def _has_refs(self, node):
+        return id(node) in self._with_refs
+
+    def _is_import(self, node):
+        return id(node) in self._imports_nodes
+
+    def _contains_refs(self, node):
+        return any(
+            self._ref_attr(n) is not None for n in self._subnodes(node, objects=False)
+        )
+
+    def _contains_imports(self, node):
+        classes = [
+            n._tx_class for n in self._subnodes(node, objects=True) if self._is_object(n)
+        ]
+        return bool(classes) and all("importURI" in cls._tx_attrs for cls in classes)
+
+    def _subnodes(self, node, objects):
+        """
+        Nodes matched by the given node, without the nodes of nested objects.
+        If `objects` is set, the rules of the nested objects are included.
+        """
+        to_visit = list(node.nodes)
+        visited = set()
+        while to_visit:
+            child = to_visit.pop()
+            if id(child) in visited:
+                continue
+            visited.add(id(child))
+            if self._is_object(child):
+                if objects:
+                    yield child
+                continue
+            yield child
+            to_visit.extend(child.nodes)
+
+    def _gen_ref(self, node, attr):
+        match_rule = node.nodes[0]
+        if not isinstance(node, (ZeroOrMore, OneOrMore)):
+            return [_Ref(attr.cls, match_rule)]
+        minimum = 1 if isinstance(node, OneOrMore) else 0
+        count = minimum
+        while count < 10 and self.random.random() < self.ref_density:
+            count += 1
+        sep = self._gen(node.sep, 0, 0) if node.sep is not None else None
+        items = [[_Group([_Ref(attr.cls, match_rule)])] for _ in range(count)]
+        return [_Repetition(items, sep, minimum)]
+
+    def _gen_name(self, node):
+        match_rule = node.nodes[0]
+        obj = self._parents[-1]
+        name = self._new_id(obj.cls.__name__)
+        if match_rule.rule_name == "STRING":
+            text = f'"{name}"'
+        elif isinstance(match_rule, RegExMatch) and match_rule.regex.fullmatch(name):
+            text = name
+        else:
+            text = name = self._gen_match(match_rule)
+        obj.name = name
+        return [text]
+
+    def _gen_import_uri(self):
+        if not self._imports:
+            raise TextXError("No models to import left.")
+        return [f'"{self._imports.pop(0)}"']
+
+    def _gen_match(self, node):
+        if isinstance(node, RegExMatch):
+            value = _BASE_TYPE_VALUES.get(node.rule_name)
+            if value is not None:
+                text = value(self)
+                if node.regex.fullmatch(text):
+                    return text
+            text = self._sample_regex(node)
+            if self.newlines and self._swallows(node, text, " x"):
+                # E.g. /[^\n]*/ would match the following tokens too, so the
+                # match is ended by a newline. Whitespaces are skipped before
+                # the match so it can't be empty.
+                for _ in range(20):
+                    if text.strip():
+                        break
+                    text = self._sample_regex(node)
+                if not text.strip() or self._swallows(node, text, "\nx"):
+                    raise TextXError(
+                        f'Can\'t generate a match for "{node.to_match}" which'
+                        " doesn't match the following text."
+                    )
+                text += "\n"
+            return text
+        if isinstance(node, Match):
+            return node.to_match
+        # Match rules
+        return " ".join(self._render(self._gen_expression(node, 0, self.max_depth)))
+
+    @staticmethod
+    def _swallows(node, text, following):
+        return node.regex.match(text + following).end() > len(text)
+
+    def _sample_regex(self, node):
+        pattern = sre_parse.parse(node.to_match, node.regex.flags)
+        for _ in range(20):
+            text = self._sample(pattern)
+            if node.regex.fullmatch(text):
+                return text
+        raise TextXError(f'Can\'t generate a match for "{node.to_match}".')
+
+    def _sample(self, pattern):
+        text = []
+        for op, av in pattern:
+            if op is sre_parse.LITERAL:
+                text.append(chr(av))
+            elif op is sre_parse.NOT_LITERAL:
+                text.append(self.random.choice([c for c in "ab" if ord(c) != av]))
+            elif op is sre_parse.ANY:
+                text.append(self.random.choice(string.ascii_letters))
+            elif op is sre_parse.IN:
+                text.append(self._sample_set(av))
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+                low, high, item = av
+                count = self.random.randint(low, min(high, low + 3))
+                text.extend(self._sample(item) for _ in range(count))
+            elif op is sre_parse.SUBPATTERN:
+                text.append(self._sample(av[-1]))
+            elif op is sre_parse.BRANCH:
+                text.append(self._sample(self.random.choice(av[1])))
+            elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                continue
+            else:
+                raise TextXError(f'Unsupported regex operation "{op}".')
+        return "".join(text)
+
+    def _sample_set(self, items):
+        characters = set(_CHARACTERS)
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                characters.add(chr(av))
+            elif op is sre_parse.RANGE:
+                characters.update(chr(c) for c in (av[0], av[1]))
+        choices = [c for c in sorted(characters) if self._in_set(c, items)]
+        if not choices:
+            raise TextXError("Can't generate a character for a regex set.")
+        return self.random.choice(choices)
+
+    @staticmethod
+    def _in_set(character, items):
+        negate = False
+        found = False
+        for op, av in items:
+            if op is sre_parse.NEGATE:
+                negate = True
+            elif op is sre_parse.LITERAL:
+                found = found or character == chr(av)
+            elif op is sre_parse.RANGE:
+                found = found or av[0] <= ord(character) <= av[1]
+            elif op is sre_parse.CATEGORY:
+                found = found or bool(re.match(_CATEGORIES[av], character))
+        return found != negate
+
+    def _render(self, tokens):
+        text = []
+        for token in tokens:
+            if isinstance(token, str):
+                text.append(token)
+            elif isinstance(token, _Ref):
+                text.append(self._render_ref(token))
+            elif isinstance(token, _Group):
+                with suppress(_NoTarget):
+                    text.extend(self._render(token.tokens))
+            else:
+                items = [self._render(item) for item in token.items]
+                items = [item for item in items if item]
+                if len(items) < token.minimum:
+                    raise _NoTarget(token)
+                for idx, item in enumerate(items):
+                    if idx and token.sep is not None:
+                        text.extend(self._render(token.sep))
+                    text.extend(item)
+        return text
+
+    def _render_ref(self, ref):
+        targets = self._ref_targets(ref.cls)
+        if not targets:
+            raise _NoTarget(ref.cls)
+        target = self.random.choice(targets)
+        if isinstance(target, str):
+            name = target
+        elif self.fqn:
+            name = target.fqn()
+            if isinstance(
+                ref.match_rule, RegExMatch
+            ) and not ref.match_rule.regex.fullmatch(name):
+                name = target.name
+        else:
+            name = target.name
+        if ref.match_rule.rule_name == "STRING":
+            return f'"{name}"'
+        return name
+
+    def _ref_targets(self, cls):
+        targets = self._targets_by_cls.get(cls)
+        if targets is None:
+            targets = self._targets_by_cls[cls] = self._find_ref_targets(cls)
+        return targets
+
+    def _find_ref_targets(self, cls):
+        targets = [
+            obj
+            for obj in self._targets
+            if obj.name is not None and _is_kind(obj.cls, cls)
+        ]
+        builtins = self.metamodel.builtins or {}
+        return targets + [
+            name for name, obj in builtins.items() if textx_isinstance(obj, cls)
+        ]
+
+
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: r"\d",
+    sre_parse.CATEGORY_NOT_DIGIT: r"\D",
+    sre_parse.CATEGORY_SPACE: r"\s",
+    sre_parse.CATEGORY_NOT_SPACE: r"\S",
+    sre_parse.CATEGORY_WORD: r"\w",
+    sre_parse.CATEGORY_NOT_WORD: r"\W",
+}
+
+
+def _is_kind(cls, target_cls):
+    if cls is target_cls or target_cls.__name__ == "OBJECT":
+        return True
+    return any(_is_kind(cls, sub) for sub in getattr(target_cls, "_tx_inh_by", []))